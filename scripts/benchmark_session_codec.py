@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+import argparse
+import base64
+import json
+import sys
+import timeit
+from pathlib import Path
+
+import brotli
+import msgpack
+
+# Benchmark the server implementation
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.session_codec import SessionCodec, choose_compression, fitted_lgwin
+
+MATRIX_QUALITIES = (1, 4, 5, 7, 9, 10, 11)
+
+def legacy_encode(data: dict, quality: int = 11) -> str:
+    """SessionCodec.encode before the Base85 round-trip was removed."""
+    compressed = brotli.compress(msgpack.packb(data, use_bin_type=True), quality=quality)
+    b85_encoded = base64.a85encode(compressed).decode('utf-8')
+    binary = base64.a85decode(b85_encoded)
+    return SessionCodec.base64_to_base64url(base64.b64encode(binary).decode('utf-8'))
+
+def legacy_decode(token: str) -> dict:
+    """SessionCodec.decode before the Base85 round-trip was removed."""
+    binary = base64.b64decode(SessionCodec.base64url_to_base64(token))
+    decompressed = base64.a85decode(base64.a85encode(binary).decode('utf-8'))
+    return msgpack.unpackb(brotli.decompress(decompressed), raw=False)
+
+def synthetic_session(region: str, codes: list[str], found: int) -> dict:
+    """A session of a region over the given codes, `found` of which are already found."""
+    state = {
+        code: {"code": code, "found": index < found or None, "turn": False, "selected": False}
+        for index, code in enumerate(codes)
+    }
+    return {
+        "gameSave": json.dumps({"regions": [region]}, separators=(',', ':')),
+        "gameState": json.dumps(state, separators=(',', ':')),
+        "gameStarted": "true",
+        "isGame": "true"
+    }
+
+def region_codes(geocodes_dir: Path, region: str) -> list[str] | None:
+    """Country codes of a region in gameState order, the delta baselines."""
+    codes_file = geocodes_dir / f"{region}-codes.json"
+    if not codes_file.is_file():
+        return None
+    with open(codes_file, "r", encoding="utf-8") as f:
+        return list(json.load(f))
+
+def best_time(function, repeat: int) -> float:
+    """Best per-call time in milliseconds."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1000
+
+def compare_legacy(payloads: dict, repeat: int):
+    """Times the codec against the former Base85 round-trip pipeline, at the same settings."""
+    print(f"{'payload':<18} {'token':>6} {'enc before':>11} {'enc after':>10} {'dec before':>11} {'dec after':>10}")
+    for name, data in payloads.items():
+        token = SessionCodec.encode(data, quality=11, lgwin=22)["content"]
+        if token != legacy_encode(data) or SessionCodec.decode(token)["content"] != legacy_decode(token):
+            raise SystemExit(f"{name}: tokens differ from the legacy pipeline")
+
+        timings = [
+            best_time(lambda: legacy_encode(data), repeat),
+            best_time(lambda: SessionCodec.encode(data, quality=11, lgwin=22), repeat),
+            best_time(lambda: legacy_decode(token), repeat),
+            best_time(lambda: SessionCodec.decode(token), repeat),
+        ]
+        print(f"{name:<18} {len(token):>6} " + " ".join(f"{value:>9.3f}ms" for value in timings))
+
+        # Quality 11 dominates encoding; compare the pipelines at a fast level too
+        fast = [
+            best_time(lambda: legacy_encode(data, quality=1), repeat),
+            best_time(lambda: SessionCodec.encode(data, quality=1, lgwin=22), repeat),
+        ]
+        print(f"{'  quality 1':<18} {'':>6} " + " ".join(f"{value:>9.3f}ms" for value in fast))
+    print("Tokens are byte-identical to the legacy pipeline.")
+
+def quality_matrix(payloads: dict, repeat: int, budget: float):
+    """Prints compressed size and time per quality, and the adaptive choice, for each payload."""
+    print(f"{'payload':<18} {'msgpack':>8} " + " ".join(f"{'q' + str(q):>14}" for q in MATRIX_QUALITIES))
+    for name, data in payloads.items():
+        msgpacked = msgpack.packb(data, use_bin_type=True)
+        lgwin = fitted_lgwin(len(msgpacked))
+        cells = []
+        for quality in MATRIX_QUALITIES:
+            size = len(brotli.compress(msgpacked, quality=quality, lgwin=lgwin))
+            elapsed = best_time(lambda: brotli.compress(msgpacked, quality=quality, lgwin=lgwin), repeat)
+            cells.append(f"{size:>5}B {elapsed:>6.2f}ms")
+        print(f"{name:<18} {len(msgpacked):>7}B " + " ".join(f"{cell:>14}" for cell in cells))
+        quality, lgwin = choose_compression(len(msgpacked), budget)
+        result = SessionCodec.encode(data, latency_budget_ms=budget)
+        elapsed = best_time(lambda: SessionCodec.encode(data, latency_budget_ms=budget), repeat)
+        print(f"{'  adaptive':<18} {'':>8} quality {quality}, lgwin {lgwin}: "
+              f"{result['stats']['compressed_size']}B, encode {elapsed:.2f}ms")
+
+def compare_variants(payloads: dict, repeat: int, dictionary_id: int):
+    """Compares token size and encode/decode time of Brotli, the preset dictionary, and the schema and delta payloads."""
+    variants = {
+        "brotli q11": {"quality": 11, "lgwin": 22},
+        "brotli adaptive": {},
+        f"dictionary {dictionary_id}": {"dictionary": dictionary_id},
+        "schema": {"schema": True},
+        f"schema + dict {dictionary_id}": {"schema": True, "dictionary": dictionary_id},
+        "delta": {"delta": True, "schema": True},
+        f"delta + dict {dictionary_id}": {"delta": True, "schema": True, "dictionary": dictionary_id},
+    }
+    print(f"{'payload':<18} {'variant':<18} {'packed':>7} {'token':>6} {'encode':>9} {'decode':>9}")
+    for name, data in payloads.items():
+        for variant, options in variants.items():
+            result = SessionCodec.encode(data, **options)
+            token = result["content"]
+            if SessionCodec.decode(token)["content"] != data:
+                raise SystemExit(f"{name}: {variant} does not round-trip")
+            encode_time = best_time(lambda: SessionCodec.encode(data, **options), repeat)
+            decode_time = best_time(lambda: SessionCodec.decode(token), repeat)
+            print(f"{name:<18} {variant:<18} {result['stats']['msgpack_size']:>7} {len(token):>6} "
+                  f"{encode_time:>7.3f}ms {decode_time:>7.3f}ms")
+
+def main():
+    root = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Benchmark the session codec: against the former Base85 round-trip pipeline, across Brotli qualities, or across encoding variants.")
+    parser.add_argument("--sample", type=Path, default=root / "scripts" / "conversion" / "test" / "test.json",
+                        help="Sample session (default: scripts/conversion/test/test.json)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions, the best one is kept (default: 5)")
+    parser.add_argument("--matrix", action="store_true",
+                        help="Print payload size x Brotli quality x time instead of the legacy comparison")
+    parser.add_argument("--dictionary", type=int, metavar="ID",
+                        help="Compare Brotli, the preset dictionary of this ID (assets/session), and the schema and delta payloads")
+    parser.add_argument("--budget", type=float, default=1.0, help="Latency budget in ms of the adaptive choice (default: 1)")
+    args = parser.parse_args()
+
+    geocodes_dir = root / "assets" / "geocodes"
+    world_codes = region_codes(geocodes_dir, "world")
+    with open(args.sample, "r", encoding="utf-8") as f:
+        payloads = {"sample": json.load(f)}
+    payloads["world, 20 found"] = synthetic_session("world", world_codes, 20)
+    payloads["world, 100 found"] = synthetic_session("world", world_codes, 100)
+    payloads["europe, 5 found"] = synthetic_session("europe", region_codes(geocodes_dir, "europe"), 5)
+
+    if args.dictionary is not None:
+        SessionCodec.load_dictionaries(root / "assets" / "session")
+        SessionCodec.load_code_tables(root / "assets" / "session")
+        SessionCodec.set_baselines(lambda region: region_codes(geocodes_dir, region))
+        compare_variants(payloads, args.repeat, args.dictionary)
+    elif args.matrix:
+        quality_matrix(payloads, args.repeat, args.budget)
+    else:
+        compare_legacy(payloads, args.repeat)
+
+if __name__ == "__main__":
+    main()
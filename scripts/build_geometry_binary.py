@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Reuse the server implementation so the containers match what it reads
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.feature_codes import feature_code, load_country_names
+from utils.feature_index import GEOJSON_PATTERNS, asset_name, source_priority
+from utils.geometry_binary import GeometryContainer, pack_features
+from utils.simplify import LOD_DIRECTORY
+
+def main():
+    script_dir = Path(__file__).parent.absolute()
+    assets_dir = script_dir / ".." / "assets"
+
+    parser = argparse.ArgumentParser(description="Pack GeoJSON assets into a memory-mappable binary geometry container.")
+    parser.add_argument("inputs", nargs="*", type=Path, default=[assets_dir / "geojson"],
+                        help="GeoJSON files or folders (default: assets/geojson)")
+    parser.add_argument("--name", default="world", help="Container name (default: world)")
+    parser.add_argument("--output-dir", type=Path, default=assets_dir / "geometry",
+                        help="Output folder (default: assets/geometry)")
+    args = parser.parse_args()
+
+    sources = set()
+    for path in args.inputs:
+        if path.is_dir():
+            sources.update(p for pattern in GEOJSON_PATTERNS for p in path.rglob(pattern))
+        elif path.exists():
+            sources.add(path)
+        else:
+            print(f"Warning: {path} not found")
+    # Same precedence as the server's feature index, so a country is stored once
+    sources = sorted((p for p in sources if LOD_DIRECTORY not in p.parts[-3:-1]), key=source_priority)
+
+    names = load_country_names(assets_dir / "regions" / "world-infos.json")
+    features = []
+    packed_codes = set()
+    for source in sources:
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        source_codes = set()
+        skipped = 0
+        for feature in data.get("features", []):
+            code = feature_code(feature, names, asset_name(source))
+            if code is None:
+                print(f"Warning: no country code for a feature of {source.name}")
+            elif code in packed_codes:
+                skipped += 1
+                continue
+            else:
+                source_codes.add(code)
+            features.append((code, feature))
+        packed_codes |= source_codes
+        print(f"Read {len(data.get('features', []))} features from {source}"
+              + (f", {skipped} of countries already packed skipped" if skipped else ""))
+
+    output = args.output_dir / f"{args.name}.gnvb"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    data = pack_features(features)
+    output.write_bytes(data)
+
+    container = GeometryContainer(output)
+    source_size = sum(p.stat().st_size for p in sources)
+    print(f"Wrote {output}: {container.feature_count} features, {container.ring_count} rings, "
+          f"{container.point_count} points, {len(data)} bytes (sources: {source_size} bytes)")
+    print(f"Country codes: {', '.join(sorted(container.codes))}")
+
+if __name__ == "__main__":
+    main()
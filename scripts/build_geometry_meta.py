@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Reuse the server implementation so the table matches what it would compute
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.feature_codes import load_country_names
+from utils.feature_index import FeatureIndex
+from utils.geometry_meta import META_FILE_NAME, build_meta_table
+
+def main():
+    script_dir = Path(__file__).parent.absolute()
+    assets_dir = script_dir / ".." / "assets"
+
+    parser = argparse.ArgumentParser(description="Write the per-country geometry metadata table (bbox, centroid, area, counts).")
+    parser.add_argument("input", nargs="?", type=Path, default=assets_dir / "geojson",
+                        help="GeoJSON folder (default: assets/geojson)")
+    parser.add_argument("--codes", type=Path, default=assets_dir / "geocodes" / "world-codes.json",
+                        help="Geocode file listing the expected country codes (default: assets/geocodes/world-codes.json)")
+    parser.add_argument("--output", type=Path, default=assets_dir / "geometry" / META_FILE_NAME,
+                        help=f"Output file (default: assets/geometry/{META_FILE_NAME})")
+    args = parser.parse_args()
+
+    feature_index = FeatureIndex(args.input, load_country_names(assets_dir / "regions" / "world-infos.json"))
+    feature_index.build()
+    table = build_meta_table(feature_index)
+
+    with open(args.codes, "r", encoding="utf-8") as f:
+        expected = set(json.load(f))
+    missing = sorted(expected - set(table))
+    extra = sorted(set(table) - expected)
+    if missing:
+        print(f"Warning: no geometry for {len(missing)} codes of {args.codes.name}: {', '.join(missing)}")
+    if extra:
+        print(f"Warning: {len(extra)} codes are not in {args.codes.name}: {', '.join(extra)}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(table.items())), f, separators=(",", ":"))
+    print(f"Wrote metadata of {len(table)} countries to {args.output} ({args.output.stat().st_size} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Compose the files with the server implementation so they match its responses
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.region_catalog import DEFINITIONS_FILE_NAME, RegionCatalog
+
+# Folder of the info files of regions that have none yet
+NEW_REGIONS_FOLDER = "majorRegions"
+
+def write_json(path: Path, data) -> bool:
+    """Writes a JSON file in the format of the asset files, returns whether it changed."""
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    if path.exists() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+def main():
+    script_dir = Path(__file__).parent.absolute()
+    assets_dir = script_dir / ".." / "assets"
+
+    parser = argparse.ArgumentParser(description="Write the per-region geocode and info files from the region definitions.")
+    parser.add_argument("--definitions", type=Path, default=assets_dir / "regions" / DEFINITIONS_FILE_NAME,
+                        help=f"Region definitions (default: assets/regions/{DEFINITIONS_FILE_NAME})")
+    parser.add_argument("--geocodes", type=Path, default=assets_dir / "geocodes",
+                        help="Folder of world-codes.json and the <region>-codes.json files (default: assets/geocodes)")
+    parser.add_argument("--regions", type=Path, default=assets_dir / "regions",
+                        help="Folder of world-infos.json and the <region>-infos.json files (default: assets/regions)")
+    args = parser.parse_args()
+
+    world_codes = args.geocodes / "world-codes.json"
+    world_infos = args.regions / "world-infos.json"
+    catalog = RegionCatalog(world_codes, world_infos, args.definitions)
+    catalog.refresh(force=True)
+
+    # Regions keep the folder their info file is in (continents, majorRegions)
+    info_files = {path.name: path for path in args.regions.rglob("*-infos.json")}
+    written = 0
+    for region in catalog.regions:
+        codes_path = args.geocodes / f"{region}-codes.json"
+        infos_path = info_files.get(f"{region}-infos.json", args.regions / NEW_REGIONS_FOLDER / f"{region}-infos.json")
+        # world-codes.json and world-infos.json are the country table itself
+        if codes_path.resolve() == world_codes.resolve() or infos_path.resolve() == world_infos.resolve():
+            continue
+        changed = [
+            path.name for path, data in ((codes_path, catalog.get(region)), (infos_path, catalog.get_infos([region])))
+            if write_json(path, data)
+        ]
+        if changed:
+            written += len(changed)
+            print(f"{region}: wrote {', '.join(changed)}")
+
+    print(f"{written} region files written, the others are up to date")
+
+if __name__ == "__main__":
+    main()
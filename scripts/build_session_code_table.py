@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+import argparse
+import json
+from pathlib import Path
+
+# Schema session tokens store country codes as indexes into a code table, so a
+# table never changes once written: new codes go to a new table with the next
+# ID, old tables keep decoding the tokens issued with them.
+
+def main():
+    root = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Write a new session code table if world-codes.json has codes the latest one lacks.")
+    parser.add_argument("--codes", type=Path, default=root / "assets" / "geocodes" / "world-codes.json",
+                        help="Country codes (default: assets/geocodes/world-codes.json)")
+    parser.add_argument("--output", type=Path, default=root / "assets" / "session",
+                        help="Folder of the codes-<id>.json tables (default: assets/session)")
+    args = parser.parse_args()
+
+    with open(args.codes, "r", encoding="utf-8") as f:
+        codes = [code.lower() for code in json.load(f)]
+
+    tables = {int(path.stem.split("-", 1)[1]): path for path in args.output.glob("codes-*.json")}
+    table = []
+    if tables:
+        latest = max(tables)
+        with open(tables[latest], "r", encoding="utf-8") as f:
+            table = json.load(f)
+        print(f"Latest code table: {tables[latest].name}, {len(table)} codes")
+
+    # Append only: existing indexes keep their codes, new codes take the next ones
+    known = set(table)
+    added = [code for code in codes if code not in known]
+    if not added:
+        print("No new codes, nothing to write")
+        return
+    table_id = max(tables, default=0) + 1
+    if table_id > 255:
+        raise SystemExit("Code table IDs are exhausted (1-255)")
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    output = args.output / f"codes-{table_id}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(table + added, f, separators=(',', ':'))
+        f.write("\n")
+    print(f"Wrote {output} with {len(added)} new codes ({len(table) + len(added)} in total)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import random
+import sys
+import zlib
+from pathlib import Path
+
+import msgpack
+
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.session_codec import DEFAULT_DEFLATE_LEVEL, DEFLATE_WBITS
+
+# Deflate only looks back one window, so a larger dictionary is useless
+MAX_DICTIONARY_SIZE = 1 << DEFLATE_WBITS
+SAMPLES_PER_REGION = 8
+GAMEMODES = ("map", "flag", "capital")
+
+def session_state(codes: list[str], found: set[str], turn: set[str], selected: str | None) -> str:
+    """The gameState string of a session, as the client serializes it."""
+    state = {
+        code: {"code": code, "found": True if code in found else None, "turn": code in turn, "selected": code == selected}
+        for code in codes
+    }
+    return json.dumps(state, separators=(',', ':'))
+
+def game_save(region: str, codes: list[str], rng: random.Random) -> str:
+    """The gameSave string of a session in progress."""
+    gamemode = rng.choice(GAMEMODES)
+    save = {
+        "roundState": {
+            "current": rng.randint(1, len(codes)), "total": str(len(codes)), "endRound": rng.random() < 0.5,
+            "endGame": False, "countryCode": rng.choice(codes), "correctCountryCode": rng.choice(codes)
+        },
+        "timeLimit": {"value": rng.choice(("10", "20", "30")), "datetime": "2025-01-01T00:00:00.000Z"},
+        "gamemode": {"current": None, "available": [gamemode]},
+        "subgamemode": {"current": gamemode, "available": [gamemode]},
+        "regions": [region]
+    }
+    return json.dumps(save, separators=(',', ':'))
+
+def session_corpus(regions: dict[str, list[str]], samples: int, seed: int) -> list[bytes]:
+    """MessagePack payloads of synthetic sessions: each region pristine, then with some progress."""
+    rng = random.Random(seed)
+    corpus = []
+    for region, codes in regions.items():
+        for sample in range(samples):
+            found = set(rng.sample(codes, rng.randint(0, len(codes)) * sample // samples))
+            turn = set(rng.sample(codes, min(len(codes), rng.randint(0, 5))))
+            data = {
+                "gameSave": game_save(region, codes, rng),
+                "gameStarted": "true",
+                "gameState": session_state(codes, found, turn, rng.choice(codes)),
+                "isGame": "true",
+                "menu_1": region,
+                "menu_2": "map",
+                "menu_3": "map"
+            }
+            corpus.append(msgpack.packb(data, use_bin_type=True))
+    return corpus
+
+def deflated_size(corpus: list[bytes], dictionary: bytes) -> int:
+    """Total size of the corpus deflated with a preset dictionary."""
+    total = 0
+    for payload in corpus:
+        compressor = zlib.compressobj(DEFAULT_DEFLATE_LEVEL, zlib.DEFLATED, -DEFLATE_WBITS, zdict=dictionary)
+        total += len(compressor.compress(payload) + compressor.flush())
+    return total
+
+def build_dictionary(regions: dict[str, list[str]], corpus: list[bytes]) -> bytes:
+    """
+    Builds a deflate preset dictionary for the corpus.
+
+    Starts from the session envelope and country entries in each state, then
+    greedily adds the pristine state of the region that shrinks the deflated
+    corpus the most, until none does. Nearer matches cost fewer bits and
+    deflate cannot reach past its window, so each pick goes in front of the
+    previous ones: the most useful block ends up last, nearest to the payload.
+    """
+    envelope = json.dumps({"gameSave": "", "gameStarted": "true", "isGame": "true"}, separators=(',', ':'))
+    entries = "".join(
+        json.dumps({"code": "xx", "found": found, "turn": turn, "selected": selected}, separators=(',', ':'))
+        for found in (True, None) for turn in (False, True) for selected in (False, True)
+    )
+    base = (envelope + entries).encode("utf-8")
+    picked = b""
+    best = deflated_size(corpus, base)
+    candidates = {region: session_state(codes, set(), set(), None).encode("utf-8") for region, codes in regions.items()}
+    while candidates:
+        sizes = {
+            region: deflated_size(corpus, (base + block + picked)[-MAX_DICTIONARY_SIZE:])
+            for region, block in candidates.items()
+        }
+        region = min(sizes, key=sizes.get)
+        if sizes[region] >= best:
+            break
+        picked = candidates.pop(region) + picked
+        print(f"+ {region}: corpus deflates to {sizes[region]} bytes (was {best})")
+        best = sizes[region]
+    return (base + picked)[-MAX_DICTIONARY_SIZE:]
+
+def main():
+    root = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description="Build a deflate preset dictionary for session tokens from a synthetic session corpus.")
+    parser.add_argument("--id", type=int, default=1, help="Dictionary ID, 1-255 (default: 1)")
+    parser.add_argument("--geocodes", type=Path, default=root / "assets" / "geocodes",
+                        help="Folder of the <region>-codes.json files (default: assets/geocodes)")
+    parser.add_argument("--output", type=Path, default=root / "assets" / "session",
+                        help="Output folder (default: assets/session)")
+    parser.add_argument("--samples", type=int, default=SAMPLES_PER_REGION,
+                        help=f"Synthetic sessions per region (default: {SAMPLES_PER_REGION})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic sessions (default: 0)")
+    args = parser.parse_args()
+    if not 0 < args.id <= 255:
+        parser.error("--id must be between 1 and 255")
+
+    regions = {}
+    for codes_file in sorted(args.geocodes.glob("*-codes.json")):
+        with open(codes_file, "r", encoding="utf-8") as f:
+            regions[codes_file.name[:-len("-codes.json")]] = list(json.load(f))
+
+    corpus = session_corpus(regions, args.samples, args.seed)
+    dictionary = build_dictionary(regions, corpus)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    output = args.output / f"session-{args.id}.dict"
+    output.write_bytes(dictionary)
+    print(f"Corpus of {len(corpus)} sessions: {sum(map(len, corpus))} bytes, "
+          f"{deflated_size(corpus, b'')} deflated, {deflated_size(corpus, dictionary)} with the dictionary")
+    print(f"Wrote a {len(dictionary)} byte dictionary to {output}")
+
+if __name__ == "__main__":
+    main()
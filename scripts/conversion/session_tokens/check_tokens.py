@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Decode with the codec served by /api/session so issued tokens are checked against it
+ROOT = Path(__file__).resolve().parents[3]
+sys.path.append(str(ROOT / 'src'))
+from utils.region_catalog import DEFINITIONS_FILE_NAME, RegionCatalog
+from utils.session_codec import FRAME_PREFIX, SessionCodec
+
+# Encoder options of each token format. The `legacy` token was issued by the
+# codec from before framed tokens, which always used quality 11 and the
+# default window; the others pin each format as first issued by the current
+# codec. Issued tokens must keep decoding, so they are never regenerated,
+# only added for new modes.
+MODES = {
+    'legacy': {'quality': 11, 'lgwin': 22},
+    'legacy_adaptive': {},
+    'framed': {'framed': True},
+    'dictionary': {'dictionary': 1},
+    'schema': {'schema': True},
+    'schema_dictionary': {'schema': True, 'dictionary': 1},
+    'delta': {'delta': True},
+    'delta_dictionary': {'delta': True, 'dictionary': 1}
+}
+
+def load_codec_assets(assets_dir):
+    """Loads the dictionaries, code tables and region baselines, as the server does."""
+    catalog = RegionCatalog(
+        assets_dir / 'geocodes' / 'world-codes.json',
+        assets_dir / 'regions' / 'world-infos.json',
+        assets_dir / 'regions' / DEFINITIONS_FILE_NAME
+    )
+    catalog.refresh(force=True)
+    SessionCodec.load_dictionaries(assets_dir / 'session')
+    SessionCodec.load_code_tables(assets_dir / 'session')
+    SessionCodec.set_baselines(lambda region: list(catalog.get(region)) if catalog.definition(region) else None)
+
+def check_tokens(fixture, session):
+    """
+    Decode every known-good token and compare it with the session it was issued for.
+
+    Args:
+        fixture (dict): Tokens by mode
+        session (dict): The encoded session
+
+    Returns:
+        list: Failures as (mode, reason)
+    """
+    failures = []
+    for mode, token in fixture['tokens'].items():
+        if mode.startswith('legacy') and token.startswith(FRAME_PREFIX):
+            failures.append((mode, 'legacy token is framed'))
+            continue
+        result = SessionCodec.decode(token)
+        if not result['success']:
+            failures.append((mode, result['error']))
+        elif result['content'] != session:
+            failures.append((mode, 'decodes to a different session'))
+        elif list(result['content']) != list(session):
+            failures.append((mode, 'session fields are not in their original order'))
+    return failures
+
+def add_tokens(fixture, session):
+    """
+    Issue tokens for the modes the fixture lacks; existing tokens are kept as they are.
+
+    Returns:
+        list: The modes added
+    """
+    added = []
+    for mode, options in MODES.items():
+        if mode in fixture['tokens']:
+            continue
+        result = SessionCodec.encode(session, **options)
+        if not result['success']:
+            raise SystemExit(f"Could not encode {mode}: {result['error']}")
+        fixture['tokens'][mode] = result['content']
+        added.append(f"{mode} ({result['stats']['payload']}, {result['stats']['final_size']} chars)")
+    return added
+
+def main():
+    script_dir = Path(__file__).parent
+    parser = argparse.ArgumentParser(description='Check that the known-good session tokens still decode to their session')
+    parser.add_argument('--fixture', type=Path, default=script_dir / 'tokens.json',
+                        help='Tokens by mode and the session they encode (default: tokens.json)')
+    parser.add_argument('--assets', type=Path, default=ROOT / 'assets', help='Assets folder (default: assets)')
+    parser.add_argument('--add-missing', action='store_true',
+                        help='Issue tokens for the modes missing from the fixture, then check')
+    args = parser.parse_args()
+
+    load_codec_assets(args.assets)
+    with open(args.fixture, 'r', encoding='utf-8') as f:
+        fixture = json.load(f)
+    with open(args.fixture.parent / fixture['session'], 'r', encoding='utf-8') as f:
+        session = json.load(f)
+
+    if args.add_missing:
+        added = add_tokens(fixture, session)
+        with open(args.fixture, 'w', encoding='utf-8') as f:
+            json.dump(fixture, f, indent=2)
+            f.write('\n')
+        print(f"Added {', '.join(added)}" if added else "No mode missing")
+
+    missing = [mode for mode in MODES if mode not in fixture['tokens']]
+    failures = check_tokens(fixture, session)
+    for mode, reason in failures:
+        print(f"FAILED {mode}: {reason}")
+    if missing:
+        print(f"No token for {', '.join(missing)} (run with --add-missing)")
+    print(f"{len(fixture['tokens']) - len(failures)}/{len(fixture['tokens'])} tokens decode to {fixture['session']}")
+    if failures or missing:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
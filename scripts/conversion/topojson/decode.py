@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import argparse
+
+def decode_arcs(topology):
+    """
+    Decode the delta-encoded, quantized arcs of a topology to absolute positions.
+
+    Args:
+        topology (dict): TopoJSON topology
+
+    Returns:
+        list: Arcs as lists of [x, y] positions
+    """
+    transform = topology.get('transform')
+    arcs = []
+    for arc in topology['arcs']:
+        x = y = 0
+        positions = []
+        for point in arc:
+            if transform:
+                x += point[0]
+                y += point[1]
+                positions.append([
+                    x * transform['scale'][0] + transform['translate'][0],
+                    y * transform['scale'][1] + transform['translate'][1]
+                ])
+            else:
+                positions.append(list(point))
+        arcs.append(positions)
+    return arcs
+
+def decode_topology(topology, object_name=None):
+    """
+    Decode a TopoJSON topology back to a GeoJSON FeatureCollection.
+
+    Args:
+        topology (dict): TopoJSON topology
+        object_name (str, optional): Object to decode (default: the first one)
+
+    Returns:
+        dict: GeoJSON FeatureCollection
+    """
+    arcs = decode_arcs(topology)
+    transform = topology.get('transform')
+
+    def point(position):
+        if not transform:
+            return list(position)
+        return [
+            position[0] * transform['scale'][0] + transform['translate'][0],
+            position[1] * transform['scale'][1] + transform['translate'][1]
+        ]
+
+    def line(arc_refs):
+        positions = []
+        for ref in arc_refs:
+            arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+            positions.extend(arc[1:] if positions else arc)
+        return positions
+
+    def geometry(obj):
+        geometry_type = obj.get('type')
+        if geometry_type == 'Polygon':
+            return {'type': 'Polygon', 'coordinates': [line(ring) for ring in obj['arcs']]}
+        if geometry_type == 'MultiPolygon':
+            return {'type': 'MultiPolygon', 'coordinates': [[line(ring) for ring in polygon] for polygon in obj['arcs']]}
+        if geometry_type == 'LineString':
+            return {'type': 'LineString', 'coordinates': line(obj['arcs'])}
+        if geometry_type == 'MultiLineString':
+            return {'type': 'MultiLineString', 'coordinates': [line(part) for part in obj['arcs']]}
+        if geometry_type == 'Point':
+            return {'type': 'Point', 'coordinates': point(obj['coordinates'])}
+        if geometry_type == 'MultiPoint':
+            return {'type': 'MultiPoint', 'coordinates': [point(p) for p in obj['coordinates']]}
+        if geometry_type == 'GeometryCollection':
+            return {'type': 'GeometryCollection', 'geometries': [geometry(child) for child in obj['geometries']]}
+        return None
+
+    name = object_name or next(iter(topology['objects']))
+    collection = topology['objects'][name]
+    objects = collection['geometries'] if collection.get('type') == 'GeometryCollection' else [collection]
+
+    features = []
+    for obj in objects:
+        feature = {'type': 'Feature', 'properties': obj.get('properties', {}), 'geometry': geometry(obj)}
+        if 'id' in obj:
+            feature['id'] = obj['id']
+        features.append(feature)
+    return {'type': 'FeatureCollection', 'features': features}
+
+def compare_geojson(original, decoded, transform):
+    """
+    Check that a decoded FeatureCollection matches its source within the quantization error.
+
+    The encoder drops the rings that collapse to fewer than 4 grid points,
+    and the holes of a polygon whose exterior collapses. The same rule is
+    applied to the original rings: the ones it drops are reported apart,
+    and the kept ones are paired in order with the decoded rings. Rings may
+    start at a different position after the arc decomposition, so each
+    original position is looked up among the positions of its decoded ring.
+
+    Args:
+        original (dict): Source GeoJSON FeatureCollection
+        decoded (dict): Decoded GeoJSON FeatureCollection
+        transform (dict): Quantization transform of the topology
+
+    Returns:
+        dict: Fidelity report
+    """
+    scale_x, scale_y = transform['scale']
+    translate_x, translate_y = transform['translate']
+    tolerance = max(scale_x, scale_y) * 1e-6
+
+    def polygons(feature):
+        geometry = feature.get('geometry') or {}
+        if geometry.get('type') == 'Polygon':
+            return [geometry['coordinates']]
+        if geometry.get('type') == 'MultiPolygon':
+            return geometry['coordinates']
+        return []
+
+    def grid_points(ring):
+        """Number of grid points of a ring once consecutive duplicates are merged, as the encoder does."""
+        count = 0
+        previous = None
+        for x, y in (position[:2] for position in ring):
+            cell = (round((x - translate_x) / scale_x), round((y - translate_y) / scale_y))
+            if cell != previous:
+                count += 1
+                previous = cell
+        return count
+
+    def kept_rings(polygon_list):
+        """The rings the encoder keeps, and the number it drops."""
+        kept, dropped = [], 0
+        for polygon in polygon_list:
+            if not polygon or grid_points(polygon[0]) < 4:
+                dropped += len(polygon)
+                continue
+            for ring in polygon:
+                if grid_points(ring) < 4:
+                    dropped += 1
+                else:
+                    kept.append(ring)
+        return kept, dropped
+
+    report = {
+        'features': (len(original['features']), len(decoded['features'])),
+        'rings_original': 0,
+        'rings_dropped': 0,
+        'rings_decoded': 0,
+        'positions_checked': 0,
+        'positions_missing': 0,
+        'max_error': 0.0
+    }
+    for source, result in zip(original['features'], decoded['features']):
+        source_polygons = polygons(source)
+        source_rings, dropped = kept_rings(source_polygons)
+        result_rings = [ring for polygon in polygons(result) for ring in polygon]
+        report['rings_original'] += sum(len(polygon) for polygon in source_polygons)
+        report['rings_dropped'] += dropped
+        report['rings_decoded'] += len(result_rings)
+        if len(source_rings) != len(result_rings):
+            continue
+        for source_ring, result_ring in zip(source_rings, result_rings):
+            grid = {(round((x - translate_x) / scale_x), round((y - translate_y) / scale_y)) for x, y in result_ring}
+            for position in source_ring:
+                cell = (round((position[0] - translate_x) / scale_x), round((position[1] - translate_y) / scale_y))
+                report['positions_checked'] += 1
+                if cell not in grid:
+                    report['positions_missing'] += 1
+                    continue
+                error = max(abs(cell[0] * scale_x + translate_x - position[0]), abs(cell[1] * scale_y + translate_y - position[1]))
+                report['max_error'] = max(report['max_error'], error)
+    report['max_error_bound'] = max(scale_x, scale_y) / 2 + tolerance
+    report['ok'] = (
+        report['features'][0] == report['features'][1]
+        and report['rings_original'] - report['rings_dropped'] == report['rings_decoded']
+        and report['positions_missing'] == 0
+        and report['max_error'] <= report['max_error_bound']
+    )
+    return report
+
+def decode_file(input_file, output_file=None, pretty=False, compare_with=None):
+    """
+    Decode a TopoJSON file back to GeoJSON, optionally checking it against the source.
+
+    Args:
+        input_file (str): Path to the TopoJSON file
+        output_file (str, optional): Path to save the decoded GeoJSON file
+        pretty (bool): Whether to format the JSON with indentation
+        compare_with (str, optional): Source GeoJSON file to check the round-trip against
+
+    Returns:
+        tuple: (success, message or report, output_path)
+    """
+    try:
+        if not output_file:
+            output_file = os.path.splitext(input_file)[0] + '.decoded.geojson'
+
+        with open(input_file, 'r', encoding='utf-8') as f:
+            topology = json.load(f)
+
+        if topology.get('type') != 'Topology':
+            return (False, "Not a TopoJSON topology", None)
+
+        decoded = decode_topology(topology)
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            if pretty:
+                json.dump(decoded, f, indent=2)
+            else:
+                json.dump(decoded, f, separators=(',', ':'))
+
+        if compare_with:
+            with open(compare_with, 'r', encoding='utf-8') as f:
+                original = json.load(f)
+            return (True, compare_geojson(original, decoded, topology['transform']), output_file)
+
+        return (True, "Decoded successfully", output_file)
+
+    except FileNotFoundError as e:
+        return (False, f"Input file not found: {e.filename}", None)
+    except Exception as e:
+        return (False, f"Error: {str(e)}", None)
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode TopoJSON to GeoJSON and verify the round-trip')
+    parser.add_argument('input', help='Input TopoJSON file')
+    parser.add_argument('-o', '--output', help='Output GeoJSON file (default: input file with .decoded.geojson extension)')
+    parser.add_argument('-p', '--pretty', action='store_true', help='Format JSON with indentation')
+    parser.add_argument('-c', '--compare', help='Source GeoJSON file to verify the decoded output against')
+
+    args = parser.parse_args()
+
+    success, result, output_path = decode_file(args.input, args.output, args.pretty, args.compare)
+
+    if not success:
+        print(f"Failed to decode: {result}")
+        sys.exit(1)
+
+    print(f"Successfully decoded to GeoJSON")
+    print(f"Output saved to: {output_path}")
+    if isinstance(result, dict):
+        print(f"Features: {result['features'][0]} original, {result['features'][1]} decoded")
+        print(f"Rings: {result['rings_original']} original, {result['rings_dropped']} collapsed on the grid, {result['rings_decoded']} decoded")
+        print(f"Positions checked: {result['positions_checked']} ({result['positions_missing']} missing)")
+        print(f"Max error: {result['max_error']:.3g} (bound {result['max_error_bound']:.3g})")
+        print("Round-trip OK" if result['ok'] else "Round-trip FAILED")
+        if not result['ok']:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import json
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# Use the encoder served by /api/geojson/<region>?format=topojson
+sys.path.append(str(Path(__file__).resolve().parents[3] / 'src'))
+from utils.topojson import DEFAULT_QUANTIZATION, encode_topojson
+
+def encode_file(input_file, output_file=None, quantization=DEFAULT_QUANTIZATION):
+    """
+    Encode a GeoJSON FeatureCollection file to TopoJSON.
+
+    Args:
+        input_file (str): Path to the GeoJSON file to encode
+        output_file (str, optional): Path to save the TopoJSON file
+        quantization (int, optional): Number of grid steps along each axis
+
+    Returns:
+        tuple: (success, stats_dict, output_path)
+    """
+    try:
+        if not output_file:
+            output_file = os.path.splitext(input_file)[0] + '.topojson'
+
+        with open(input_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        topology = encode_topojson(data, quantization)
+        encoded = json.dumps(topology, separators=(',', ':'))
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(encoded)
+
+        geojson_size = len(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+        topojson_size = len(encoded.encode('utf-8'))
+        stats = {
+            'geojson_size': geojson_size,
+            'topojson_size': topojson_size,
+            'arcs': len(topology['arcs']),
+            'total_ratio': geojson_size / topojson_size
+        }
+        return (True, stats, output_file)
+
+    except FileNotFoundError:
+        return (False, f"Input file not found: {input_file}", None)
+    except json.JSONDecodeError:
+        return (False, f"Invalid JSON in file: {input_file}", None)
+    except Exception as e:
+        return (False, f"Error: {str(e)}", None)
+
+def main():
+    parser = argparse.ArgumentParser(description='Encode a GeoJSON FeatureCollection to quantized TopoJSON')
+    parser.add_argument('input', help='Input GeoJSON file')
+    parser.add_argument('-o', '--output', help='Output file (default: input file with .topojson extension)')
+    parser.add_argument('-q', '--quantization', type=int, default=DEFAULT_QUANTIZATION,
+                        help=f'Grid steps along each axis (default: {DEFAULT_QUANTIZATION})')
+
+    args = parser.parse_args()
+
+    success, result, output_path = encode_file(args.input, args.output, args.quantization)
+
+    if success:
+        print(f"Successfully encoded GeoJSON to TopoJSON")
+        print(f"Minified GeoJSON size: {result['geojson_size']} bytes")
+        print(f"TopoJSON size: {result['topojson_size']} bytes ({result['arcs']} arcs)")
+        print(f"Overall reduction: {result['total_ratio']:.2f}x")
+        print(f"Output saved to: {output_path}")
+    else:
+        print(f"Failed to encode: {result}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
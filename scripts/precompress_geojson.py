@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import argparse
+import gzip
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    print("Error: Brotli compression library not installed.")
+    print("Please install it with: pip install brotli")
+    exit(1)
+
+GEOJSON_PATTERNS = ("*.geojson", "*.geo.json")
+
+def compress_file(source: Path, force: bool = False) -> tuple[int, int, int] | None:
+    """
+    Writes the .br and .gz siblings of a file.
+
+    Args:
+        source (Path): File to compress.
+        force (bool): Rebuild the siblings even if they are up to date.
+
+    Returns:
+        tuple: Source, brotli and gzip sizes, or None if the siblings were up to date.
+    """
+    br_path = source.with_name(source.name + ".br")
+    gz_path = source.with_name(source.name + ".gz")
+    source_mtime = source.stat().st_mtime_ns
+
+    if not force and all(p.exists() and p.stat().st_mtime_ns >= source_mtime for p in (br_path, gz_path)):
+        return None
+
+    data = source.read_bytes()
+    br_data = brotli.compress(data, quality=11)
+    # mtime=0 keeps the gzip output (and therefore its ETag) stable across builds
+    gz_data = gzip.compress(data, compresslevel=9, mtime=0)
+
+    br_path.write_bytes(br_data)
+    gz_path.write_bytes(gz_data)
+    return len(data), len(br_data), len(gz_data)
+
+def main():
+    script_dir = Path(__file__).parent.absolute()
+
+    parser = argparse.ArgumentParser(description="Write .br and .gz siblings for every GeoJSON asset.")
+    parser.add_argument("directory", nargs="?", default=script_dir / ".." / "assets" / "geojson",
+                        type=Path, help="Folder to scan (default: assets/geojson)")
+    parser.add_argument("--force", action="store_true", help="Rebuild up to date siblings too")
+    args = parser.parse_args()
+
+    if not args.directory.exists():
+        print(f"Directory not found: {args.directory}")
+        exit(1)
+
+    sources = sorted({p for pattern in GEOJSON_PATTERNS for p in args.directory.rglob(pattern)})
+    total_raw = total_br = total_gz = 0
+
+    for source in sources:
+        sizes = compress_file(source, args.force)
+        if sizes is None:
+            print(f"Up to date: {source}")
+            continue
+        raw_size, br_size, gz_size = sizes
+        total_raw += raw_size
+        total_br += br_size
+        total_gz += gz_size
+        print(f"Compressed {source}: {raw_size} -> br {br_size} ({br_size / raw_size:.1%}), gzip {gz_size} ({gz_size / raw_size:.1%})")
+
+    if total_raw:
+        print(f"Total: {total_raw} -> br {total_br} ({total_br / total_raw:.1%}), gzip {total_gz} ({total_gz / total_raw:.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Reuse the server implementation so the batch output matches the ?precision option
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.coordinates import minify_json, quantize_geojson
+
+GEOJSON_PATTERNS = ("*.geojson", "*.geo.json")
+
+def collect_inputs(paths: list[Path]) -> list[Path]:
+    """Expands folders into the GeoJSON files they contain."""
+    files = set()
+    for path in paths:
+        if path.is_dir():
+            files.update(p for pattern in GEOJSON_PATTERNS for p in path.rglob(pattern))
+        elif path.exists():
+            files.add(path)
+        else:
+            print(f"Warning: {path} not found")
+    return sorted(files)
+
+def main():
+    script_dir = Path(__file__).parent.absolute()
+
+    parser = argparse.ArgumentParser(description="Round or snap GeoJSON coordinates and minify the output.")
+    parser.add_argument("inputs", nargs="*", type=Path, default=[script_dir / ".." / "assets" / "geojson"],
+                        help="GeoJSON files or folders (default: assets/geojson)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--precision", type=int, default=5, help="Number of decimals to keep (default: 5)")
+    mode.add_argument("--grid", type=float, help="Snap to a grid with this cell size, in degrees")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--output-dir", type=Path, help="Write the results to this folder")
+    output.add_argument("--in-place", action="store_true", help="Overwrite the input files")
+    args = parser.parse_args()
+
+    inputs = collect_inputs(args.inputs)
+    if not inputs:
+        print("No GeoJSON file found")
+        exit(1)
+
+    if not args.output_dir and not args.in_place:
+        print("Dry run: pass --output-dir or --in-place to write the results\n")
+
+    total_before = total_after = 0
+    for input_file in inputs:
+        raw = input_file.read_bytes()
+        data = json.loads(raw)
+        if args.grid is not None:
+            result = minify_json(quantize_geojson(data, grid=args.grid))
+        else:
+            result = minify_json(quantize_geojson(data, precision=args.precision))
+
+        total_before += len(raw)
+        total_after += len(result)
+        print(f"{input_file.name:<40} {len(raw):>10} -> {len(result):>10} bytes ({len(result) / len(raw):.1%})")
+
+        if args.in_place:
+            input_file.write_bytes(result)
+        elif args.output_dir:
+            args.output_dir.mkdir(parents=True, exist_ok=True)
+            (args.output_dir / input_file.name).write_bytes(result)
+
+    print("-" * 80)
+    print(f"{'Total':<40} {total_before:>10} -> {total_after:>10} bytes ({total_after / total_before:.1%})")
+
+if __name__ == "__main__":
+    main()
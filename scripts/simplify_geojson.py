@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Reuse the server implementation so precomputed levels match the on-demand ones
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+from utils.coordinates import minify_json
+from utils.simplify import LOD_DIRECTORY, LOD_TOLERANCES, SIMPLIFY_METHODS, lod_path, simplify_geojson
+
+GEOJSON_PATTERNS = ("*.geojson", "*.geo.json")
+
+def count_vertices(data: dict) -> int:
+    """Counts the positions of the polygon features of a FeatureCollection."""
+    total = 0
+    for feature in data.get("features", []):
+        geometry = feature.get("geometry") or {}
+        polygons = [geometry.get("coordinates", [])] if geometry.get("type") == "Polygon" else geometry.get("coordinates", []) if geometry.get("type") == "MultiPolygon" else []
+        total += sum(len(ring) for polygon in polygons for ring in polygon)
+    return total
+
+def main():
+    script_dir = Path(__file__).parent.absolute()
+
+    parser = argparse.ArgumentParser(description="Precompute simplified levels of detail of the GeoJSON assets.")
+    parser.add_argument("inputs", nargs="*", type=Path, default=[script_dir / ".." / "assets" / "geojson"],
+                        help="GeoJSON files or folders (default: assets/geojson)")
+    parser.add_argument("--method", choices=SIMPLIFY_METHODS, default="dp",
+                        help="dp (Douglas-Peucker) or vw (Visvalingam-Whyatt)")
+    parser.add_argument("--levels", nargs="+", choices=list(LOD_TOLERANCES), default=list(LOD_TOLERANCES),
+                        help="Levels of detail to build (default: all)")
+    args = parser.parse_args()
+
+    sources = set()
+    for path in args.inputs:
+        if path.is_dir():
+            sources.update(p for pattern in GEOJSON_PATTERNS for p in path.rglob(pattern))
+        elif path.exists():
+            sources.add(path)
+        else:
+            print(f"Warning: {path} not found")
+    # Skip the outputs of previous runs
+    sources = sorted(p for p in sources if LOD_DIRECTORY not in p.parts[-3:-1])
+
+    for source in sources:
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        vertices = count_vertices(data)
+        print(f"{source}: {vertices} vertices, {source.stat().st_size} bytes")
+
+        for level in args.levels:
+            simplified = simplify_geojson(data, LOD_TOLERANCES[level], args.method)
+            output = lod_path(source, level)
+            output.parent.mkdir(parents=True, exist_ok=True)
+            body = minify_json(simplified)
+            output.write_bytes(body)
+            print(f"  {level:<8} {count_vertices(simplified):>8} vertices {len(body):>10} bytes -> {output}")
+
+if __name__ == "__main__":
+    main()
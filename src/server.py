@@ -1,33 +1,362 @@
 #!/usr/bin/env python3
-from flask import Flask, jsonify, request, send_file, Response
+from flask import Flask, jsonify, request, send_file, url_for, Response
 from flask_cors import CORS  # Add this import
+import json
+import os
 import sys
+import numpy as np
 from pathlib import Path
 from lite_logging.lite_logging import log
 
 # Add the src directory to the path so we can import our modules
 sys.path.append(str(Path(__file__).parent))
-from utils.geocode_service import get_merged_geocodes
+from utils.region_catalog import DEFINITIONS_FILE_NAME, RegionCatalog
+from utils.region_expressions import format_expression, parse_region_expression
+from utils.geocode_service import normalize_regions
+from utils.response_cache import ResponseCache
+from utils.precompressed import ENCODING_SUFFIXES, choose_encoding, compress_body, file_etag, send_precompressed
+from utils.http_cache import apply_cache_control, conditional_response, content_etag
+from utils.http_ranges import apply_ranges, bytes_range_reader, stream_range_reader
+from utils.coordinates import GRID_LEVELS, minify_json, quantize_geojson, snap_to_level
+from utils.simplify import LOD_TOLERANCES, SIMPLIFY_METHODS, TOLERANCE_LEVELS, lod_path, simplify_geojson
+from utils.topojson import encode_topojson
+from utils.vector_tiles import TileGenerator, is_valid_tile
+from utils.geometry_binary import GeometryStore
+from utils.feature_codes import load_country_names
+from utils.feature_index import FeatureIndex, FeatureRef
+from utils.geojson_stream import feature_collection_etag, feature_collection_size, stream_feature_collection
+from utils.spatial_index import CountryLocator
+from utils.geometry_meta import META_FILE_NAME, GeometryMetaTable
+from utils.region_infos import INFO_FIELDS, LANGUAGES, project_infos
+from utils.asset_manifest import AssetManifest
 from utils.session_codec import SessionCodec
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 PORT = 3111
+GEOCODES_CACHE_SIZE = 256
+GEOJSON_FORMATS = ('geojson', 'topojson')
+DERIVED_GEOJSON_CACHE_SIZE = 64
+DERIVED_GEOJSON_CACHE_BYTES = 128 << 20
+GEOMETRY_META_CACHE_SIZE = 64
+BOOTSTRAP_CACHE_SIZE = 64
+INFOS_CACHE_SIZE = 256
+MAX_LOCATE_POINTS = 1000
+MAX_BATCH_POINTS = 200000
+ASSETS_PATH: Path = Path(__file__).parent.parent / 'assets'
+TILE_CACHE_PATH: Path = Path(__file__).parent.parent / 'cache' / 'tiles'
+TILE_CACHE_MAX_BYTES = 256 << 20
+
+# Cache-Control of the static geodata endpoints, which only change on asset redeploys
+app.config['GEODATA_CACHE_MAX_AGE'] = int(os.environ.get('GEONOVIS_CACHE_MAX_AGE', 3600))
+app.config['GEODATA_CACHE_IMMUTABLE'] = os.environ.get('GEONOVIS_CACHE_IMMUTABLE', 'false').lower() in ('1', 'true', 'yes')
+
+region_catalog = RegionCatalog(
+    ASSETS_PATH / 'geocodes' / 'world-codes.json',
+    ASSETS_PATH / 'regions' / 'world-infos.json',
+    ASSETS_PATH / 'regions' / DEFINITIONS_FILE_NAME
+)
+region_catalog.load_all()
+geocodes_cache = ResponseCache(GEOCODES_CACHE_SIZE)
+# Values are (body, ETag) pairs
+derived_geojson_cache = ResponseCache(DERIVED_GEOJSON_CACHE_SIZE, DERIVED_GEOJSON_CACHE_BYTES, lambda value: len(value[0]))
+tile_generator = TileGenerator(TILE_CACHE_PATH, max_bytes=TILE_CACHE_MAX_BYTES)
+geometry_store = GeometryStore(ASSETS_PATH / 'geometry')
+feature_index = FeatureIndex(ASSETS_PATH / 'geojson', load_country_names(ASSETS_PATH / 'regions' / 'world-infos.json'))
+feature_index.build()
+country_locator = CountryLocator(feature_index)
+country_locator.build()
+geometry_meta = GeometryMetaTable(ASSETS_PATH / 'geometry' / META_FILE_NAME, feature_index)
+geometry_meta.get()
+geometry_meta_cache = ResponseCache(GEOMETRY_META_CACHE_SIZE)
+asset_manifest = AssetManifest(ASSETS_PATH)
+asset_manifest.build()
+bootstrap_cache = ResponseCache(BOOTSTRAP_CACHE_SIZE)
+infos_cache = ResponseCache(INFOS_CACHE_SIZE)
+log(f"Loaded {SessionCodec.load_dictionaries(ASSETS_PATH / 'session')} session dictionaries", level="INFO")
+log(f"Loaded {SessionCodec.load_code_tables(ASSETS_PATH / 'session')} session code tables", level="INFO")
+SessionCodec.set_baselines(lambda region: list(region_catalog.get(region)) if region_catalog.definition(region) else None)
+
+def json_body(data) -> tuple[bytes, str]:
+    """
+    Serializes data to compact JSON bytes along with their content ETag.
+
+    Returns:
+        tuple: The JSON body and its ETag.
+    """
+    body = app.json.dumps(data, separators=(',', ':')).encode('utf-8')
+    return body, content_etag(body)
+
+def cache_geodata(response: Response) -> Response:
+    """Applies the configured Cache-Control policy of the geodata endpoints."""
+    return apply_cache_control(
+        response,
+        app.config['GEODATA_CACHE_MAX_AGE'],
+        app.config['GEODATA_CACHE_IMMUTABLE']
+    )
+
+def parse_geojson_options() -> dict:
+    """
+    Reads the GeoJSON processing options of the request.
+
+    `grid` and `tolerance` are snapped down to `GRID_LEVELS` and
+    `TOLERANCE_LEVELS`, since each distinct value is a cached body.
+
+    Returns:
+        dict: The options given, empty when the raw asset is requested.
+
+    Raises:
+        ValueError: If an option has an invalid value.
+    """
+    options = {}
+    if 'precision' in request.args:
+        try:
+            options['precision'] = int(request.args['precision'])
+        except ValueError:
+            raise ValueError('precision must be an integer')
+        if not 0 <= options['precision'] <= 15:
+            raise ValueError('precision must be between 0 and 15')
+    if 'grid' in request.args:
+        try:
+            options['grid'] = float(request.args['grid'])
+        except ValueError:
+            raise ValueError('grid must be a number')
+        if not options['grid'] > 0:
+            raise ValueError('grid must be positive')
+        options['grid'] = snap_to_level(options['grid'], GRID_LEVELS)
+    if 'lod' in request.args:
+        options['lod'] = request.args['lod']
+        if options['lod'] not in LOD_TOLERANCES:
+            raise ValueError(f"lod must be one of {', '.join(LOD_TOLERANCES)}")
+    if 'tolerance' in request.args:
+        try:
+            options['tolerance'] = float(request.args['tolerance'])
+        except ValueError:
+            raise ValueError('tolerance must be a number')
+        if not options['tolerance'] >= 0:
+            raise ValueError('tolerance must not be negative')
+        options['tolerance'] = snap_to_level(options['tolerance'], TOLERANCE_LEVELS)
+    if 'method' in request.args:
+        options['method'] = request.args['method']
+        if options['method'] not in SIMPLIFY_METHODS:
+            raise ValueError(f"method must be one of {', '.join(SIMPLIFY_METHODS)}")
+    if 'format' in request.args:
+        if request.args['format'] not in GEOJSON_FORMATS:
+            raise ValueError(f"format must be one of {', '.join(GEOJSON_FORMATS)}")
+        if request.args['format'] != 'geojson':
+            options['format'] = request.args['format']
+    return options
+
+def process_geojson(data: dict, options: dict, name: str) -> bytes:
+    """
+    Applies the processing options to a parsed GeoJSON asset.
+
+    Geometries are simplified first (`tolerance`, or the tolerance of `lod`),
+    then their coordinates are quantized. With `format=topojson` the result
+    is converted to TopoJSON, whose single object is named after the asset.
+
+    Returns:
+        bytes: The minified GeoJSON or TopoJSON.
+    """
+    tolerance = options.get('tolerance', LOD_TOLERANCES.get(options.get('lod')))
+    if tolerance:
+        data = simplify_geojson(data, tolerance, options.get('method', 'dp'))
+    data = quantize_geojson(data, options.get('precision'), options.get('grid'))
+    if options.get('format') == 'topojson':
+        return minify_json(encode_topojson(data, object_name=name))
+    return minify_json(data)
+
+def negotiated_body(cache: ResponseCache, key: tuple, build) -> tuple[bytes, str, str | None]:
+    """
+    Returns a body built once per cache key, compressed for the client when it accepts it.
+
+    The identity body and each compressed variant are cached separately.
+
+    Args:
+        cache (ResponseCache): Cache of the bodies.
+        key (tuple): Cache key of the content.
+        build (Callable): Builds the identity body and its ETag.
+
+    Returns:
+        tuple: The body, its ETag and its Content-Encoding (None for identity).
+    """
+    body, etag = cache.get_or_create(key + (None,), build)[0]
+    encoding = choose_encoding(request.accept_encodings, list(ENCODING_SUFFIXES))
+    if encoding:
+        def build_encoded() -> tuple[bytes, str]:
+            encoded = compress_body(body, encoding)
+            return encoded, content_etag(encoded)
+        body, etag = cache.get_or_create(key + (encoding,), build_encoded)[0]
+    return body, etag, encoding
+
+def send_compressed_json(cache: ResponseCache, key: tuple, build) -> Response:
+    """
+    Serves JSON data built once per cache key, compressed for the client.
+
+    Args:
+        cache (ResponseCache): Cache of the bodies.
+        key (tuple): Cache key of the data.
+        build (Callable): Builds the data to serialize.
+
+    Returns:
+        Response: The JSON response, 304 when the client copy is current.
+    """
+    body, etag, encoding = negotiated_body(cache, key, lambda: json_body(build()))
+    response = conditional_response(request, body, etag, app.json.mimetype)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+def send_derived_geojson(file_path: Path, options: dict, build) -> Response:
+    """
+    Serves a processed version of a GeoJSON asset.
+
+    The processed body and its compressed variants are built once per asset
+    version and options, then served from memory.
+
+    Args:
+        file_path (Path): Path of the source asset.
+        options (dict): Processing options, part of the cache key.
+        build (Callable): Builds the body bytes from the parsed asset.
+
+    Returns:
+        Response: The processed GeoJSON response.
+    """
+    stat = file_path.stat()
+
+    def build_identity() -> tuple[bytes, str]:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            body = build(json.load(f))
+        return body, content_etag(body)
+
+    key = (str(file_path), stat.st_mtime_ns, tuple(sorted(options.items())))
+    body, etag, encoding = negotiated_body(derived_geojson_cache, key, build_identity)
+    response = conditional_response(request, body, etag, 'application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.last_modified = stat.st_mtime
+    return cache_geodata(apply_ranges(request, response, len(body), bytes_range_reader(body)))
+
+def send_feature_collection(refs: list[FeatureRef]) -> Response:
+    """
+    Streams a FeatureCollection of indexed features straight from the assets.
+
+    The ETag and Content-Length are known before any feature is read, so a
+    revalidation costs no disk read and the body is never held in memory.
+
+    Returns:
+        Response: Streamed GeoJSON response.
+    """
+    size = feature_collection_size(refs)
+    response = Response(stream_feature_collection(refs), mimetype='application/json')
+    response.headers['Content-Length'] = str(size)
+    response.set_etag(feature_collection_etag(refs))
+    if refs:
+        response.last_modified = max(ref.path.stat().st_mtime for ref in refs)
+    response = response.make_conditional(request)
+    return cache_geodata(apply_ranges(request, response, size, stream_range_reader(lambda: stream_feature_collection(refs))))
 
 @app.route('/')
 def home() -> Response:
     """Home route."""
     return 'Welcome to the Geonovis API!'
 
+@app.route('/api/geojson/features')
+def get_geojson_features() -> Response:
+    """
+    Get the features of some countries as a single FeatureCollection.
+
+    The features are copied byte for byte from the GeoJSON assets through
+    the country code index, so only the requested countries are read.
+    Codes without any feature are listed in the X-Missing-Codes header.
+
+    Returns:
+        Response: GeoJSON FeatureCollection or error message.
+    """
+    codes = request.args.get('codes')
+    if not codes:
+        return jsonify({
+            'error': 'Missing codes parameter',
+            'details': 'Please provide a codes parameter with a comma-separated list of country codes'
+        }), 400
+
+    code_list = normalize_regions(codes.lower().split(','))
+    try:
+        refs, missing = feature_index.select(list(code_list))
+        if not refs:
+            return jsonify({
+                'error': 'Features not found',
+                'details': f"No feature matches the country codes: {', '.join(code_list)}"
+            }), 404
+
+        response = send_feature_collection(refs)
+        if missing:
+            response.headers['X-Missing-Codes'] = ','.join(missing)
+        log(f"Served {len(refs)} features for country codes: {list(code_list)}", level="INFO")
+        return response
+    except Exception as e:
+        log(f"Error assembling features: {str(e)}", level="ERROR")
+        return jsonify({
+            'error': 'Failed to assemble features',
+            'details': str(e)
+        }), 500
+
+@app.route('/api/geojson/merged')
+def get_merged_geojson() -> Response:
+    """
+    Get the features of the countries of several regions as one FeatureCollection.
+
+    The countries are those of the merged geocodes of the regions (see
+    `/api/geocodes`); their features are streamed from the feature index.
+
+    Returns:
+        Response: GeoJSON FeatureCollection or error message.
+    """
+    regions = request.args.get('regions')
+    if not regions:
+        return jsonify({
+            'error': 'Missing regions parameter',
+            'details': 'Please provide a regions parameter with a comma-separated list of region names'
+        }), 400
+
+    region_list = normalize_regions(regions.split(','))
+    try:
+        codes = sorted(region_catalog.get_merged(list(region_list)))
+        refs, missing = feature_index.select(codes)
+        if not refs:
+            return jsonify({
+                'error': 'Features not found',
+                'details': f"No feature matches the countries of the regions: {', '.join(region_list)}"
+            }), 404
+
+        response = send_feature_collection(refs)
+        log(f"Served {len(refs)} merged features for regions: {list(region_list)} ({len(missing)} countries without geometry)", level="INFO")
+        return response
+    except Exception as e:
+        log(f"Error merging GeoJSON: {str(e)}", level="ERROR")
+        return jsonify({
+            'error': 'Failed to merge GeoJSON',
+            'details': str(e)
+        }), 500
+
 @app.route('/api/geojson/<region>')
 def get_geojson(region: str) -> Response:
     """
     Get GeoJSON data for a specific region.
 
+    Optional `precision` (decimals) or `grid` (cell size in degrees) query
+    parameters reduce the coordinate precision of the returned GeoJSON, and
+    `lod` (low, medium, high) or `tolerance` (degrees) with an optional
+    `method` (dp, vw) return a simplified version of the geometries; `grid`
+    and `tolerance` are snapped down to fixed levels.
+    `format=topojson` returns the region as quantized TopoJSON with shared arcs.
+
     Returns:
         Response: GeoJSON response for the specified region or error message.
     """
-    file_path: Path = Path(__file__).parent.parent / 'assets' / 'geojson' / region / f"{region}.geo.json"
+    file_path: Path = ASSETS_PATH / 'geojson' / region / f"{region}.geo.json"
 
     if not file_path.exists():
         log("File not found", level="ERROR")
@@ -37,17 +366,458 @@ def get_geojson(region: str) -> Response:
         }), 404
     
     try:
-        response: Response = send_file(file_path, mimetype='application/json')
+        options = parse_geojson_options()
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid parameter',
+            'details': str(e)
+        }), 400
+
+    try:
+        precomputed_lod = lod_path(file_path, options['lod']) if list(options) == ['lod'] else None
+        if precomputed_lod and precomputed_lod.exists() and precomputed_lod.stat().st_mtime_ns >= file_path.stat().st_mtime_ns:
+            response: Response = cache_geodata(send_precompressed(precomputed_lod, request.accept_encodings, 'application/json'))
+        elif options:
+            response: Response = send_derived_geojson(
+                file_path,
+                options,
+                lambda data: process_geojson(data, options, region)
+            )
+        else:
+            response: Response = cache_geodata(send_precompressed(file_path, request.accept_encodings, 'application/json'))
         log(f"Served geojson for region: {region}", level="INFO")
         return response
     except Exception as e:
         log(f"Error sending file: {str(e)}", level="ERROR")
         return '', 500
 
+@app.route('/api/tiles/<layer>/<int:z>/<int:x>/<int:y>.mvt')
+def get_tile(layer: str, z: int, x: int, y: int) -> Response:
+    """
+    Get a Mapbox Vector Tile of a region layer.
+
+    Tiles are rendered from the region GeoJSON asset on first request and
+    cached on disk until the asset changes, up to the cached zoom level.
+    Tiles without any feature are answered with 204 No Content.
+
+    Returns:
+        Response: Protobuf-encoded vector tile, no content, or error message.
+    """
+    file_path: Path = ASSETS_PATH / 'geojson' / layer / f"{layer}.geo.json"
+
+    if not file_path.exists():
+        log("File not found", level="ERROR")
+        return jsonify({
+            'error': 'Region file not found',
+            'details': f"Could not find {layer}.geojson in assets/{layer}/"
+        }), 404
+
+    if not is_valid_tile(z, x, y):
+        return jsonify({
+            'error': 'Invalid tile',
+            'details': f"Tile {z}/{x}/{y} does not exist"
+        }), 400
+
+    try:
+        tile = tile_generator.get_tile(layer, file_path, z, x, y)
+        response: Response | None = None
+        if isinstance(tile, Path):
+            try:
+                response = send_file(
+                    tile,
+                    mimetype='application/vnd.mapbox-vector-tile',
+                    etag=file_etag(tile),
+                    conditional=True
+                )
+            except FileNotFoundError:
+                # Evicted by a concurrent request once the cache is full
+                tile = tile_generator.render_tile(layer, file_path, z, x, y)
+        if response is None:
+            if not tile:
+                log(f"Empty tile {z}/{x}/{y} for layer: {layer}", level="INFO")
+                return cache_geodata(Response(status=204))
+            response = Response(tile, mimetype='application/vnd.mapbox-vector-tile')
+            response.add_etag()
+            response.make_conditional(request)
+        log(f"Served tile {z}/{x}/{y} for layer: {layer}", level="INFO")
+        return cache_geodata(response)
+    except Exception as e:
+        log(f"Error rendering tile: {str(e)}", level="ERROR")
+        return '', 500
+
+@app.route('/api/geometry/<name>')
+def get_geometry(name: str) -> Response:
+    """
+    Get a binary geometry container, or the features of some countries only.
+
+    With a `codes` parameter (comma-separated country codes) a container
+    holding only those features is streamed from the memory-mapped file,
+    each feature section sliced from the mapping and copied one at a time.
+
+    Returns:
+        Response: Binary geometry container or error message.
+    """
+    container = geometry_store.get(name)
+    if container is None:
+        log("File not found", level="ERROR")
+        return jsonify({
+            'error': 'Geometry file not found',
+            'details': f"Could not find {name}.gnvb in assets/geometry/"
+        }), 404
+
+    codes = request.args.get('codes')
+    try:
+        if not codes:
+            response: Response = send_precompressed(container.file_path, request.accept_encodings, 'application/octet-stream')
+            log(f"Served geometry container: {name}", level="INFO")
+            return cache_geodata(response)
+
+        code_list = normalize_regions(codes.lower().split(','))
+        indexes = container.select(list(code_list))
+        etag = content_etag(f"{file_etag(container.file_path)}:{','.join(code_list)}".encode('utf-8'))
+        size = container.subset_size(indexes)
+        response = Response(container.iter_subset(indexes), mimetype='application/octet-stream')
+        response.headers['Content-Length'] = str(size)
+        response.set_etag(etag)
+        response.last_modified = container.file_path.stat().st_mtime
+        response = response.make_conditional(request)
+        response = apply_ranges(request, response, size, stream_range_reader(lambda: container.iter_subset(indexes)))
+        log(f"Served {len(indexes)} geometry features of {name} for codes: {list(code_list)}", level="INFO")
+        return cache_geodata(response)
+    except Exception as e:
+        log(f"Error serving geometry: {str(e)}", level="ERROR")
+        return '', 500
+
+def build_geometry_meta(regions: tuple[str, ...]) -> tuple[bytes, str]:
+    """
+    Serializes the geometry metadata of the countries of some regions, or of every country.
+
+    Returns:
+        tuple: The JSON body and its ETag.
+    """
+    table = geometry_meta.get()
+    if regions:
+        codes = region_catalog.get_merged(list(regions))
+        table = {code: table[code] for code in codes if code in table}
+    return json_body(table)
+
+@app.route('/api/geometry-meta')
+def get_geometry_meta() -> Response:
+    """
+    Get the bbox, centroid, area and vertex/ring counts of each country.
+
+    An optional `regions` parameter restricts the table to the countries of
+    those regions, as in `/api/geocodes`.
+
+    Returns:
+        Response: JSON response containing the metadata keyed by country code or error message.
+    """
+    regions = request.args.get('regions')
+    region_list = normalize_regions(regions.split(',')) if regions else ()
+
+    try:
+        table = geometry_meta.get()
+        region_catalog.refresh()
+        cache_key = (geometry_meta.version, region_catalog.version, region_list)
+        (body, etag), hit = geometry_meta_cache.get_or_create(cache_key, lambda: build_geometry_meta(region_list))
+        log(f"Served geometry metadata for regions: {list(region_list) or 'all'} ({len(table)} countries known)", level="INFO")
+        response = conditional_response(request, body, etag, app.json.mimetype)
+        response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+        return cache_geodata(response)
+    except Exception as e:
+        log(f"Error processing geometry metadata: {str(e)}", level="ERROR")
+        return jsonify({
+            'error': 'Failed to process geometry metadata',
+            'details': str(e)
+        }), 500
+
+def parse_coordinates(lat, lon) -> tuple[float, float]:
+    """
+    Validates a latitude/longitude pair.
+
+    Returns:
+        tuple: The (lon, lat) point.
+
+    Raises:
+        ValueError: If a coordinate is missing, not a number or out of range.
+    """
+    if lat is None or lon is None:
+        raise ValueError("lat and lon are required")
+    if isinstance(lat, bool) or isinstance(lon, bool):
+        raise ValueError("lat and lon must be numbers")
+    lat, lon = float(lat), float(lon)
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        raise ValueError("lat must be within [-90, 90] and lon within [-180, 180]")
+    return lon, lat
+
+@app.route('/api/locate')
+def locate() -> Response:
+    """
+    Get the country code of the point given by the `lat` and `lon` parameters.
+
+    Returns:
+        Response: JSON response containing the country code (null outside any country) or error message.
+    """
+    try:
+        lon, lat = parse_coordinates(request.args.get('lat'), request.args.get('lon'))
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid coordinates',
+            'details': str(e)
+        }), 400
+
+    code = country_locator.locate(lon, lat)
+    log(f"Located ({lat}, {lon}) in: {code}", level="INFO")
+    return jsonify({
+        'lat': lat,
+        'lon': lon,
+        'code': code
+    })
+
+@app.route('/api/locate', methods=['POST'])
+def locate_points() -> Response:
+    """
+    Get the country codes of several points.
+
+    Expects a JSON array of {"lat": ..., "lon": ...} objects.
+
+    Returns:
+        Response: JSON response containing one country code per point or error message.
+    """
+    points = request.get_json(silent=True)
+    if not isinstance(points, list) or not points:
+        return jsonify({
+            'error': 'Invalid request',
+            'details': 'Please provide a JSON array of {"lat": ..., "lon": ...} objects'
+        }), 400
+    if len(points) > MAX_LOCATE_POINTS:
+        return jsonify({
+            'error': 'Too many points',
+            'details': f"At most {MAX_LOCATE_POINTS} points can be located per request"
+        }), 400
+
+    try:
+        coordinates = [parse_coordinates(point.get('lat'), point.get('lon')) for point in points]
+    except (AttributeError, TypeError, ValueError) as e:
+        return jsonify({
+            'error': 'Invalid coordinates',
+            'details': str(e)
+        }), 400
+
+    codes = country_locator.locate_many(coordinates)
+    log(f"Located {len(codes)} points", level="INFO")
+    return jsonify({'codes': codes})
+
+def parse_batch_points(data: bytes, mimetype: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Reads the points of a batch locate request.
+
+    The body is either a JSON array of [lat, lon] pairs or, with an
+    application/octet-stream content type, packed little-endian float64
+    lat/lon pairs.
+
+    Returns:
+        tuple: Longitude and latitude arrays.
+
+    Raises:
+        TypeError: If a coordinate is not a finite number.
+        ValueError: If the body is malformed or a coordinate is out of range.
+    """
+    if mimetype == 'application/octet-stream':
+        if not data:
+            raise ValueError("the binary body must hold at least one lat/lon pair")
+        if len(data) % 16:
+            raise ValueError("the binary body must hold float64 lat/lon pairs (16 bytes per point)")
+        points = np.frombuffer(data, dtype='<f8').reshape(-1, 2)
+    else:
+        try:
+            pairs = json.loads(data)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"invalid JSON array of [lat, lon] pairs: {e}")
+        if not isinstance(pairs, list) or not pairs or not all(isinstance(pair, list) and len(pair) == 2 for pair in pairs):
+            raise ValueError("the JSON body must be an array of [lat, lon] pairs")
+        # float() would turn null into NaN and bools into 0/1
+        if not all(type(value) in (int, float) for pair in pairs for value in pair):
+            raise TypeError("lat and lon must be numbers")
+        points = np.array(pairs, dtype=np.float64)
+
+    if not np.all(np.isfinite(points)):
+        raise TypeError("lat and lon must be finite numbers")
+    lats, lons = points[:, 0], points[:, 1]
+    if not (np.all(np.abs(lats) <= 90) and np.all(np.abs(lons) <= 180)):
+        raise ValueError("lat must be within [-90, 90] and lon within [-180, 180]")
+    return lons, lats
+
+@app.route('/api/locate/batch', methods=['POST'])
+def locate_batch() -> Response:
+    """
+    Get the country codes of a large batch of points.
+
+    Accepts a JSON array of [lat, lon] pairs or a packed float64 binary body,
+    see `parse_batch_points`.
+
+    Returns:
+        Response: JSON response containing one country code per point, in order, or error message.
+    """
+    try:
+        lons, lats = parse_batch_points(request.get_data(), request.mimetype)
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'error': 'Invalid points',
+            'details': str(e)
+        }), 400
+    if len(lons) > MAX_BATCH_POINTS:
+        return jsonify({
+            'error': 'Too many points',
+            'details': f"At most {MAX_BATCH_POINTS} points can be located per request"
+        }), 400
+
+    codes = country_locator.locate_batch(lons, lats)
+    log(f"Located a batch of {len(codes)} points", level="INFO")
+    body, _ = json_body({'codes': codes})
+    return Response(body, mimetype=app.json.mimetype)
+
+@app.route('/api/manifest')
+def get_manifest() -> Response:
+    """
+    Get the size, content hash and precompressed encodings of every asset.
+
+    Returns:
+        Response: JSON response containing the manifest entries keyed by asset path.
+    """
+    asset_manifest.refresh()
+    response = send_compressed_json(
+        bootstrap_cache,
+        ('manifest', asset_manifest.version),
+        lambda: {'assets': asset_manifest.entries}
+    )
+    log("Served asset manifest", level="INFO")
+    return response
+
+def build_bootstrap(regions: tuple[str, ...]) -> dict:
+    """
+    Builds everything the client loads on startup for some regions.
+
+    Returns:
+        dict: Merged geocodes, country infos and the GeoJSON URLs with their manifest entries.
+    """
+    geojson = {}
+    for region in regions:
+        entry = asset_manifest.get(f"geojson/{region}/{region}.geo.json")
+        if entry is not None:
+            geojson[region] = {'url': url_for('get_geojson', region=region), **entry}
+    return {
+        'regions': list(regions),
+        'geocodes': region_catalog.get_merged(list(regions)),
+        'infos': region_catalog.get_infos(list(regions)),
+        'geojson': geojson,
+        'features': url_for('get_merged_geojson', regions=','.join(regions))
+    }
+
+@app.route('/api/bootstrap')
+def get_bootstrap() -> Response:
+    """
+    Get the merged geocodes, country infos and GeoJSON URLs of some regions in one response.
+
+    Returns:
+        Response: Compressed JSON response or error message.
+    """
+    regions = request.args.get('regions')
+    if not regions:
+        return jsonify({
+            'error': 'Missing regions parameter',
+            'details': 'Please provide a regions parameter with a comma-separated list of region names'
+        }), 400
+
+    region_list = normalize_regions(regions.split(','))
+    unknown = [region for region in region_list if region not in region_catalog.regions]
+    if unknown:
+        return jsonify({
+            'error': 'Unknown regions',
+            'details': f"No region definition for: {', '.join(unknown)}"
+        }), 404
+
+    try:
+        asset_manifest.refresh()
+        cache_key = ('bootstrap', region_catalog.version, asset_manifest.version, region_list)
+        response = send_compressed_json(bootstrap_cache, cache_key, lambda: build_bootstrap(region_list))
+        log(f"Served bootstrap for regions: {list(region_list)}", level="INFO")
+        return cache_geodata(response)
+    except Exception as e:
+        log(f"Error building bootstrap: {str(e)}", level="ERROR")
+        return jsonify({
+            'error': 'Failed to build bootstrap',
+            'details': str(e)
+        }), 500
+
+@app.route('/api/infos')
+def get_infos() -> Response:
+    """
+    Get the infos (names, capitals, continent...) of the countries of some regions.
+
+    Optional `lang` (en, fr) keeps a single language and `fields`
+    (comma-separated, among country, capital, continent, immatriculate_plate)
+    keeps only those fields. Each projection is cached separately.
+
+    Returns:
+        Response: JSON response containing the infos keyed by country code or error message.
+    """
+    regions = request.args.get('regions')
+    if not regions:
+        return jsonify({
+            'error': 'Missing regions parameter',
+            'details': 'Please provide a regions parameter with a comma-separated list of region names'
+        }), 400
+
+    lang = request.args.get('lang') or None
+    if lang is not None and lang not in LANGUAGES:
+        return jsonify({
+            'error': 'Invalid parameter',
+            'details': f"lang must be one of: {', '.join(LANGUAGES)}"
+        }), 400
+
+    fields = request.args.get('fields')
+    field_list = tuple(dict.fromkeys(field.strip() for field in fields.split(',') if field.strip())) if fields else INFO_FIELDS
+    unknown_fields = [field for field in field_list if field not in INFO_FIELDS]
+    if unknown_fields or not field_list:
+        return jsonify({
+            'error': 'Invalid parameter',
+            'details': f"fields must be among: {', '.join(INFO_FIELDS)}"
+        }), 400
+
+    region_list = normalize_regions(regions.split(','))
+    unknown = [region for region in region_list if region not in region_catalog.regions]
+    if unknown:
+        return jsonify({
+            'error': 'Unknown regions',
+            'details': f"No region definition for: {', '.join(unknown)}"
+        }), 404
+
+    try:
+        cache_key = (region_catalog.version, region_list, lang, field_list)
+        response = send_compressed_json(
+            infos_cache,
+            cache_key,
+            lambda: project_infos(region_catalog.get_infos(list(region_list)), lang, field_list)
+        )
+        log(f"Served infos for regions: {list(region_list)} (lang: {lang or 'all'}, fields: {list(field_list)})", level="INFO")
+        return cache_geodata(response)
+    except Exception as e:
+        log(f"Error processing infos: {str(e)}", level="ERROR")
+        return jsonify({
+            'error': 'Failed to process infos',
+            'details': str(e)
+        }), 500
+
 @app.route('/api/geocodes')
 def get_geocodes() -> Response:
     """Get merged geocodes for specified regions.
 
+    `regions` is a set expression over region names: `,` or `|` for union,
+    `&` or `*` for intersection, `-` for difference, with parentheses, e.g.
+    `europe-balkans` or `africa*arab_world`. A plain comma-separated list is
+    the union of its regions. Results are cached by normalized expression.
+
     Returns:
         Response: JSON response containing merged geocodes or error message.
     """
@@ -57,14 +827,27 @@ def get_geocodes() -> Response:
             'error': 'Missing regions parameter',
             'details': 'Please provide a regions parameter with a comma-separated list of region names'
         }), 400
-    
-    region_list = [region.strip() for region in regions.split(',')]
-    geocodes_base_path = Path(__file__).parent.parent / 'assets' / 'geocodes'
-    
+
+    try:
+        expression = parse_region_expression(regions)
+    except ValueError as e:
+        return jsonify({
+            'error': 'Invalid regions expression',
+            'details': str(e)
+        }), 400
+    normalized = format_expression(expression)
+
     try:
-        unique_geocodes = get_merged_geocodes(region_list, str(geocodes_base_path))
-        log(f"Served geocodes for regions: {region_list}", level="INFO")
-        return jsonify(unique_geocodes)
+        region_catalog.refresh()
+        cache_key = (region_catalog.version, normalized)
+        (body, etag), hit = geocodes_cache.get_or_create(
+            cache_key,
+            lambda: json_body(region_catalog.get_expression(expression))
+        )
+        log(f"Served geocodes for regions: {normalized}", level="INFO")
+        response = conditional_response(request, body, etag, app.json.mimetype)
+        response.headers['X-Cache'] = 'HIT' if hit else 'MISS'
+        return cache_geodata(response)
     except Exception as e:
         log(f"Error processing geocodes: {str(e)}", level="ERROR")
         return jsonify({
@@ -72,10 +855,83 @@ def get_geocodes() -> Response:
             'details': str(e)
         }), 500
 
+@app.route('/api/geocodes/<code>/regions')
+def get_code_regions(code: str) -> Response:
+    """Get the regions containing a country code.
+
+    Returns:
+        Response: JSON response containing the region names or error message.
+    """
+    code = code.strip().lower()
+    regions = region_catalog.regions_containing(code)
+    if regions is None:
+        return jsonify({
+            'error': 'Unknown country code',
+            'details': f"No region contains the country code {code}"
+        }), 404
+
+    log(f"Served regions for country code: {code}", level="INFO")
+    return jsonify({
+        'code': code,
+        'regions': regions
+    })
+
+@app.route('/api/cache/stats')
+def get_cache_stats() -> Response:
+    """Get hit/miss counters of the response caches.
+
+    Returns:
+        Response: JSON response containing the stats of each cache.
+    """
+    return jsonify({
+        'geocodes': geocodes_cache.stats(),
+        'derived_geojson': derived_geojson_cache.stats(),
+        'geometry_meta': geometry_meta_cache.stats(),
+        'bootstrap': bootstrap_cache.stats(),
+        'infos': infos_cache.stats()
+    })
+
+def parse_session_options() -> dict:
+    """
+    Reads the session encoding options of the request.
+
+    Returns:
+        dict: Keyword arguments of `SessionCodec.encode`.
+
+    Raises:
+        ValueError: If an option has an invalid value.
+    """
+    options = {
+        name: request.args.get(name, 'false').lower() in ('1', 'true', 'yes')
+        for name in ('framed', 'schema', 'delta')
+    }
+    for name in ('quality', 'lgwin', 'dictionary'):
+        if name in request.args:
+            try:
+                options[name] = int(request.args[name])
+            except ValueError:
+                raise ValueError(f'{name} must be an integer')
+    if 'budget' in request.args:
+        try:
+            options['latency_budget_ms'] = float(request.args['budget'])
+        except ValueError:
+            raise ValueError('budget must be a number')
+        if not options['latency_budget_ms'] >= 0:
+            raise ValueError('budget must not be negative')
+    return options
+
 @app.route('/api/session/encode', methods=['POST'])
 def encode_session() -> Response:
     """
-    Convert session data using MessagePack + Brotli + Base85 + Base64URL encoding.
+    Convert session data using MessagePack + Brotli + Base64URL encoding.
+
+    With `framed=true` the token carries a format header (see SessionCodec).
+    Brotli quality and window adapt to the payload size unless `quality` or
+    `lgwin` are given; `budget` sets the compression time budget in ms.
+    `dictionary=<id>` deflates with a preset dictionary instead (framed).
+    `schema=true` packs the game state against the country code table (framed).
+    `delta=true` encodes it as changes to the pristine state of its region
+    (framed), resolved against the region catalog when decoding.
     
     Returns:
         Response: JSON response containing encoded data or error message.
@@ -89,7 +945,15 @@ def encode_session() -> Response:
             'error': 'No data provided'
         }), 400
     
-    result = SessionCodec.encode(data)
+    try:
+        options = parse_session_options()
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+    result = SessionCodec.encode(data, **options)
     
     if result["success"]:
         log(f"Successfully encoded session data", level="INFO")
@@ -101,7 +965,7 @@ def encode_session() -> Response:
 @app.route('/api/session/decode', methods=['POST'])
 def decode_session() -> Response:
     """
-    Decode session data from MessagePack + Brotli + Base85 + Base64URL format.
+    Decode session data from MessagePack + Brotli + Base64URL format, framed or not.
     
     Returns:
         Response: JSON response containing decoded data or error message.
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+import threading
+import time
+from pathlib import Path
+from lite_logging.lite_logging import log
+
+from utils.precompressed import ENCODING_SUFFIXES, available_encodings, file_etag
+
+class AssetManifest:
+    """
+    Size, content hash and precompressed encodings of every file of the assets folder.
+
+    Precompressed siblings (`.br`, `.gz`) are listed as encodings of their
+    source rather than as assets. Hashes are only computed for new or
+    changed files; the folder is walked again at most every
+    `check_interval` seconds.
+    """
+
+    def __init__(self, base_path: Path, check_interval: float = 5.0):
+        """
+        Args:
+            base_path (Path): Path of the assets folder.
+            check_interval (float): Minimum delay in seconds between two folder walks.
+        """
+        self.base_path = base_path
+        self.check_interval = check_interval
+        self.version = 0
+        self._entries: dict[str, tuple[tuple, dict]] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def entries(self) -> dict[str, dict]:
+        """Manifest entries keyed by POSIX path relative to the assets folder."""
+        self.refresh()
+        return {name: entry for name, (_, entry) in self._entries.items()}
+
+    def build(self) -> None:
+        """Walks the assets folder and hashes every file."""
+        self.refresh(force=True)
+        log(f"Built the manifest of {len(self._entries)} assets", level="INFO")
+
+    def get(self, name: str) -> dict | None:
+        """
+        Returns the manifest entry of an asset.
+
+        Args:
+            name (str): POSIX path relative to the assets folder.
+
+        Returns:
+            dict: size, hash and encodings of the asset, or None if it is unknown.
+        """
+        self.refresh()
+        cached = self._entries.get(name)
+        return cached[1] if cached else None
+
+    def _is_variant(self, file_path: Path) -> bool:
+        for suffix in ENCODING_SUFFIXES.values():
+            if file_path.name.endswith(suffix) and file_path.with_name(file_path.name[:-len(suffix)]).is_file():
+                return True
+        return False
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Updates the entries of the files added, changed or removed since the last walk.
+
+        Args:
+            force (bool): Walk the folder even if `check_interval` has not elapsed.
+
+        Returns:
+            bool: True if the manifest changed.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            if not force and now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            entries = {}
+            changed = False
+            for file_path in sorted(self.base_path.rglob('*')):
+                if not file_path.is_file() or file_path.name.startswith('.') or self._is_variant(file_path):
+                    continue
+                name = file_path.relative_to(self.base_path).as_posix()
+                try:
+                    variants = available_encodings(file_path)
+                    stat = file_path.stat()
+                    signature = (stat.st_mtime_ns, stat.st_size) + tuple(
+                        (encoding, variant.stat().st_mtime_ns) for encoding, variant in variants.items()
+                    )
+                except OSError:
+                    continue
+                cached = self._entries.get(name)
+                if cached and cached[0] == signature:
+                    entries[name] = cached
+                    continue
+                entries[name] = (signature, {
+                    'size': stat.st_size,
+                    'hash': file_etag(file_path),
+                    'encodings': {encoding: variant.stat().st_size for encoding, variant in variants.items()}
+                })
+                changed = True
+
+            if changed or set(entries) != set(self._entries):
+                self._entries = entries
+                self.version += 1
+                return True
+            return False
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+import json
+from decimal import Decimal
+from typing import Callable
+
+Position = list[float]
+
+# Grid sizes served, in degrees: a 1-2-5 series from about 10 cm to 100 km
+GRID_LEVELS: tuple[float, ...] = tuple(float(f"{mantissa}e{exponent}") for exponent in range(-6, 0) for mantissa in (1, 2, 5)) + (1.0,)
+
+def snap_to_level(value: float, levels: tuple[float, ...]) -> float:
+    """
+    Snaps a value down to the largest level not above it.
+
+    Processed assets are cached per option value, so free-form values are
+    mapped to a few levels, never coarser than requested.
+
+    Args:
+        value (float): Requested value.
+        levels (tuple): Allowed values, in ascending order.
+
+    Returns:
+        float: The snapped level, the smallest one if the value is below all of them.
+    """
+    snapped = levels[0]
+    for level in levels:
+        if level > value:
+            break
+        snapped = level
+    return snapped
+
+def _dedupe_positions(positions: list[Position]) -> list[Position]:
+    """Removes consecutive duplicate positions, which quantization tends to create."""
+    result = []
+    for position in positions:
+        if not result or result[-1] != position:
+            result.append(position)
+    return result
+
+def _map_ring(ring: list[Position], transform: Callable[[Position], Position]) -> list[Position] | None:
+    """Transforms a linear ring, returning None if it collapses below 4 positions."""
+    mapped = _dedupe_positions([transform(position) for position in ring])
+    if len(mapped) < 4 or mapped[0] != mapped[-1]:
+        return None
+    return mapped
+
+def _map_polygon(rings: list[list[Position]], transform: Callable[[Position], Position]) -> list[list[Position]] | None:
+    """Transforms a polygon, dropping collapsed holes and returning None if the exterior collapses."""
+    mapped = [_map_ring(ring, transform) for ring in rings]
+    if not mapped or mapped[0] is None:
+        return None
+    return [ring for ring in mapped if ring is not None]
+
+def map_geometry(geometry: dict | None, transform: Callable[[Position], Position]) -> dict | None:
+    """
+    Applies a transform to every position of a geometry.
+
+    Consecutive positions that become identical are merged, and rings or
+    polygons that collapse are dropped.
+
+    Args:
+        geometry (dict): GeoJSON geometry.
+        transform (Callable): Function mapping a position to a new position.
+
+    Returns:
+        dict: The transformed geometry, or None if it collapsed entirely.
+    """
+    if geometry is None:
+        return None
+
+    geometry_type = geometry.get('type')
+    coordinates = geometry.get('coordinates')
+    result = {key: value for key, value in geometry.items() if key not in ('coordinates', 'geometries', 'bbox')}
+
+    if geometry_type == 'Point':
+        result['coordinates'] = transform(coordinates)
+    elif geometry_type == 'MultiPoint':
+        result['coordinates'] = [transform(position) for position in coordinates]
+    elif geometry_type == 'LineString':
+        result['coordinates'] = _dedupe_positions([transform(position) for position in coordinates])
+    elif geometry_type == 'MultiLineString':
+        result['coordinates'] = [_dedupe_positions([transform(position) for position in line]) for line in coordinates]
+    elif geometry_type == 'Polygon':
+        polygon = _map_polygon(coordinates, transform)
+        if polygon is None:
+            return None
+        result['coordinates'] = polygon
+    elif geometry_type == 'MultiPolygon':
+        polygons = [_map_polygon(polygon, transform) for polygon in coordinates]
+        polygons = [polygon for polygon in polygons if polygon is not None]
+        if not polygons:
+            return None
+        result['coordinates'] = polygons
+    elif geometry_type == 'GeometryCollection':
+        geometries = [map_geometry(child, transform) for child in geometry.get('geometries', [])]
+        result['geometries'] = [child for child in geometries if child is not None]
+    else:
+        return geometry
+    return result
+
+def map_geojson(data: dict, transform: Callable[[Position], Position]) -> dict:
+    """
+    Applies a transform to every position of a GeoJSON object.
+
+    Args:
+        data (dict): FeatureCollection, Feature or bare geometry.
+        transform (Callable): Function mapping a position to a new position.
+
+    Returns:
+        dict: A new GeoJSON object; the input is left untouched.
+    """
+    data_type = data.get('type')
+    result = {key: value for key, value in data.items() if key != 'bbox'}
+
+    if data_type == 'FeatureCollection':
+        result['features'] = [map_geojson(feature, transform) for feature in data.get('features', [])]
+    elif data_type == 'Feature':
+        result['geometry'] = map_geometry(data.get('geometry'), transform)
+    else:
+        result = map_geometry(data, transform) or {'type': data_type, 'coordinates': []}
+    return result
+
+def rounding_transform(precision: int) -> Callable[[Position], Position]:
+    """
+    Returns a transform rounding positions to a number of decimals.
+
+    5 decimals is about 1 m at the equator, which is well below what a
+    country map can show.
+
+    Args:
+        precision (int): Number of decimals kept.
+    """
+    def transform(position: Position) -> Position:
+        return [round(value, precision) for value in position]
+    return transform
+
+def grid_transform(cell_size: float) -> Callable[[Position], Position]:
+    """
+    Returns a transform snapping positions to a fixed grid.
+
+    Args:
+        cell_size (float): Size of a grid cell, in degrees.
+    """
+    # Round to the decimals of the cell itself so snapped values print without float noise
+    decimals = max(0, -Decimal(repr(cell_size)).as_tuple().exponent)
+
+    def transform(position: Position) -> Position:
+        return [round(round(value / cell_size) * cell_size, decimals) for value in position]
+    return transform
+
+def quantize_geojson(data: dict, precision: int | None = None, grid: float | None = None) -> dict:
+    """
+    Reduces the coordinate precision of a GeoJSON object.
+
+    Args:
+        data (dict): GeoJSON object.
+        precision (int): Number of decimals to keep.
+        grid (float): Size of the snapping grid in degrees, used instead of `precision`.
+
+    Returns:
+        dict: The quantized GeoJSON object.
+    """
+    if grid is not None:
+        return map_geojson(data, grid_transform(grid))
+    if precision is not None:
+        return map_geojson(data, rounding_transform(precision))
+    return data
+
+def minify_json(data) -> bytes:
+    """
+    Serializes data to JSON without any whitespace.
+
+    Args:
+        data: JSON-serializable data.
+
+    Returns:
+        bytes: UTF-8 encoded JSON.
+    """
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
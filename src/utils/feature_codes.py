@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import json
+import re
+from pathlib import Path
+
+# Properties holding an ISO 3166-1 alpha-2 code, in order of preference.
+# `code` is the one added by scripts/add_sovereignt_codes.py.
+CODE_PROPERTIES = ('code', 'iso_a2_eh', 'iso_a2')
+# Properties holding a country name, used when no code property is present
+NAME_PROPERTIES = ('name', 'shapeName', 'admin', 'name_en')
+
+def _normalize_name(name: str) -> str:
+    """Lowercases a name and turns `_` and `-` separators into spaces."""
+    return re.sub(r'[\s_\-]+', ' ', name).strip().lower()
+
+def load_country_names(world_infos_path: Path) -> dict[str, str]:
+    """
+    Maps the English and French country names of world-infos.json to their codes.
+
+    Args:
+        world_infos_path (Path): Path of assets/regions/world-infos.json.
+
+    Returns:
+        dict: Lowercase country code keyed by normalized name.
+    """
+    with open(world_infos_path, 'r', encoding='utf-8') as f:
+        world_infos = json.load(f)
+
+    names = {}
+    for country in world_infos:
+        if 'flag' not in country:
+            continue
+        for name in (country.get('country') or {}).values():
+            if isinstance(name, str):
+                names[_normalize_name(name)] = country['flag'].lower()
+    return names
+
+def feature_code(feature: dict, names: dict[str, str] | None = None, fallback_name: str | None = None) -> str | None:
+    """
+    Resolves the country code of a GeoJSON feature.
+
+    The code properties are tried first, then the name properties and
+    finally `fallback_name` (typically the file name, as in
+    `assets/geojson/countries/Hong Kong.geojson`) are looked up in `names`.
+
+    Args:
+        feature (dict): GeoJSON feature.
+        names (dict): Country codes keyed by normalized name, see `load_country_names`.
+        fallback_name (str): Name to try when the properties do not identify the country.
+
+    Returns:
+        str: Lowercase country code, or None if it cannot be resolved.
+    """
+    properties = feature.get('properties') or {}
+    for key in CODE_PROPERTIES:
+        value = properties.get(key)
+        if isinstance(value, str) and len(value) == 2 and value.isalpha():
+            return value.lower()
+
+    if names:
+        candidates = [properties.get(key) for key in NAME_PROPERTIES] + [fallback_name]
+        for candidate in candidates:
+            if isinstance(candidate, str):
+                code = names.get(_normalize_name(candidate))
+                if code:
+                    return code
+    return None
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, Iterator, NamedTuple
+from lite_logging.lite_logging import log
+
+from utils.feature_codes import feature_code
+from utils.simplify import LOD_DIRECTORY
+
+GEOJSON_PATTERNS = ("*.geojson", "*.geo.json")
+# Structural bytes the scanner has to look at; everything else is skipped by the regex
+_TOKENS = re.compile(rb'["\\{}\[\]]')
+
+def asset_name(path: Path) -> str:
+    """File name without its .geojson or .geo.json extension."""
+    name = path.name
+    for extension in (".geo.json", ".geojson"):
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return path.stem
+
+def source_priority(path: Path) -> tuple[bool, str]:
+    """Sort key of the assets: a code is taken from the first asset that has it, country files first."""
+    return (path.parent.name != 'countries', str(path))
+
+def iter_feature_spans(f: BinaryIO, chunk_size: int = 1 << 16) -> Iterator[tuple[int, int]]:
+    """
+    Yields the byte span of each feature of a GeoJSON FeatureCollection.
+
+    The file is read incrementally and only its structure (strings and
+    brackets) is tracked, so the memory used does not depend on the file
+    size and features are not parsed.
+
+    Args:
+        f (BinaryIO): File opened in binary mode, positioned at its start.
+        chunk_size (int): Number of bytes read at a time.
+
+    Yields:
+        tuple: (start, end) byte offsets of a feature object, end excluded.
+    """
+    depth = 0
+    in_string = False
+    skip_at = -1
+    capturing = False
+    capture_from = 0
+    key_buffer = bytearray()
+    last_key = None
+    in_features = False
+    feature_start = 0
+    offset = 0
+
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        for match in _TOKENS.finditer(chunk):
+            position = offset + match.start()
+            char = chunk[match.start()]
+            if in_string:
+                if position == skip_at:
+                    continue
+                if char == 0x5C:  # backslash: the next byte is escaped
+                    skip_at = position + 1
+                elif char == 0x22:
+                    in_string = False
+                    if capturing:
+                        key_buffer += chunk[capture_from:match.start()]
+                        last_key = bytes(key_buffer)
+                        capturing = False
+                continue
+
+            if char == 0x22:
+                in_string = True
+                # Remember the strings of the top-level object to find the "features" key
+                if depth == 1 and not in_features:
+                    capturing = True
+                    capture_from = match.start() + 1
+                    key_buffer = bytearray()
+            elif char in (0x7B, 0x5B):  # { [
+                depth += 1
+                if not in_features and char == 0x5B and depth == 2 and last_key == b'features':
+                    in_features = True
+                elif in_features and depth == 3:
+                    feature_start = position
+            else:  # } ]
+                if in_features and depth == 3:
+                    yield feature_start, position + 1
+                elif in_features and depth == 2:
+                    return
+                depth -= 1
+
+        if capturing:
+            key_buffer += chunk[capture_from:]
+            capture_from = 0
+        offset += len(chunk)
+
+class FeatureRef(NamedTuple):
+    """Location of one feature inside a GeoJSON asset."""
+    path: Path
+    start: int
+    end: int
+
+class FeatureIndex:
+    """
+    Index of the GeoJSON asset features by country code.
+
+    Every asset is scanned once for the byte spans of its features, and each
+    feature is parsed once to resolve its country code; only the spans are
+    kept. When a code appears in several assets, the dedicated country files
+    (`countries/` folder) win, then the first asset in path order, so a
+    country is never returned twice.
+    """
+
+    def __init__(self, base_path: Path, names: dict[str, str] | None = None, check_interval: float = 1.0):
+        """
+        Args:
+            base_path (Path): Folder of the GeoJSON assets.
+            names (dict): Country codes keyed by normalized name, see `load_country_names`.
+            check_interval (float): Minimum delay in seconds between two mtime checks.
+        """
+        self.base_path = base_path
+        self.names = names
+        self.check_interval = check_interval
+        self.version = 0
+        self._files: dict[Path, tuple[int, dict[str, list[FeatureRef]]]] = {}
+        self._codes: dict[str, list[FeatureRef]] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def codes(self) -> list[str]:
+        """Country codes that have at least one feature."""
+        self.refresh()
+        return sorted(self._codes)
+
+    def _sources(self) -> list[Path]:
+        sources = {p for pattern in GEOJSON_PATTERNS for p in self.base_path.rglob(pattern)}
+        return sorted(
+            (p for p in sources if LOD_DIRECTORY not in p.parts[-3:-1]),
+            key=source_priority
+        )
+
+    def _scan(self, path: Path) -> dict[str, list[FeatureRef]]:
+        """Returns the feature spans of an asset, grouped by country code."""
+        codes: dict[str, list[FeatureRef]] = {}
+        unresolved = 0
+        with open(path, 'rb') as f:
+            spans = list(iter_feature_spans(f))
+            for start, end in spans:
+                f.seek(start)
+                feature = json.loads(f.read(end - start))
+                code = feature_code(feature, self.names, asset_name(path))
+                if code is None:
+                    unresolved += 1
+                    continue
+                codes.setdefault(code, []).append(FeatureRef(path, start, end))
+        if unresolved:
+            log(f"{unresolved} features of {path.name} have no country code", level="WARNING")
+        return codes
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Rescans the assets whose mtime changed since they were indexed.
+
+        Args:
+            force (bool): Check the files even if `check_interval` has not elapsed.
+
+        Returns:
+            bool: True if the index changed.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            if not force and now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            sources = self._sources()
+            changed = set(self._files) != set(sources)
+            files = {}
+            for path in sources:
+                try:
+                    mtime = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+                cached = self._files.get(path)
+                if cached and cached[0] == mtime:
+                    files[path] = cached
+                    continue
+                try:
+                    files[path] = (mtime, self._scan(path))
+                    changed = True
+                except Exception as e:
+                    log(f"Error indexing features of {path}: {str(e)}", level="ERROR")
+
+            if changed:
+                codes: dict[str, list[FeatureRef]] = {}
+                for path in sources:
+                    for code, refs in files.get(path, (0, {}))[1].items():
+                        codes.setdefault(code, refs)
+                self._files, self._codes = files, codes
+                self.version += 1
+            return changed
+
+    def build(self) -> None:
+        """Indexes every asset of the folder."""
+        self.refresh(force=True)
+        log(f"Indexed {len(self._codes)} country codes from {len(self._files)} GeoJSON files", level="INFO")
+
+    def get(self, code: str) -> list[FeatureRef]:
+        """
+        Returns the features of a country code.
+
+        Args:
+            code (str): Lowercase country code.
+
+        Returns:
+            list: Feature references, empty if the code is unknown.
+        """
+        self.refresh()
+        return self._codes.get(code, [])
+
+    @staticmethod
+    def read(ref: FeatureRef) -> bytes:
+        """Reads the raw JSON bytes of a feature."""
+        with open(ref.path, 'rb') as f:
+            f.seek(ref.start)
+            return f.read(ref.end - ref.start)
+
+    def select(self, codes: list[str]) -> tuple[list[FeatureRef], list[str]]:
+        """
+        Returns the features of some country codes, without reading them.
+
+        Args:
+            codes (list): Lowercase country codes.
+
+        Returns:
+            tuple: The feature references, in code order, and the codes without any feature.
+        """
+        refs = []
+        missing = []
+        for code in codes:
+            code_refs = self.get(code)
+            if not code_refs:
+                missing.append(code)
+            refs.extend(code_refs)
+        return refs, missing
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+from lite_logging.lite_logging import log
+
+class RegionBitsetIndex:
+    """
+    Membership index of country codes across regions.
+
+    Each country code gets an integer slot (the codes of the reference region
+    first, in file order, then any code only found in other regions) and each
+    region is stored as a bitmask of its slots. Merging regions is a bitwise
+    OR of their masks followed by a single materialization pass, so its cost
+    does not grow with the number of overlapping regions requested.
+    """
+
+    def __init__(self, region_objects: dict[str, dict], reference_region: str = 'world'):
+        """
+        Args:
+            region_objects (dict): Geocode object of each region, keyed by region name.
+            reference_region (str): Region whose codes are assigned the first slots.
+        """
+        self.codes: list[str] = []
+        self.slots: dict[str, int] = {}
+        self.entries: list[dict] = []
+        self.masks: dict[str, int] = {}
+
+        ordered_regions = sorted(region_objects, key=lambda region: (region != reference_region, region))
+        for region in ordered_regions:
+            mask = 0
+            for code, entry in region_objects[region].items():
+                slot = self.slots.get(code)
+                if slot is None:
+                    slot = len(self.codes)
+                    self.slots[code] = slot
+                    self.codes.append(code)
+                    self.entries.append(entry)
+                mask |= 1 << slot
+            self.masks[region] = mask
+
+    def mask_for(self, regions: list[str]) -> int:
+        """
+        Returns the union bitmask of the given regions.
+
+        Args:
+            regions (list): List of region names.
+
+        Returns:
+            int: Bitmask of every slot contained in at least one region.
+        """
+        mask = 0
+        for region in regions:
+            region_mask = self.masks.get(region)
+            if region_mask is None:
+                log(f"Unknown region: {region}", level="ERROR")
+                continue
+            mask |= region_mask
+        return mask
+
+    def materialize(self, mask: int) -> dict:
+        """
+        Builds the geocode object of the slots set in a bitmask.
+
+        Args:
+            mask (int): Bitmask of slots.
+
+        Returns:
+            dict: Geocode object with the country codes as keys, in slot order.
+        """
+        result = {}
+        while mask:
+            lowest = mask & -mask
+            slot = lowest.bit_length() - 1
+            result[self.codes[slot]] = self.entries[slot]
+            mask ^= lowest
+        return result
+
+    def merge(self, regions: list[str]) -> dict:
+        """
+        Returns merged geocodes for the given regions.
+
+        Args:
+            regions (list): List of region names.
+
+        Returns:
+            dict: The merged geocodes object.
+        """
+        return self.materialize(self.mask_for(regions))
+
+    def regions_containing(self, code: str) -> list[str] | None:
+        """
+        Returns the regions a country code belongs to.
+
+        Args:
+            code (str): Country code.
+
+        Returns:
+            list: Sorted region names, or None if the code is unknown.
+        """
+        slot = self.slots.get(code)
+        if slot is None:
+            return None
+        bit = 1 << slot
+        return sorted(region for region, mask in self.masks.items() if mask & bit)
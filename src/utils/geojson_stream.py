@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+from typing import BinaryIO, Iterable, Iterator
+
+from utils.feature_index import FeatureRef
+from utils.http_cache import content_etag
+from utils.precompressed import file_etag
+
+FEATURE_COLLECTION_START = b'{"type":"FeatureCollection","features":['
+FEATURE_COLLECTION_END = b']}'
+STREAM_CHUNK_SIZE = 1 << 16
+
+def _iter_span(f: BinaryIO, start: int, end: int, chunk_size: int) -> Iterator[bytes]:
+    """Yields the bytes of a file span, at most `chunk_size` at a time."""
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = f.read(min(chunk_size, remaining))
+        if not chunk:
+            raise EOFError(f"{f.name} is shorter than its indexed features")
+        remaining -= len(chunk)
+        yield chunk
+
+def stream_feature_collection(refs: Iterable[FeatureRef], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields a FeatureCollection made of indexed features, copied from disk.
+
+    Features are copied `chunk_size` bytes at a time and a single asset is
+    open at once, so the memory used does not depend on the output size.
+
+    Args:
+        refs (Iterable): Features to write, see `FeatureIndex.select`.
+        chunk_size (int): Maximum size of the yielded chunks.
+
+    Yields:
+        bytes: Consecutive chunks of the FeatureCollection JSON.
+    """
+    yield FEATURE_COLLECTION_START
+    f = None
+    try:
+        for position, ref in enumerate(refs):
+            if f is None or f.name != str(ref.path):
+                if f is not None:
+                    f.close()
+                f = open(ref.path, 'rb')
+            if position:
+                yield b','
+            yield from _iter_span(f, ref.start, ref.end, chunk_size)
+    finally:
+        if f is not None:
+            f.close()
+    yield FEATURE_COLLECTION_END
+
+def feature_collection_size(refs: list[FeatureRef]) -> int:
+    """Size in bytes of the FeatureCollection `stream_feature_collection` yields."""
+    return (
+        len(FEATURE_COLLECTION_START) + len(FEATURE_COLLECTION_END)
+        + sum(ref.end - ref.start for ref in refs) + max(len(refs) - 1, 0)
+    )
+
+def feature_collection_etag(refs: list[FeatureRef]) -> str:
+    """
+    ETag of the FeatureCollection of some features, computed without reading them.
+
+    Derived from the content ETag of each asset and the feature spans, so it
+    is stable across restarts and changes with the assets.
+    """
+    key = ';'.join(f"{file_etag(ref.path)}:{ref.start}:{ref.end}" for ref in refs)
+    return content_etag(key.encode('utf-8'))
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+import json
+import mmap
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Iterator
+
+# GeoNovis binary geometry container, little-endian:
+#   header   magic, version, feature/ring/point counts, properties size
+#   features one fixed-size row per feature (code, type, ring/point/properties spans)
+#   rings    one (polygon index, point count) row per ring
+#   points   float32 longitude/latitude pairs
+#   props    UTF-8 JSON properties of each feature
+# Ring rows only hold counts, so the ring, point and properties spans of a
+# feature can be copied to another container unchanged; only the feature
+# rows need rebasing.
+MAGIC = b'GNVB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIII')
+FEATURE = struct.Struct('<8sB3xIIIIII')
+RING = struct.Struct('<II')
+POINT_SIZE = 8
+GEOMETRY_TYPES = {'Polygon': 3, 'MultiPolygon': 6}
+GEOMETRY_NAMES = {value: key for key, value in GEOMETRY_TYPES.items()}
+
+def _polygons_of(geometry: dict | None) -> list[list[list]]:
+    if not geometry:
+        return []
+    if geometry.get('type') == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry.get('type') == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+def pack_features(features: list[tuple[str | None, dict]]) -> bytes:
+    """
+    Packs polygon features into a binary geometry container.
+
+    Only Polygon and MultiPolygon geometries are stored; other geometries
+    are kept as features without rings.
+
+    Args:
+        features (list): (country code, GeoJSON feature) pairs.
+
+    Returns:
+        bytes: The container.
+    """
+    feature_rows = []
+    rings = bytearray()
+    points = array('f')
+    props = bytearray()
+    ring_count = 0
+
+    for code, feature in features:
+        geometry = feature.get('geometry')
+        geometry_type = GEOMETRY_TYPES.get((geometry or {}).get('type'), 0)
+        ring_start, point_start = ring_count, len(points) // 2
+        for polygon_index, polygon in enumerate(_polygons_of(geometry)):
+            for ring in polygon:
+                rings += RING.pack(polygon_index, len(ring))
+                for position in ring:
+                    points.append(position[0])
+                    points.append(position[1])
+                ring_count += 1
+
+        properties = json.dumps(feature.get('properties') or {}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        feature_rows.append(FEATURE.pack(
+            (code or '').encode('utf-8')[:8], geometry_type,
+            ring_start, ring_count - ring_start,
+            point_start, len(points) // 2 - point_start,
+            len(props), len(properties)
+        ))
+        props += properties
+
+    if points.itemsize != 4:
+        raise RuntimeError("float32 arrays are required")
+    if struct.pack('=H', 1) != struct.pack('<H', 1):
+        points.byteswap()
+
+    header = HEADER.pack(MAGIC, VERSION, 0, len(feature_rows), ring_count, len(points) // 2, len(props))
+    return header + b''.join(feature_rows) + bytes(rings) + points.tobytes() + bytes(props)
+
+class GeometryContainer:
+    """
+    Read-only, memory-mapped view of a binary geometry container.
+
+    Only the header and feature rows are parsed; rings, points and
+    properties stay in the mapped file and are sliced on demand, so the
+    data is shared between workers through the page cache instead of being
+    loaded into each heap.
+    """
+
+    def __init__(self, file_path: Path):
+        """
+        Args:
+            file_path (Path): Path of the container file.
+
+        Raises:
+            ValueError: If the file is not a supported container.
+        """
+        self.file_path = file_path
+        with open(file_path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(self._mmap)
+
+        magic, version, _, self.feature_count, self.ring_count, self.point_count, self.props_size = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{file_path} is not a version {VERSION} geometry container")
+
+        self.features_offset = HEADER.size
+        self.rings_offset = self.features_offset + self.feature_count * FEATURE.size
+        self.points_offset = self.rings_offset + self.ring_count * RING.size
+        self.props_offset = self.points_offset + self.point_count * POINT_SIZE
+
+        self.rows = [FEATURE.unpack_from(self.buffer, self.features_offset + i * FEATURE.size) for i in range(self.feature_count)]
+        self.codes: dict[str, list[int]] = {}
+        for index, row in enumerate(self.rows):
+            code = row[0].rstrip(b'\0').decode('utf-8')
+            if code:
+                self.codes.setdefault(code, []).append(index)
+
+    def select(self, codes: list[str]) -> list[int]:
+        """
+        Returns the feature indexes of the given country codes, in file order.
+
+        Args:
+            codes (list): Lowercase country codes.
+
+        Returns:
+            list: Feature indexes.
+        """
+        return sorted({index for code in codes for index in self.codes.get(code, [])})
+
+    def _spans(self, index: int) -> tuple[memoryview, memoryview, memoryview]:
+        """Ring, point and properties slices of a feature (no copy)."""
+        _, _, ring_start, ring_count, point_start, point_count, props_start, props_length = self.rows[index]
+        rings = self.buffer[self.rings_offset + ring_start * RING.size:self.rings_offset + (ring_start + ring_count) * RING.size]
+        points = self.buffer[self.points_offset + point_start * POINT_SIZE:self.points_offset + (point_start + point_count) * POINT_SIZE]
+        props = self.buffer[self.props_offset + props_start:self.props_offset + props_start + props_length]
+        return rings, points, props
+
+    def subset_size(self, indexes: list[int]) -> int:
+        """Size in bytes of the container `iter_subset` yields for these features."""
+        size = HEADER.size + len(indexes) * FEATURE.size
+        for index in indexes:
+            _, _, _, ring_count, _, point_count, _, props_length = self.rows[index]
+            size += ring_count * RING.size + point_count * POINT_SIZE + props_length
+        return size
+
+    def iter_subset(self, indexes: list[int]) -> Iterator[bytes]:
+        """
+        Yields a container holding only the given features.
+
+        The header and feature rows are rebuilt; ring, point and properties
+        data are copied out of the mapped file one feature span at a time,
+        since WSGI bodies must yield bytes.
+
+        Args:
+            indexes (list): Feature indexes, see `select`.
+
+        Yields:
+            bytes: Consecutive chunks of the container.
+        """
+        rows = []
+        ring_total = point_total = props_total = 0
+        for index in indexes:
+            code, geometry_type, _, ring_count, _, point_count, _, props_length = self.rows[index]
+            rows.append(FEATURE.pack(code, geometry_type, ring_total, ring_count, point_total, point_count, props_total, props_length))
+            ring_total += ring_count
+            point_total += point_count
+            props_total += props_length
+
+        yield HEADER.pack(MAGIC, VERSION, 0, len(indexes), ring_total, point_total, props_total) + b''.join(rows)
+        spans = [self._spans(index) for index in indexes]
+        for section in range(3):
+            for span in spans:
+                if len(span[section]):
+                    yield bytes(span[section])
+
+    def to_feature(self, index: int) -> dict:
+        """
+        Decodes one feature back to GeoJSON.
+
+        Args:
+            index (int): Feature index.
+
+        Returns:
+            dict: GeoJSON feature, with float32 coordinate precision.
+        """
+        geometry_type = self.rows[index][1]
+        rings, points, props = self._spans(index)
+        coordinates = array('f')
+        coordinates.frombytes(points)
+        if struct.pack('=H', 1) != struct.pack('<H', 1):
+            coordinates.byteswap()
+
+        polygons: list[list[list]] = []
+        offset = 0
+        for polygon_index, point_count in RING.iter_unpack(rings):
+            if polygon_index >= len(polygons):
+                polygons.append([])
+            values = coordinates[offset * 2:(offset + point_count) * 2]
+            polygons[polygon_index].append([[values[i], values[i + 1]] for i in range(0, len(values), 2)])
+            offset += point_count
+
+        geometry = None
+        if geometry_type == GEOMETRY_TYPES['Polygon'] and polygons:
+            geometry = {'type': 'Polygon', 'coordinates': polygons[0]}
+        elif geometry_type == GEOMETRY_TYPES['MultiPolygon']:
+            geometry = {'type': 'MultiPolygon', 'coordinates': polygons}
+        return {'type': 'Feature', 'properties': json.loads(bytes(props)), 'geometry': geometry}
+
+class GeometryStore:
+    """Opens the binary geometry containers of a folder on demand, reopening them when they change."""
+
+    def __init__(self, base_path: Path, suffix: str = '.gnvb'):
+        """
+        Args:
+            base_path (Path): Folder of the container files.
+            suffix (str): File extension of the containers.
+        """
+        self.base_path = base_path
+        self.suffix = suffix
+        self._containers: dict[str, tuple[int, GeometryContainer]] = {}
+        self._lock = threading.Lock()
+
+    def path(self, name: str) -> Path:
+        """Path of a named container."""
+        return self.base_path / f"{name}{self.suffix}"
+
+    def get(self, name: str) -> GeometryContainer | None:
+        """
+        Returns a named container, or None if its file does not exist.
+
+        A container whose file changed is mapped again; the previous mapping
+        is released once no response uses it anymore.
+        """
+        file_path = self.path(name)
+        try:
+            mtime = file_path.stat().st_mtime_ns
+        except OSError:
+            return None
+        cached = self._containers.get(name)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with self._lock:
+            container = GeometryContainer(file_path)
+            self._containers[name] = (mtime, container)
+        return container
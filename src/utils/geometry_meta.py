@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+import json
+import math
+import threading
+from pathlib import Path
+from lite_logging.lite_logging import log
+
+from utils.feature_index import FeatureIndex
+
+META_FILE_NAME = "geometry-meta.json"
+EARTH_RADIUS_KM = 6371.0088
+# ~1 m at the equator, enough to frame a view or place a label
+COORDINATE_DECIMALS = 5
+
+def _polygons_of(geometry: dict | None) -> list[list[list]]:
+    if not geometry:
+        return []
+    if geometry.get('type') == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry.get('type') == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+def _ring_measures(ring: list[list]) -> tuple[float, float, float, float]:
+    """
+    Planar area, centroid moments and spherical area of a ring.
+
+    Returns:
+        tuple: Unsigned planar area (square degrees), x and y moments
+        (centroid times area) and area in km².
+    """
+    area = moment_x = moment_y = spherical = 0.0
+    for (x1, y1, *_), (x2, y2, *_) in zip(ring, ring[1:] + ring[:1]):
+        cross = x1 * y2 - x2 * y1
+        area += cross
+        moment_x += (x1 + x2) * cross
+        moment_y += (y1 + y2) * cross
+        spherical += math.radians(x2 - x1) * (2 + math.sin(math.radians(y1)) + math.sin(math.radians(y2)))
+    area /= 2
+    if area == 0:
+        return 0.0, 0.0, 0.0, 0.0
+    # Moments are divided by 6A for the centroid, then weighted by |A|
+    sign = 1 if area > 0 else -1
+    return abs(area), sign * moment_x / 6, sign * moment_y / 6, abs(spherical) * EARTH_RADIUS_KM ** 2 / 2
+
+def compute_geometry_meta(geometries: list[dict]) -> dict | None:
+    """
+    Computes the metadata of a country from the geometries of its features.
+
+    The centroid is the area-weighted planar centroid of all the polygons,
+    holes subtracted; the area is computed on the sphere.
+
+    Args:
+        geometries (list): GeoJSON geometries (Polygon or MultiPolygon).
+
+    Returns:
+        dict: bbox, centroid, area (km²) and polygon, ring and vertex counts,
+        or None if there is no polygon.
+    """
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+    polygons = rings = vertices = 0
+    area = moment_x = moment_y = spherical = 0.0
+
+    for geometry in geometries:
+        for polygon in _polygons_of(geometry):
+            polygons += 1
+            for ring_index, ring in enumerate(polygon):
+                if not ring:
+                    continue
+                rings += 1
+                vertices += len(ring)
+                for x, y, *_ in ring:
+                    min_x, max_x = min(min_x, x), max(max_x, x)
+                    min_y, max_y = min(min_y, y), max(max_y, y)
+                # Holes count negatively
+                sign = 1 if ring_index == 0 else -1
+                ring_area, ring_x, ring_y, ring_spherical = _ring_measures(ring)
+                area += sign * ring_area
+                moment_x += sign * ring_x
+                moment_y += sign * ring_y
+                spherical += sign * ring_spherical
+
+    if not vertices:
+        return None
+    if area > 0:
+        centroid = [moment_x / area, moment_y / area]
+    else:
+        centroid = [(min_x + max_x) / 2, (min_y + max_y) / 2]
+    return {
+        'bbox': [round(value, COORDINATE_DECIMALS) for value in (min_x, min_y, max_x, max_y)],
+        'centroid': [round(value, COORDINATE_DECIMALS) for value in centroid],
+        'area': round(spherical, 1),
+        'polygons': polygons,
+        'rings': rings,
+        'vertices': vertices
+    }
+
+def build_meta_table(feature_index: FeatureIndex) -> dict[str, dict]:
+    """
+    Computes the metadata of every country of a feature index.
+
+    Args:
+        feature_index (FeatureIndex): Indexed GeoJSON assets.
+
+    Returns:
+        dict: Metadata keyed by lowercase country code.
+    """
+    table = {}
+    for code in feature_index.codes:
+        geometries = [json.loads(FeatureIndex.read(ref)).get('geometry') for ref in feature_index.get(code)]
+        meta = compute_geometry_meta(geometries)
+        if meta is not None:
+            table[code] = meta
+    return table
+
+class GeometryMetaTable:
+    """
+    Per-country geometry metadata, read from the table written by
+    scripts/build_geometry_meta.py.
+
+    The table file is reloaded when its mtime changes. Without a table file
+    the metadata are computed from the feature index instead, and recomputed
+    when the index changes.
+    """
+
+    def __init__(self, table_path: Path, feature_index: FeatureIndex):
+        """
+        Args:
+            table_path (Path): Path of the metadata table.
+            feature_index (FeatureIndex): Fallback source of the metadata.
+        """
+        self.table_path = table_path
+        self.feature_index = feature_index
+        self.version = 0
+        self._source = None
+        self._table: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> dict[str, dict]:
+        """
+        Returns the metadata table, keyed by lowercase country code.
+        """
+        try:
+            source = ('file', self.table_path.stat().st_mtime_ns)
+        except OSError:
+            self.feature_index.refresh()
+            source = ('index', self.feature_index.version)
+        if source == self._source:
+            return self._table
+
+        with self._lock:
+            if source != self._source:
+                if source[0] == 'file':
+                    with open(self.table_path, 'r', encoding='utf-8') as f:
+                        table = json.load(f)
+                    log(f"Loaded geometry metadata of {len(table)} countries from {self.table_path}", level="INFO")
+                else:
+                    table = build_meta_table(self.feature_index)
+                    log(f"Computed geometry metadata of {len(table)} countries", level="INFO")
+                self._table, self._source = table, source
+                self.version += 1
+        return self._table
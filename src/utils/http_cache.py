@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+import hashlib
+from flask import Request, Response
+
+def content_etag(data: bytes) -> str:
+    """
+    Returns a strong ETag computed from a response body.
+
+    Args:
+        data (bytes): The response body.
+
+    Returns:
+        str: Hex digest used as the ETag value.
+    """
+    return hashlib.sha256(data).hexdigest()[:32]
+
+def apply_cache_control(response: Response, max_age: int, immutable: bool = False) -> Response:
+    """
+    Sets the Cache-Control header of a public, cacheable response.
+
+    Args:
+        response (Response): The response to update.
+        max_age (int): Lifetime in seconds granted to browsers and CDNs.
+        immutable (bool): Tell clients the content never changes during its lifetime.
+
+    Returns:
+        Response: The same response.
+    """
+    response.cache_control.no_cache = None
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if immutable:
+        response.cache_control.immutable = True
+    return response
+
+def conditional_response(request: Request, body: bytes, etag: str, mimetype: str) -> Response:
+    """
+    Builds a response for an in-memory body, answering 304 when the client copy is current.
+
+    Args:
+        request (Request): The incoming request, checked for If-None-Match.
+        body (bytes): The response body.
+        etag (str): Strong ETag of the body.
+        mimetype (str): Mimetype of the body.
+
+    Returns:
+        Response: A 200 response with the body, or a 304 response without it.
+    """
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    return response.make_conditional(request)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+import secrets
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from flask import Request, Response
+from werkzeug.http import parse_if_range_header, parse_range_header
+
+# Above this many ranges the Range header is ignored and the whole content sent
+MAX_RANGES = 16
+RANGE_CHUNK_SIZE = 1 << 16
+
+RangeReader = Callable[[int, int], Iterable[bytes]]
+
+def file_range_reader(file_path: Path, chunk_size: int = RANGE_CHUNK_SIZE) -> RangeReader:
+    """Returns a range reader over the bytes of a file."""
+    def read(start: int, end: int) -> Iterator[bytes]:
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+    return read
+
+def bytes_range_reader(body: bytes) -> RangeReader:
+    """Returns a range reader over an in-memory body."""
+    return lambda start, end: [body[start:end]]
+
+def stream_range_reader(stream: Callable[[], Iterable[bytes]]) -> RangeReader:
+    """
+    Returns a range reader over a generated body.
+
+    The body is generated again for each range and the chunks before the
+    range are skipped, so only use it when generating is cheap.
+    """
+    def read(start: int, end: int) -> Iterator[bytes]:
+        offset = 0
+        for chunk in stream():
+            chunk_end = offset + len(chunk)
+            if chunk_end > start:
+                yield bytes(chunk[max(start - offset, 0):end - offset])
+            if chunk_end >= end:
+                return
+            offset = chunk_end
+    return read
+
+def _if_range_matches(request: Request, response: Response) -> bool:
+    """Whether the If-Range precondition, if any, holds for the response (strong comparison)."""
+    header = request.headers.get('If-Range')
+    if not header:
+        return True
+    if_range = parse_if_range_header(header)
+    if if_range.etag is not None:
+        etag, weak = response.get_etag()
+        return not header.startswith('W/') and not weak and etag == if_range.etag
+    if if_range.date is not None and response.last_modified is not None:
+        return response.last_modified == if_range.date
+    return False
+
+def requested_ranges(request: Request, response: Response, complete_length: int) -> list[tuple[int, int]] | None:
+    """
+    Resolves the byte ranges requested for a response.
+
+    Args:
+        request (Request): The incoming request.
+        response (Response): The complete response, with its ETag and Last-Modified set.
+        complete_length (int): Length of the complete body.
+
+    Returns:
+        list: Sorted, non-overlapping (start, end) ranges, end excluded; empty
+        if no range can be satisfied. None if the whole body should be sent.
+    """
+    if request.method not in ('GET', 'HEAD') or 'Range' not in request.headers:
+        return None
+    if not _if_range_matches(request, response):
+        return None
+    # Malformed or overlapping ranges are ignored, as RFC 9110 allows
+    parsed = parse_range_header(request.headers['Range'])
+    if parsed is None or parsed.units != 'bytes':
+        return None
+
+    ranges = []
+    for start, stop in parsed.ranges:
+        if start < 0:
+            start, stop = max(complete_length + start, 0), complete_length
+        else:
+            stop = complete_length if stop is None else min(stop, complete_length)
+        if start < stop:
+            ranges.append((start, stop))
+    if len(ranges) > MAX_RANGES:
+        return None
+
+    # Overlapping and adjacent ranges are coalesced
+    merged: list[tuple[int, int]] = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+def _multipart_body(ranges: list[tuple[int, int]], headers: list[bytes], boundary: bytes, read_range: RangeReader) -> Iterator[bytes]:
+    for (start, end), part_headers in zip(ranges, headers):
+        yield part_headers
+        yield from read_range(start, end)
+        yield b'\r\n'
+    yield b'--' + boundary + b'--\r\n'
+
+def apply_ranges(request: Request, response: Response, complete_length: int, read_range: RangeReader) -> Response:
+    """
+    Turns a complete 200 response into a partial one when the request asks for byte ranges.
+
+    Handles Accept-Ranges, If-Range, single ranges (206 with Content-Range),
+    multiple ranges (206 multipart/byteranges) and unsatisfiable ranges
+    (416). Ranges apply to the body as sent, so a response with a
+    Content-Encoding is sliced in its encoded form; since a multipart body
+    cannot carry a content coding, such a response ignores multiple ranges.
+
+    Args:
+        request (Request): The incoming request.
+        response (Response): Complete response, already checked with `make_conditional`.
+        complete_length (int): Length of the complete body.
+        read_range (RangeReader): Yields the bytes of a (start, end) range of the body.
+
+    Returns:
+        Response: The same response, possibly turned into a 206 or 416 response.
+    """
+    response.accept_ranges = 'bytes'
+    if response.status_code != 200:
+        return response
+    ranges = requested_ranges(request, response, complete_length)
+    if ranges is None or (len(ranges) > 1 and response.headers.get('Content-Encoding')):
+        return response
+
+    response.close()
+    response.direct_passthrough = False
+    if not ranges:
+        response.status_code = 416
+        response.headers.pop('Content-Encoding', None)
+        response.headers['Content-Range'] = f"bytes */{complete_length}"
+        response.set_data(b'')
+        return response
+
+    response.status_code = 206
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        response.response = read_range(start, end)
+        response.headers['Content-Range'] = f"bytes {start}-{end - 1}/{complete_length}"
+        response.headers['Content-Length'] = str(end - start)
+        return response
+
+    boundary = secrets.token_hex(16).encode('ascii')
+    content_type = response.headers.get('Content-Type', 'application/octet-stream')
+    headers = [
+        (
+            b'--' + boundary + b'\r\n'
+            + f"Content-Type: {content_type}\r\nContent-Range: bytes {start}-{end - 1}/{complete_length}\r\n\r\n".encode('latin-1')
+        )
+        for start, end in ranges
+    ]
+    length = sum(len(part) + end - start + 2 for part, (start, end) in zip(headers, ranges)) + len(boundary) + 6
+    response.response = _multipart_body(ranges, headers, boundary, read_range)
+    response.headers['Content-Type'] = f"multipart/byteranges; boundary={boundary.decode('ascii')}"
+    response.headers['Content-Length'] = str(length)
+    return response
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+import gzip
+import hashlib
+import sys
+import threading
+from pathlib import Path
+from flask import Response, request, send_file
+from werkzeug.datastructures import Accept
+
+from utils.http_ranges import apply_ranges, file_range_reader
+
+try:
+    import brotli
+except ImportError:
+    print("Error: Brotli compression library not installed.")
+    print("Please install it with: pip install brotli")
+    sys.exit(1)
+
+# Content-Encoding of each precompressed sibling, in server preference order
+ENCODING_SUFFIXES: dict[str, str] = {
+    'br': '.br',
+    'gzip': '.gz'
+}
+
+_etag_cache: dict[tuple[str, int, int], str] = {}
+_etag_lock = threading.Lock()
+
+def file_etag(file_path: Path) -> str:
+    """
+    Returns a strong ETag computed from the content of a file.
+
+    The hash is computed once per file version (path, mtime and size).
+
+    Args:
+        file_path (Path): Path of the file.
+
+    Returns:
+        str: Hex digest used as the ETag value.
+    """
+    stat = file_path.stat()
+    key = (str(file_path), stat.st_mtime_ns, stat.st_size)
+    etag = _etag_cache.get(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        etag = digest.hexdigest()[:32]
+        with _etag_lock:
+            _etag_cache[key] = etag
+    return etag
+
+def available_encodings(file_path: Path) -> dict[str, Path]:
+    """
+    Lists the precompressed siblings of a file that are up to date.
+
+    A sibling older than its source file is ignored, so a stale build
+    never gets served.
+
+    Args:
+        file_path (Path): Path of the source file.
+
+    Returns:
+        dict: Path of each available variant, keyed by Content-Encoding.
+    """
+    source_mtime = file_path.stat().st_mtime_ns
+    variants = {}
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        variant = file_path.with_name(file_path.name + suffix)
+        try:
+            if variant.stat().st_mtime_ns >= source_mtime:
+                variants[encoding] = variant
+        except OSError:
+            continue
+    return variants
+
+def choose_encoding(accept_encodings: Accept, available: list[str]) -> str | None:
+    """
+    Picks the best available encoding for an Accept-Encoding header.
+
+    Args:
+        accept_encodings (Accept): Parsed Accept-Encoding header.
+        available (list): Available encodings, in server preference order.
+
+    Returns:
+        str: The chosen encoding, or None to send the identity representation.
+    """
+    return accept_encodings.best_match(available) if available else None
+
+def compress_body(data: bytes, encoding: str) -> bytes:
+    """
+    Compresses a response body built at runtime.
+
+    Lower levels than the build step are used since the body is produced
+    while a client waits; the result is meant to be cached by the caller.
+
+    Args:
+        data (bytes): The identity body.
+        encoding (str): Content-Encoding to produce ('br' or 'gzip').
+
+    Returns:
+        bytes: The encoded body.
+    """
+    if encoding == 'br':
+        return brotli.compress(data, quality=9)
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+def send_precompressed(file_path: Path, accept_encodings: Accept, mimetype: str) -> Response:
+    """
+    Sends a file, using its precompressed variant when the client accepts it.
+
+    Byte ranges are honoured on the variant actually sent, see `apply_ranges`.
+
+    Args:
+        file_path (Path): Path of the source file.
+        accept_encodings (Accept): Parsed Accept-Encoding header of the request.
+        mimetype (str): Mimetype of the decoded content.
+
+    Returns:
+        Response: The file response with Content-Encoding, Vary, ETag, Last-Modified and Accept-Ranges headers.
+    """
+    variants = available_encodings(file_path)
+    encoding = choose_encoding(accept_encodings, list(variants))
+    served_path = variants[encoding] if encoding else file_path
+
+    response: Response = send_file(
+        served_path,
+        mimetype=mimetype,
+        download_name=file_path.name,
+        last_modified=file_path.stat().st_mtime,
+        conditional=False
+    )
+    response.set_etag(file_etag(served_path))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response = response.make_conditional(request)
+    return apply_ranges(request, response, served_path.stat().st_size, file_range_reader(served_path))
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+import json
+import threading
+import time
+from pathlib import Path
+from lite_logging.lite_logging import log
+
+from utils.geocode_index import RegionBitsetIndex
+from utils.region_expressions import Expression, evaluate_expression, expression_regions
+
+DEFINITIONS_FILE_NAME = "region-definitions.json"
+
+class RegionCatalog:
+    """
+    Canonical country table and region definitions.
+
+    Country records are read once, from world-codes.json (geocodes) and
+    world-infos.json (names, capitals...); regions are only lists of country
+    codes, read from the definitions file, the one place regions are edited
+    (scripts/build_region_files.py writes the per-region files from it for
+    clients that fetch them directly). The geocodes and infos of a region
+    are composed from the table on first use and memoized until one of the
+    three files changes. Countries without a geocode record are left out of
+    the geocodes, as scripts/generate_region_codes.py does.
+    """
+
+    def __init__(self, world_codes_path: Path, world_infos_path: Path, definitions_path: Path, check_interval: float = 1.0):
+        """
+        Args:
+            world_codes_path (Path): Path of assets/geocodes/world-codes.json.
+            world_infos_path (Path): Path of assets/regions/world-infos.json.
+            definitions_path (Path): Path of the region definitions file.
+            check_interval (float): Minimum delay in seconds between two mtime checks.
+        """
+        self.paths = (world_codes_path, world_infos_path, definitions_path)
+        self.check_interval = check_interval
+        self.version = 0
+        self._mtimes: tuple | None = None
+        self._geocodes: dict[str, dict] = {}
+        self._infos: dict[str, dict] = {}
+        self._definitions: dict[str, tuple[str, ...]] = {}
+        self._index: RegionBitsetIndex | None = None
+        self._memo: dict[tuple, object] = {}
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def regions(self) -> list[str]:
+        """Names of the defined regions."""
+        self.refresh()
+        return sorted(self._definitions)
+
+    @property
+    def index(self) -> RegionBitsetIndex:
+        """Bitset membership index of the region geocodes."""
+        self.refresh()
+        return self._index
+
+    def load_all(self) -> None:
+        """Loads the country table and the region definitions."""
+        self.refresh(force=True)
+        log(f"Loaded {len(self._definitions)} region definitions over {len(self._infos)} countries", level="INFO")
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reloads the files if one of them changed since they were loaded.
+
+        Args:
+            force (bool): Check the files even if `check_interval` has not elapsed.
+
+        Returns:
+            bool: True if the catalog was reloaded.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return False
+
+        with self._lock:
+            if not force and now - self._last_check < self.check_interval:
+                return False
+            self._last_check = now
+
+            try:
+                mtimes = tuple(path.stat().st_mtime_ns for path in self.paths)
+            except OSError as e:
+                log(f"Error reading region catalog: {str(e)}", level="ERROR")
+                return False
+            if mtimes == self._mtimes:
+                return False
+
+            try:
+                geocodes, world_infos, definitions = (self._load_file(path) for path in self.paths)
+            except (OSError, json.JSONDecodeError) as e:
+                log(f"Error loading region catalog: {str(e)}", level="ERROR")
+                return False
+
+            infos = {country['flag'].lower(): country for country in world_infos if country.get('flag')}
+            definitions = {region: tuple(code.lower() for code in codes) for region, codes in definitions.items()}
+            for region, codes in definitions.items():
+                unknown = [code for code in codes if code not in infos and code not in geocodes]
+                if unknown:
+                    log(f"Region {region} lists unknown country codes: {', '.join(unknown)}", level="WARNING")
+
+            self._geocodes, self._infos, self._definitions = geocodes, infos, definitions
+            self._index = RegionBitsetIndex({
+                region: {code: geocodes[code] for code in codes if code in geocodes}
+                for region, codes in definitions.items()
+            })
+            self._memo = {}
+            self._mtimes = mtimes
+            if self.version:
+                log("Reloaded region catalog", level="INFO")
+            self.version += 1
+            return True
+
+    def _memoized(self, key: tuple, build):
+        """Returns a value composed from the catalog, built once per catalog version."""
+        self.refresh()
+        memo = self._memo
+        if key not in memo:
+            memo[key] = build()
+        return memo[key]
+
+    def definition(self, region: str) -> tuple[str, ...] | None:
+        """
+        Returns the country codes of a region, in definition order.
+
+        Args:
+            region (str): Name of the region.
+
+        Returns:
+            tuple: Lowercase country codes, or None if the region is unknown.
+        """
+        self.refresh()
+        return self._definitions.get(region)
+
+    def get(self, region: str) -> dict:
+        """
+        Returns the geocode object of a single region.
+
+        Args:
+            region (str): Name of the region.
+
+        Returns:
+            dict: The geocode object for the region, empty if the region is unknown.
+        """
+        codes = self.definition(region)
+        if codes is None:
+            log(f"Unknown region: {region}", level="ERROR")
+            return {}
+        return self._memoized(('geocodes', region), lambda: {code: self._geocodes[code] for code in codes if code in self._geocodes})
+
+    def get_merged(self, regions: list[str]) -> dict:
+        """
+        Returns merged geocodes for the given regions, with unique country codes as keys.
+
+        Args:
+            regions (list): List of region names.
+
+        Returns:
+            dict: The merged geocodes object.
+        """
+        return self.index.merge(regions)
+
+    def get_expression(self, expression: Expression) -> dict:
+        """
+        Returns the geocodes of the set a region expression denotes.
+
+        The expression is evaluated on the region bitmasks, so only the final
+        set is materialized. Unknown regions are empty sets.
+
+        Args:
+            expression (tuple): Parsed expression, see `parse_region_expression`.
+
+        Returns:
+            dict: The geocodes object of the resulting set.
+        """
+        index = self.index
+        for region in sorted(expression_regions(expression) - set(index.masks)):
+            log(f"Unknown region: {region}", level="ERROR")
+        return index.materialize(evaluate_expression(expression, lambda region: index.masks.get(region, 0)))
+
+    def regions_containing(self, code: str) -> list[str] | None:
+        """
+        Returns the regions a country code belongs to.
+
+        Args:
+            code (str): Country code.
+
+        Returns:
+            list: Sorted region names, or None if the code is unknown.
+        """
+        return self.index.regions_containing(code)
+
+    def country(self, code: str) -> dict | None:
+        """
+        Returns the infos of a country.
+
+        Args:
+            code (str): Lowercase country code.
+
+        Returns:
+            dict: The country infos, or None if the code is unknown.
+        """
+        self.refresh()
+        return self._infos.get(code)
+
+    def get_infos(self, regions: list[str]) -> list[dict]:
+        """
+        Returns the infos of the countries of several regions, each country once.
+
+        Args:
+            regions (list): List of region names.
+
+        Returns:
+            list: Country infos, in region then definition order.
+        """
+        seen = set()
+        merged = []
+        for region in regions:
+            for country in self._region_infos(region):
+                code = country['flag'].lower()
+                if code not in seen:
+                    seen.add(code)
+                    merged.append(country)
+        return merged
+
+    def _region_infos(self, region: str) -> list[dict]:
+        codes = self.definition(region)
+        if codes is None:
+            log(f"Unknown region: {region}", level="ERROR")
+            return []
+        return self._memoized(('infos', region), lambda: [self._infos[code] for code in codes if code in self._infos])
+
+    @staticmethod
+    def _load_file(path: Path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
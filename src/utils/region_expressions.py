@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+import re
+from typing import Callable
+
+# Set expressions over region names, loosest binding first:
+#   union         a,b  a|b  a∪b
+#   difference    a-b  (left-associative, same level as union)
+#   intersection  a&b  a*b  a∩b
+# Parentheses group. `&` must be URL-encoded (%26) in a query string; `*` needs no encoding.
+UNION_OPERATORS = (',', '|', '∪')
+INTERSECTION_OPERATORS = ('&', '*', '∩')
+DIFFERENCE_OPERATOR = '-'
+_TOKEN = re.compile(r"\s*(?:([A-Za-z0-9_]+)|(.))")
+
+Expression = tuple
+
+def _tokenize(text: str) -> list[str]:
+    tokens = []
+    for match in _TOKEN.finditer(text):
+        name, symbol = match.groups()
+        if name:
+            tokens.append(name.lower())
+        elif symbol and not symbol.isspace():
+            if symbol not in UNION_OPERATORS + INTERSECTION_OPERATORS + (DIFFERENCE_OPERATOR, '(', ')'):
+                raise ValueError(f"Unexpected character {symbol!r} in regions expression")
+            tokens.append(symbol)
+    return tokens
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self) -> str | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> str | None:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> Expression:
+        expression = self.union()
+        if expression is None:
+            raise ValueError("Empty regions expression")
+        if self.peek() is not None:
+            raise ValueError(f"Unexpected {self.peek()!r} in regions expression")
+        return expression
+
+    def union(self) -> Expression | None:
+        # Empty items of comma lists ("europe,,asia,") are skipped, as plain region lists always allowed it
+        expression = None
+        while True:
+            token = self.peek()
+            if token is None or token == ')':
+                return expression
+            if token in UNION_OPERATORS:
+                self.take()
+                continue
+            if token == DIFFERENCE_OPERATOR:
+                if expression is None:
+                    raise ValueError("Missing left operand of '-' in regions expression")
+                self.take()
+                expression = ('difference', expression, self.intersection())
+                continue
+            if expression is not None and self.tokens[self.position - 1] not in UNION_OPERATORS:
+                raise ValueError(f"Missing operator before {token!r} in regions expression")
+            operand = self.intersection()
+            expression = operand if expression is None else ('union', expression, operand)
+
+    def intersection(self) -> Expression:
+        expression = self.operand()
+        while self.peek() in INTERSECTION_OPERATORS:
+            self.take()
+            expression = ('intersection', expression, self.operand())
+        return expression
+
+    def operand(self) -> Expression:
+        token = self.take()
+        if token == '(':
+            expression = self.union()
+            if self.take() != ')':
+                raise ValueError("Unbalanced parentheses in regions expression")
+            if expression is None:
+                raise ValueError("Empty parentheses in regions expression")
+            return expression
+        if token is None or not re.fullmatch(r"[a-z0-9_]+", token):
+            raise ValueError(f"Expected a region name, got {token!r}" if token else "Incomplete regions expression")
+        return ('region', token)
+
+def _normalize(expression: Expression) -> Expression:
+    kind = expression[0]
+    if kind == 'region':
+        return expression
+    if kind == 'difference':
+        return ('difference', _normalize(expression[1]), _normalize(expression[2]))
+    # Union and intersection are associative, commutative and idempotent
+    operands = set()
+    for operand in (_normalize(operand) for operand in expression[1:]):
+        if operand[0] == kind:
+            operands.update(operand[1:])
+        else:
+            operands.add(operand)
+    if len(operands) == 1:
+        return operands.pop()
+    return (kind,) + tuple(sorted(operands, key=format_expression))
+
+def parse_region_expression(text: str) -> Expression:
+    """
+    Parses and normalizes a set expression over region names.
+
+    A plain comma-separated list of regions is a union expression.
+
+    Args:
+        text (str): The expression, e.g. "europe-balkans" or "africa*arab_world".
+
+    Returns:
+        tuple: Normalized expression tree: ('region', name), ('union', ...),
+        ('intersection', ...) or ('difference', left, right).
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    return _normalize(_Parser(text).parse())
+
+def format_expression(expression: Expression) -> str:
+    """
+    Writes an expression back as text.
+
+    Normalized expressions that denote the same set written differently
+    format to the same string, which makes it a cache key.
+    """
+    kind = expression[0]
+    if kind == 'region':
+        return expression[1]
+    if kind == 'union':
+        return ','.join(format_expression(operand) for operand in expression[1:])
+
+    def grouped(operand: Expression, loose: tuple[str, ...]) -> str:
+        text = format_expression(operand)
+        return f"({text})" if operand[0] in loose else text
+    if kind == 'intersection':
+        return '&'.join(grouped(operand, ('union', 'difference')) for operand in expression[1:])
+    return f"{grouped(expression[1], ('union',))}-{grouped(expression[2], ('union', 'difference'))}"
+
+def expression_regions(expression: Expression) -> set[str]:
+    """Names of the regions an expression refers to."""
+    if expression[0] == 'region':
+        return {expression[1]}
+    return set().union(*(expression_regions(operand) for operand in expression[1:]))
+
+def evaluate_expression(expression: Expression, mask_of: Callable[[str], int]) -> int:
+    """
+    Evaluates an expression over region bitmasks.
+
+    Args:
+        expression (tuple): Parsed expression.
+        mask_of (Callable): Returns the bitmask of a region name.
+
+    Returns:
+        int: Bitmask of the resulting set.
+    """
+    kind = expression[0]
+    if kind == 'region':
+        return mask_of(expression[1])
+    if kind == 'difference':
+        return evaluate_expression(expression[1], mask_of) & ~evaluate_expression(expression[2], mask_of)
+    masks = [evaluate_expression(operand, mask_of) for operand in expression[1:]]
+    result = masks[0]
+    for mask in masks[1:]:
+        result = result | mask if kind == 'union' else result & mask
+    return result
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+LANGUAGES = ('en', 'fr')
+# Projectable fields of a country entry; `flag` (the country code) is the key of the projection
+INFO_FIELDS = ('country', 'capital', 'continent', 'immatriculate_plate')
+
+def project_infos(countries: list[dict], lang: str | None = None, fields: tuple[str, ...] | None = None) -> dict[str, dict]:
+    """
+    Keeps only some fields and one language of country infos.
+
+    Args:
+        countries (list): Country infos, see `RegionCatalog.get_infos`.
+        lang (str): Language to keep in translated fields, all of them if None.
+        fields (tuple): Fields to keep, all of `INFO_FIELDS` if None.
+
+    Returns:
+        dict: Projected infos keyed by lowercase country code.
+    """
+    projected = {}
+    for country in countries:
+        entry = {}
+        for field in fields or INFO_FIELDS:
+            value = country.get(field)
+            if lang and isinstance(value, dict) and lang in value:
+                value = value[lang]
+            entry[field] = value
+        projected[country['flag'].lower()] = entry
+    return projected
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class ResponseCache:
+    """
+    Bounded LRU cache for pre-serialized response bodies.
+
+    Values are stored as they will be sent (typically JSON bytes), so a hit
+    skips both the computation and the serialization of the response. The
+    cache is bounded by entry count and, optionally, by the total size of
+    its values.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int | None = None, size_of: Callable[[Any], int] = len):
+        """
+        Args:
+            max_entries (int): Maximum number of entries kept before evicting the least recently used one.
+            max_bytes (int): Maximum total size of the values, None for no limit.
+            size_of (Callable): Returns the size of a value, in bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._sizes: dict[Hashable, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns the cached value for a key and marks it as recently used.
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            The cached value, or None on a miss.
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting the least recently used entries if the cache is full.
+
+        A value larger than `max_bytes` on its own is not stored.
+
+        Args:
+            key (Hashable): Cache key.
+            value: Value to store.
+        """
+        size = self.size_of(value) if self.max_bytes is not None else 0
+        with self._lock:
+            self._bytes -= self._sizes.pop(key, 0)
+            self._entries.pop(key, None)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> tuple[Any, bool]:
+        """
+        Returns the cached value for a key, computing and storing it on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            factory (Callable): Called without arguments to build the value on a miss.
+
+        Returns:
+            tuple: The value and whether it was a cache hit.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        value = factory()
+        self.put(key, value)
+        return value, False
+
+    def clear(self) -> None:
+        """Drops every entry, keeping the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Entry count, size, capacities, hits, misses and hit ratio.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0
+        }
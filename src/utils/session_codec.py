@@ -3,9 +3,12 @@
 
 import json
 import base64
+import struct
 import sys
 import re
-from typing import Dict, Any, Tuple, Union
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple, Union
 
 try:
     import brotli
@@ -21,12 +24,85 @@ except ImportError:
     print("Please install it with: pip install msgpack")
     sys.exit(1)
 
+from utils.session_schema import pack_delta, pack_session, session_region, unpack_delta, unpack_session
+
+# Wire formats:
+#   legacy  Base64URL(Brotli(MessagePack(data))), no header. Tokens issued
+#           before framing existed, still produced by default.
+#   framed  "~" + Base64URL(header + body). "~" is URL-safe but never part of
+#           a Base64URL string, so both formats can be told apart.
+# Header: format version, payload kind, compression, compression level, window.
+# Dictionary compression appends the ID of the dictionary to the header.
+FRAME_PREFIX = '~'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<BBBBB')
+DICTIONARY_ID = struct.Struct('<B')
+PAYLOAD_MSGPACK = 0
+PAYLOAD_SCHEMA = 1
+PAYLOAD_DELTA = 2
+PAYLOAD_NAMES = {PAYLOAD_MSGPACK: 'msgpack', PAYLOAD_SCHEMA: 'schema', PAYLOAD_DELTA: 'delta'}
+COMPRESSION_BROTLI = 0
+COMPRESSION_DEFLATE_DICTIONARY = 1
+MIN_LGWIN, MAX_LGWIN = 10, 24
+
+# Preset dictionaries (scripts/build_session_dictionary.py), raw deflate with
+# the full 32 KiB window. The Brotli module has no custom dictionary support.
+DICTIONARY_FILE_PATTERN = "session-*.dict"
+DEFLATE_WBITS = 15
+DEFAULT_DEFLATE_LEVEL = 9
+
+# Frozen country code tables of schema payloads (scripts/build_session_code_table.py)
+CODE_TABLE_FILE_PATTERN = "codes-*.json"
+_URL_UNSAFE = re.compile(r'[^A-Za-z0-9\-_~]')
+
+# Adaptive compression: the highest quality whose estimated time fits the
+# latency budget. Estimates are fixed ms + ms per KiB of MessagePack, measured
+# with a fitted window (see scripts/benchmark_session_codec.py --matrix).
+# Qualities 10 and 11 shave under 10% off a world session for 10-40x the time.
+DEFAULT_LATENCY_BUDGET_MS = 1.0
+QUALITY_COSTS = (
+    (11, 1.5, 1.7),
+    (10, 1.0, 0.35),
+    (9, 0.03, 0.045),
+    (7, 0.02, 0.03),
+    (5, 0.01, 0.015),
+    (1, 0.005, 0.003),
+)
+
+
+def fitted_lgwin(size: int) -> int:
+    """Smallest Brotli window holding `size` bytes; larger windows only cost setup time."""
+    return max(MIN_LGWIN, min(MAX_LGWIN, (size + 15).bit_length()))
+
+def choose_compression(size: int, latency_budget_ms: float = DEFAULT_LATENCY_BUDGET_MS) -> Tuple[int, int]:
+    """
+    Picks the Brotli quality and window for a payload.
+
+    Args:
+        size: MessagePack size of the payload in bytes
+        latency_budget_ms: Time the compression may take
+
+    Returns:
+        Tuple of (quality, lgwin)
+    """
+    for quality, fixed_ms, ms_per_kib in QUALITY_COSTS:
+        if fixed_ms + ms_per_kib * size / 1024 <= latency_budget_ms:
+            break
+    return quality, fitted_lgwin(size)
+
 
 class SessionCodec:
     """
     Utility class for encoding and decoding session data using
-    MessagePack + Brotli + Base85 + Base64URL.
+    MessagePack + Brotli + Base64URL.
     """
+
+    # Preset dictionaries and code tables by ID, see `load_dictionaries`
+    # and `load_code_tables`
+    dictionaries: Dict[int, bytes] = {}
+    code_tables: Dict[int, List[str]] = {}
+    # Country codes of a region in gameState order, None if unknown; see `set_baselines`
+    baselines: Optional[Callable[[str], Optional[Sequence[str]]]] = None
     
     @staticmethod
     def base64_to_base64url(b64str: str) -> str:
@@ -45,15 +121,100 @@ class SessionCodec:
         return b64
     
     @classmethod
-    def encode(cls, data: Dict[str, Any], quality: int = 11) -> Dict[str, Union[bool, str, Dict]]:
+    def load_dictionaries(cls, directory: Path) -> int:
+        """
+        Loads the preset dictionaries of a folder, `session-<id>.dict` files.
+
+        Args:
+            directory: Folder of the dictionaries
+
+        Returns:
+            Number of dictionaries loaded
+        """
+        return cls._load_numbered(directory, DICTIONARY_FILE_PATTERN, cls.dictionaries, Path.read_bytes)
+
+    @classmethod
+    def load_code_tables(cls, directory: Path) -> int:
+        """
+        Loads the code tables of a folder, `codes-<id>.json` files.
+
+        Args:
+            directory: Folder of the code tables
+
+        Returns:
+            Number of code tables loaded
+        """
+        return cls._load_numbered(directory, CODE_TABLE_FILE_PATTERN, cls.code_tables,
+                                  lambda file_path: json.loads(file_path.read_text(encoding='utf-8')))
+
+    @classmethod
+    def set_baselines(cls, baselines: Callable[[str], Optional[Sequence[str]]]) -> None:
         """
-        Encode JSON data using MessagePack, Brotli, Base85, and Base64URL.
+        Sets the source of the region baselines of delta payloads.
+
+        Args:
+            baselines: Returns the country codes of a region in gameState
+                order, or None if the region is unknown
+        """
+        cls.baselines = baselines
+
+    @classmethod
+    def _baseline(cls, region: str) -> Optional[Sequence[str]]:
+        return cls.baselines(region) if cls.baselines else None
+
+    @staticmethod
+    def _load_numbered(directory: Path, pattern: str, registry: dict, read) -> int:
+        """Reads `<name>-<id>.<ext>` files with an ID of 1-255 into a registry."""
+        loaded = 0
+        for file_path in sorted(directory.glob(pattern)):
+            try:
+                file_id = int(file_path.stem.split('-', 1)[1])
+            except ValueError:
+                continue
+            if 0 < file_id <= 255:
+                registry[file_id] = read(file_path)
+                loaded += 1
+        return loaded
+
+    @classmethod
+    def _dictionary(cls, dictionary_id: int) -> bytes:
+        if dictionary_id not in cls.dictionaries:
+            raise ValueError(f"Unknown session dictionary {dictionary_id}")
+        return cls.dictionaries[dictionary_id]
+
+    @staticmethod
+    def _b64url_encode(binary: bytes) -> str:
+        return base64.urlsafe_b64encode(binary).rstrip(b'=').decode('ascii')
+
+    @staticmethod
+    def _b64url_decode(b64url: str) -> bytes:
+        return base64.urlsafe_b64decode(b64url + '=' * (-len(b64url) % 4))
+
+    @classmethod
+    def encode(cls, data: Dict[str, Any], quality: Optional[int] = None, framed: bool = False,
+               lgwin: Optional[int] = None, latency_budget_ms: float = DEFAULT_LATENCY_BUDGET_MS,
+               dictionary: Optional[int] = None, schema: bool = False, delta: bool = False) -> Dict[str, Union[bool, str, Dict]]:
+        """
+        Encode JSON data using MessagePack, Brotli, and Base64URL.
         
-        Pipeline: JSON → MessagePack → Brotli → Base85 → Base64URL
+        Pipeline: JSON → MessagePack → Brotli → Base64URL
         
         Args:
             data: The JSON data to encode
-            quality: Brotli compression quality (0-11)
+            quality: Brotli compression quality (0-11), chosen from the
+                payload size and `latency_budget_ms` if None
+            framed: Prefix the token with a format header; otherwise the
+                token has the legacy format
+            lgwin: Brotli window (10-24), fitted to the payload if None
+            latency_budget_ms: Compression time budget of the adaptive quality
+            dictionary: ID of a preset dictionary to deflate with instead of
+                Brotli; `quality` is then the deflate level (0-9). Implies `framed`
+            schema: Pack the gameState entries against the latest code table
+                when they round-trip exactly, plain MessagePack otherwise.
+                Implies `framed`
+            delta: Encode the game state as changes to the pristine state of
+                the session region when it round-trips exactly; otherwise
+                as `schema` says. Implies `framed`
             
         Returns:
             Dictionary with success status, encoded content, and stats
@@ -63,30 +224,62 @@ class SessionCodec:
             json_str = json.dumps(data, separators=(',', ':'))
             original_json_size = len(json_str.encode('utf-8'))
             
-            # Step 1: Convert to MessagePack
-            msgpacked = msgpack.packb(data, use_bin_type=True)
+            # Step 1: Convert to MessagePack, packing the game state if asked
+            msgpacked, payload = None, PAYLOAD_MSGPACK
+            framed = framed or schema or delta
+            if delta:
+                region = session_region(data)
+                baseline = cls._baseline(region) if region else None
+                if baseline is not None:
+                    msgpacked, payload = pack_delta(data, region, baseline), PAYLOAD_DELTA
+            if msgpacked is None and schema and cls.code_tables:
+                table_id = max(cls.code_tables)
+                msgpacked, payload = pack_session(data, table_id, cls.code_tables[table_id]), PAYLOAD_SCHEMA
+            if msgpacked is None:
+                msgpacked, payload = msgpack.packb(data, use_bin_type=True), PAYLOAD_MSGPACK
             msgpack_size = len(msgpacked)
             
-            # Step 2: Compress with Brotli
-            compressed = brotli.compress(msgpacked, quality=quality)
+            # Step 2: Compress with Brotli, or deflate with a preset dictionary
+            if dictionary is not None:
+                quality = DEFAULT_DEFLATE_LEVEL if quality is None else quality
+                lgwin = DEFLATE_WBITS
+                if not 0 <= quality <= 9:
+                    raise ValueError("quality must be between 0 and 9 with a dictionary")
+                compressor = zlib.compressobj(quality, zlib.DEFLATED, -DEFLATE_WBITS, zdict=cls._dictionary(dictionary))
+                compressed = compressor.compress(msgpacked) + compressor.flush()
+                framed = True
+            else:
+                adaptive_quality, fitted = choose_compression(msgpack_size, latency_budget_ms)
+                quality = adaptive_quality if quality is None else quality
+                lgwin = fitted if lgwin is None else lgwin
+                if not 0 <= quality <= 11:
+                    raise ValueError("quality must be between 0 and 11")
+                if not MIN_LGWIN <= lgwin <= MAX_LGWIN:
+                    raise ValueError(f"lgwin must be between {MIN_LGWIN} and {MAX_LGWIN}")
+                compressed = brotli.compress(msgpacked, quality=quality, lgwin=lgwin)
             compressed_size = len(compressed)
             
-            # Step 3: Encode with Base85
-            b85_encoded = base64.a85encode(compressed).decode('utf-8')
-            b85_size = len(b85_encoded)
-            
-            # Step 4: Convert to Base64URL-safe format
-            binary = base64.a85decode(b85_encoded)
-            b64_encoded = base64.b64encode(binary).decode('utf-8')
-            b64url_encoded = cls.base64_to_base64url(b64_encoded)
-            final_size = len(b64url_encoded)
+            # Step 3: Encode to Base64URL, behind a header for framed tokens
+            if dictionary is not None:
+                header = HEADER.pack(FORMAT_VERSION, payload, COMPRESSION_DEFLATE_DICTIONARY, quality, lgwin)
+                encoded = FRAME_PREFIX + cls._b64url_encode(header + DICTIONARY_ID.pack(dictionary) + compressed)
+            elif framed:
+                header = HEADER.pack(FORMAT_VERSION, payload, COMPRESSION_BROTLI, quality, lgwin)
+                encoded = FRAME_PREFIX + cls._b64url_encode(header + compressed)
+            else:
+                encoded = cls._b64url_encode(compressed)
+            final_size = len(encoded)
             
             # Calculate compression stats
             stats = {
+                'format_version': FORMAT_VERSION if framed else 0,
+                'quality': quality,
+                'lgwin': lgwin,
+                'dictionary': dictionary,
+                'payload': PAYLOAD_NAMES[payload],
                 'original_json_size': original_json_size,
                 'msgpack_size': msgpack_size,
                 'compressed_size': compressed_size,
-                'base85_size': b85_size,
                 'final_size': final_size,
                 'msgpack_ratio': original_json_size / msgpack_size,
                 'compression_ratio': msgpack_size / compressed_size,
@@ -95,13 +288,13 @@ class SessionCodec:
             }
             
             # Check URL safety
-            contains_url_unsafe = bool(re.search(r'[^A-Za-z0-9\-_]', b64url_encoded))
+            contains_url_unsafe = bool(_URL_UNSAFE.search(encoded))
             if contains_url_unsafe:
                 stats['warning'] = 'Output contains characters that may need URL encoding in some contexts'
             
             return {
                 "success": True,
-                "content": b64url_encoded,
+                "content": encoded,
                 "stats": stats
             }
             
@@ -112,12 +305,40 @@ class SessionCodec:
                 "error": str(e)
             }
     
+    @staticmethod
+    def _parse_frame(binary: bytes) -> Tuple[Tuple[int, ...], bytes]:
+        """Splits a framed token into its header fields and body."""
+        if len(binary) < HEADER.size:
+            raise ValueError("Truncated session header")
+        fields = HEADER.unpack_from(binary)
+        if fields[0] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported session format version {fields[0]}")
+        if fields[1] not in PAYLOAD_NAMES or fields[2] not in (COMPRESSION_BROTLI, COMPRESSION_DEFLATE_DICTIONARY):
+            raise ValueError(f"Unsupported session payload {fields[1]} or compression {fields[2]}")
+        return fields, binary[HEADER.size:]
+
+    @classmethod
+    def _decompress(cls, fields: Tuple[int, ...], body: bytes) -> bytes:
+        """Decompresses the body of a framed token."""
+        if fields[2] == COMPRESSION_BROTLI:
+            return brotli.decompress(body)
+        if len(body) < DICTIONARY_ID.size:
+            raise ValueError("Truncated session header")
+        (dictionary_id,) = DICTIONARY_ID.unpack_from(body)
+        decompressor = zlib.decompressobj(-fields[4], zdict=cls._dictionary(dictionary_id))
+        decompressed = decompressor.decompress(body[DICTIONARY_ID.size:]) + decompressor.flush()
+        if not decompressor.eof:
+            raise ValueError("Truncated deflate stream")
+        return decompressed
+
     @classmethod
     def decode(cls, encoded_data: str) -> Dict[str, Union[bool, Any, str]]:
         """
-        Decode MessagePack+Brotli+Base85+Base64URL encoded data back to JSON.
+        Decode MessagePack+Brotli+Base64URL encoded data back to JSON.
         
-        Pipeline: Base64URL → Base85 → Brotli → MessagePack → JSON
+        Pipeline: Base64URL → (header) → Brotli or deflate → MessagePack (schema) → JSON
+
+        Both legacy and framed tokens are accepted.
         
         Args:
             encoded_data: The encoded string
@@ -126,33 +347,46 @@ class SessionCodec:
             Dictionary with success status and decoded content or error
         """
         try:
-            # Step 1: Convert from Base64URL to Base64
-            b64_str = cls.base64url_to_base64(encoded_data)
+            framed = encoded_data.startswith(FRAME_PREFIX)
+            if framed:
+                encoded_data = encoded_data[len(FRAME_PREFIX):]
             
-            # Step 2: Decode Base64 to binary
+            # Step 1: Decode Base64URL to binary
             try:
-                binary = base64.b64decode(b64_str)
+                binary = cls._b64url_decode(encoded_data)
             except Exception as e:
                 return {"success": False, "content": None, "error": f"Invalid Base64 encoding: {e}"}
             
-            # Step 3: Decode Base85 (we re-encode to Base85 and then decode)
-            try:
-                b85_encoded = base64.a85encode(binary).decode('utf-8')
-                decompressed = base64.a85decode(b85_encoded)
-            except Exception as e:
-                return {"success": False, "content": None, "error": f"Invalid Base85 encoding: {e}"}
-            
-            # Step 4: Decompress with Brotli
+            # Step 2: Read the format header of framed tokens
+            fields = None
+            if framed:
+                try:
+                    fields, binary = cls._parse_frame(binary)
+                except ValueError as e:
+                    return {"success": False, "content": None, "error": str(e)}
+
+            # Step 3: Decompress with Brotli, or the preset dictionary
             try:
-                msgpacked = brotli.decompress(decompressed)
+                msgpacked = cls._decompress(fields, binary) if fields else brotli.decompress(binary)
+            except ValueError as e:
+                return {"success": False, "content": None, "error": str(e)}
             except Exception as e:
-                return {"success": False, "content": None, "error": f"Invalid Brotli compressed data: {e}"}
+                return {"success": False, "content": None, "error": f"Invalid compressed data: {e}"}
             
-            # Step 5: Unpack MessagePack
-            try:
-                data = msgpack.unpackb(msgpacked, raw=False)
-            except Exception as e:
-                return {"success": False, "content": None, "error": f"Invalid MessagePack data: {e}"}
+            # Step 4: Unpack MessagePack, or the schema or delta payload
+            if fields and fields[1] != PAYLOAD_MSGPACK:
+                try:
+                    if fields[1] == PAYLOAD_SCHEMA:
+                        data = unpack_session(msgpacked, cls.code_tables)
+                    else:
+                        data = unpack_delta(msgpacked, cls._baseline)
+                except Exception as e:
+                    return {"success": False, "content": None, "error": f"Invalid session payload: {e}"}
+            else:
+                try:
+                    data = msgpack.unpackb(msgpacked, raw=False)
+                except Exception as e:
+                    return {"success": False, "content": None, "error": f"Invalid MessagePack data: {e}"}
             
             return {
                 "success": True,
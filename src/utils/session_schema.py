@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+import json
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import msgpack
+
+# Schema payload: msgpack [table ID, gameState position, other session fields,
+# state], where state is [codes, flags, extras] for the gameState entries {code, found, turn, selected}:
+#   codes   bytes: bitmap over the code table when entries follow table order,
+#           otherwise a list of table indexes
+#   flags   one nibble per entry, low nibble first: found (0 null, 1 true,
+#           2 false) in bits 0-1, turn in bit 2, selected in bit 3
+#   extras  [position, key, value] of the entries that do not fit the schema
+#
+# Delta payload: msgpack [region, baseline checksum, gameState position, other
+# session fields, changes], relative to the pristine state of the region (every
+# entry found null, turn and selected false). Changes are one integer per
+# entry whose flags differ, gap << 4 | flags, gap being the number of unchanged
+# entries before it: under 8, a change is a single msgpack byte.
+STATE_FIELD = 'gameState'
+ENTRY_KEYS = ['code', 'found', 'turn', 'selected']
+FOUND_VALUES = (None, True, False)
+TURN_BIT = 1 << 2
+SELECTED_BIT = 1 << 3
+
+
+def _entry_flags(key: str, value: Any) -> Optional[int]:
+    """Flags of a schema entry, or None if the entry does not fit the schema."""
+    if not isinstance(value, dict) or list(value) != ENTRY_KEYS or value['code'] != key:
+        return None
+    found, turn, selected = value['found'], value['turn'], value['selected']
+    if not (found is None or isinstance(found, bool)) or not isinstance(turn, bool) or not isinstance(selected, bool):
+        return None
+    return FOUND_VALUES.index(found) | (TURN_BIT if turn else 0) | (SELECTED_BIT if selected else 0)
+
+
+def _entry(code: str, flags: int) -> Dict[str, Any]:
+    return {
+        'code': code,
+        'found': FOUND_VALUES[flags & 3],
+        'turn': bool(flags & TURN_BIT),
+        'selected': bool(flags & SELECTED_BIT)
+    }
+
+
+def _load_state(state: Any) -> Optional[Dict[str, Any]]:
+    """Parsed gameState entries, or None if the state is not a JSON object string."""
+    if not isinstance(state, str):
+        return None
+    try:
+        entries = json.loads(state)
+    except ValueError:
+        return None
+    return entries if isinstance(entries, dict) else None
+
+
+def _dump_state(entries: Dict[str, Any]) -> str:
+    return json.dumps(entries, separators=(',', ':'), ensure_ascii=False)
+
+
+def _split_session(data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """Position of gameState in the session fields, and the other fields."""
+    return list(data).index(STATE_FIELD), {key: value for key, value in data.items() if key != STATE_FIELD}
+
+
+def _join_session(position: int, others: Dict[str, Any], state: str) -> Dict[str, Any]:
+    items = list(others.items())
+    items.insert(position, (STATE_FIELD, state))
+    return dict(items)
+
+
+def pack_state(state: str, table: Sequence[str]) -> Optional[list]:
+    """
+    Packs a gameState string against a code table.
+
+    Args:
+        state: The gameState JSON string
+        table: Country codes, indexed by position
+
+    Returns:
+        The packed state, or None if the state would not unpack to the exact
+        same string (not an object, whitespace, escapes, key order...).
+    """
+    entries = _load_state(state)
+    if entries is None:
+        return None
+
+    positions = {code: index for index, code in enumerate(table)}
+    indexes, flags, extras = [], [], []
+    for position, (key, value) in enumerate(entries.items()):
+        entry_flags = _entry_flags(key, value) if key in positions else None
+        if entry_flags is None:
+            extras.append([position, key, value])
+        else:
+            indexes.append(positions[key])
+            flags.append(entry_flags)
+
+    if all(a < b for a, b in zip(indexes, indexes[1:])):
+        bitmap = bytearray((len(table) + 7) // 8)
+        for index in indexes:
+            bitmap[index >> 3] |= 1 << (index & 7)
+        codes = bytes(bitmap)
+    else:
+        codes = indexes
+    packed_flags = bytes(flags[i] | (flags[i + 1] << 4 if i + 1 < len(flags) else 0) for i in range(0, len(flags), 2))
+
+    packed = [codes, packed_flags, extras]
+    if unpack_state(packed, table) != state:
+        return None
+    return packed
+
+
+def unpack_state(packed: list, table: Sequence[str]) -> str:
+    """
+    Rebuilds the gameState string of a packed state.
+
+    Raises:
+        ValueError: If the packed state does not match the code table.
+    """
+    codes, packed_flags, extras = packed
+    if isinstance(codes, bytes):
+        if len(codes) != (len(table) + 7) // 8:
+            raise ValueError("Session code bitmap does not match the code table")
+        indexes = [index for index in range(len(table)) if codes[index >> 3] >> (index & 7) & 1]
+    else:
+        indexes = codes
+    if len(packed_flags) != (len(indexes) + 1) // 2:
+        raise ValueError("Session flags do not match the codes")
+
+    schema_entries = []
+    for position, index in enumerate(indexes):
+        if not 0 <= index < len(table):
+            raise ValueError(f"Session code index {index} is not in the code table")
+        flags = packed_flags[position >> 1] >> (4 * (position & 1)) & 0xF
+        schema_entries.append((table[index], _entry(table[index], flags)))
+
+    # Extras go back to their positions, schema entries fill the gaps in order
+    ordered: List[tuple] = []
+    schema_iter = iter(schema_entries)
+    extras_by_position = {position: (key, value) for position, key, value in extras}
+    for position in range(len(schema_entries) + len(extras)):
+        ordered.append(extras_by_position[position] if position in extras_by_position else next(schema_iter))
+    return _dump_state(dict(ordered))
+
+
+def pack_session(data: Dict[str, Any], table_id: int, table: Sequence[str]) -> Optional[bytes]:
+    """
+    Packs session data with the schema, its other fields as plain msgpack.
+
+    Returns:
+        The schema payload, or None if the session does not fit the schema.
+    """
+    state = data.get(STATE_FIELD)
+    if not isinstance(state, str):
+        return None
+    packed = pack_state(state, table)
+    if packed is None:
+        return None
+    position, others = _split_session(data)
+    return msgpack.packb([table_id, position, others, packed], use_bin_type=True)
+
+
+def unpack_session(payload: bytes, tables: Dict[int, Sequence[str]]) -> Dict[str, Any]:
+    """
+    Rebuilds session data from a schema payload.
+
+    Raises:
+        ValueError: If the code table of the payload is unknown or the payload is invalid.
+    """
+    table_id, position, others, packed = msgpack.unpackb(payload, raw=False)
+    if table_id not in tables:
+        raise ValueError(f"Unknown session code table {table_id}")
+    return _join_session(position, others, unpack_state(packed, tables[table_id]))
+
+
+def session_region(data: Dict[str, Any]) -> Optional[str]:
+    """The region of a single-region session, from its gameSave."""
+    try:
+        regions = json.loads(data.get('gameSave', ''))['regions']
+    except (TypeError, ValueError, KeyError):
+        return None
+    return regions[0] if isinstance(regions, list) and len(regions) == 1 and isinstance(regions[0], str) else None
+
+
+def baseline_checksum(baseline: Sequence[str]) -> int:
+    """Identifies a baseline, so that tokens fail to decode once their region changes."""
+    return zlib.crc32(','.join(baseline).encode('utf-8'))
+
+
+def _apply_changes(baseline: Sequence[str], changes: Sequence[int]) -> str:
+    flags_at = {}
+    index = -1
+    for change in changes:
+        index += (change >> 4) + 1
+        if not 0 <= index < len(baseline):
+            raise ValueError("Session changes do not match the baseline")
+        flags_at[index] = change & 0xF
+    return _dump_state({code: _entry(code, flags_at.get(index, 0)) for index, code in enumerate(baseline)})
+
+
+def pack_delta(data: Dict[str, Any], region: str, baseline: Sequence[str]) -> Optional[bytes]:
+    """
+    Packs session data as changes to the pristine state of a region.
+
+    Args:
+        data: The session data
+        region: Name of the baseline region
+        baseline: Country codes of the region, in gameState order
+
+    Returns:
+        The delta payload, or None if the game state is not the baseline's
+        entries in the same order, or would not rebuild to the exact string.
+    """
+    state = data.get(STATE_FIELD)
+    entries = _load_state(state)
+    if entries is None or list(entries) != list(baseline):
+        return None
+
+    changes = []
+    previous = -1
+    for index, (key, value) in enumerate(entries.items()):
+        flags = _entry_flags(key, value)
+        if flags is None:
+            return None
+        if flags:
+            changes.append((index - previous - 1) << 4 | flags)
+            previous = index
+    if _apply_changes(baseline, changes) != state:
+        return None
+
+    position, others = _split_session(data)
+    return msgpack.packb([region, baseline_checksum(baseline), position, others, changes], use_bin_type=True)
+
+
+def unpack_delta(payload: bytes, baselines: Callable[[str], Optional[Sequence[str]]]) -> Dict[str, Any]:
+    """
+    Rebuilds session data from a delta payload.
+
+    Args:
+        payload: The delta payload
+        baselines: Returns the country codes of a region, None if it is unknown
+
+    Raises:
+        ValueError: If the baseline region is unknown or changed, or the payload is invalid.
+    """
+    region, checksum, position, others, changes = msgpack.unpackb(payload, raw=False)
+    baseline = baselines(region)
+    if baseline is None:
+        raise ValueError(f"Unknown session baseline region {region}")
+    if baseline_checksum(baseline) != checksum:
+        raise ValueError(f"Session baseline region {region} changed since the token was issued")
+    return _join_session(position, others, _apply_changes(baseline, changes))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import heapq
+import math
+from pathlib import Path
+
+from utils.topology import Point, Topology
+
+# Tolerance in degrees of each level of detail (0.01° is about 1 km)
+LOD_TOLERANCES: dict[str, float] = {
+    'low': 0.05,
+    'medium': 0.01,
+    'high': 0.001
+}
+LOD_DIRECTORY = 'lod'
+SIMPLIFY_METHODS = ('dp', 'vw')
+# Free-form tolerances are snapped down to one of these, 0 meaning no simplification
+TOLERANCE_LEVELS: tuple[float, ...] = (0.0, 0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0)
+
+def lod_path(file_path: Path, level: str) -> Path:
+    """
+    Returns where the precomputed level of detail of an asset is stored.
+
+    Args:
+        file_path (Path): Path of the source GeoJSON asset.
+        level (str): Level of detail name.
+
+    Returns:
+        Path: `<asset folder>/lod/<level>/<asset name>`.
+    """
+    return file_path.parent / LOD_DIRECTORY / level / file_path.name
+
+def _segment_distance(point: Point, start: Point, end: Point) -> float:
+    """Distance from a point to a segment."""
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(point[0] - start[0], point[1] - start[1])
+    t = ((point[0] - start[0]) * dx + (point[1] - start[1]) * dy) / (dx * dx + dy * dy)
+    t = max(0.0, min(1.0, t))
+    return math.hypot(point[0] - start[0] - t * dx, point[1] - start[1] - t * dy)
+
+def douglas_peucker(points: list[Point], tolerance: float) -> list[Point]:
+    """
+    Simplifies a line with the Douglas-Peucker algorithm, keeping both ends.
+
+    Args:
+        points (list): Points of the line.
+        tolerance (float): Maximum distance between the line and its simplification.
+
+    Returns:
+        list: The kept points.
+    """
+    if len(points) < 3:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance, index = 0.0, 0
+        for i in range(first + 1, last):
+            distance = _segment_distance(points[i], points[first], points[last])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if max_distance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+def _triangle_area(a: Point, b: Point, c: Point) -> float:
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (c[0] - a[0]) * (b[1] - a[1])) / 2
+
+def visvalingam(points: list[Point], tolerance: float) -> list[Point]:
+    """
+    Simplifies a line with the Visvalingam-Whyatt algorithm, keeping both ends.
+
+    Points are removed by increasing effective area until every remaining
+    point carries an area of at least `tolerance²`.
+
+    Args:
+        points (list): Points of the line.
+        tolerance (float): Tolerance in degrees, squared into the area threshold.
+
+    Returns:
+        list: The kept points.
+    """
+    count = len(points)
+    if count < 3:
+        return list(points)
+
+    threshold = tolerance * tolerance
+    previous = list(range(-1, count - 1))
+    following = list(range(1, count + 1))
+    areas = [math.inf] * count
+    heap = []
+    for i in range(1, count - 1):
+        areas[i] = _triangle_area(points[i - 1], points[i], points[i + 1])
+        heap.append((areas[i], i))
+    heapq.heapify(heap)
+
+    removed = [False] * count
+    current_max = 0.0
+    while heap:
+        area, i = heapq.heappop(heap)
+        if removed[i] or area != areas[i]:
+            continue
+        # An effective area never decreases, so later points cannot be removed for less
+        current_max = max(current_max, area)
+        if current_max >= threshold:
+            break
+        removed[i] = True
+        before, after = previous[i], following[i]
+        following[before] = after
+        previous[after] = before
+        for j in (before, after):
+            if 0 < j < count - 1:
+                areas[j] = max(current_max, _triangle_area(points[previous[j]], points[j], points[following[j]]))
+                heapq.heappush(heap, (areas[j], j))
+    return [point for point, dropped in zip(points, removed) if not dropped]
+
+def simplify_line(points: list[Point], tolerance: float, method: str = 'dp') -> list[Point]:
+    """
+    Simplifies a line with the chosen method, keeping both ends.
+
+    A closed line is first split at its point farthest from the start so the
+    algorithms never measure against a zero-length base segment.
+
+    Args:
+        points (list): Points of the line.
+        tolerance (float): Simplification tolerance in degrees.
+        method (str): 'dp' (Douglas-Peucker) or 'vw' (Visvalingam-Whyatt).
+
+    Returns:
+        list: The kept points.
+    """
+    algorithm = visvalingam if method == 'vw' else douglas_peucker
+    if len(points) > 3 and points[0] == points[-1]:
+        start = points[0]
+        far = max(range(1, len(points) - 1), key=lambda i: math.hypot(points[i][0] - start[0], points[i][1] - start[1]))
+        return algorithm(points[:far + 1], tolerance)[:-1] + algorithm(points[far:], tolerance)
+    return algorithm(points, tolerance)
+
+def _ring_area(ring: list) -> float:
+    return abs(sum(a[0] * b[1] - b[0] * a[1] for a, b in zip(ring, ring[1:]))) / 2
+
+def _polygons_of(geometry: dict | None) -> list[list[list]]:
+    """Returns the polygons of a Polygon or MultiPolygon geometry."""
+    if not geometry:
+        return []
+    if geometry.get('type') == 'Polygon':
+        return [geometry['coordinates']]
+    if geometry.get('type') == 'MultiPolygon':
+        return geometry['coordinates']
+    return []
+
+def simplify_geojson(data: dict, tolerance: float, method: str = 'dp') -> dict:
+    """
+    Simplifies the polygons of a FeatureCollection while preserving shared borders.
+
+    All rings are decomposed into shared arcs first and every arc is
+    simplified once, so two neighbouring countries keep exactly the same
+    border. Rings that collapse below a triangle are dropped; if a whole
+    feature would vanish, its largest polygon is kept unsimplified so small
+    island countries stay on the map.
+
+    Args:
+        data (dict): FeatureCollection to simplify.
+        tolerance (float): Simplification tolerance in degrees.
+        method (str): 'dp' (Douglas-Peucker) or 'vw' (Visvalingam-Whyatt).
+
+    Returns:
+        dict: The simplified FeatureCollection.
+    """
+    features = data.get('features', [])
+    rings = [ring for feature in features for polygon in _polygons_of(feature.get('geometry')) for ring in polygon]
+    topology = Topology(rings)
+    arcs = [simplify_line(arc, tolerance, method) for arc in topology.arcs]
+
+    ring_index = 0
+    result_features = []
+    for feature in features:
+        geometry = feature.get('geometry')
+        polygons = _polygons_of(geometry)
+        if not polygons:
+            if geometry and geometry.get('type') in ('LineString', 'MultiLineString'):
+                lines = [geometry['coordinates']] if geometry['type'] == 'LineString' else geometry['coordinates']
+                simplified = [[list(point) for point in simplify_line([tuple(p[:2]) for p in line], tolerance, method)] for line in lines]
+                geometry = {**geometry, 'coordinates': simplified[0] if geometry['type'] == 'LineString' else simplified}
+            result_features.append({**feature, 'geometry': geometry})
+            continue
+
+        simplified_polygons = []
+        for polygon in polygons:
+            polygon_rings = [topology.ring(ring_index + i, arcs) for i in range(len(polygon))]
+            ring_index += len(polygon)
+            if len(polygon_rings[0]) < 4:
+                # Exterior collapsed: the holes of this polygon go with it
+                continue
+            simplified_polygons.append([[list(point) for point in ring] for ring in polygon_rings if len(ring) >= 4])
+
+        if not simplified_polygons:
+            largest = max(polygons, key=lambda polygon: _ring_area(polygon[0]))
+            simplified_polygons = [[largest[0]]]
+
+        if geometry['type'] == 'Polygon':
+            coordinates = simplified_polygons[0]
+        else:
+            coordinates = simplified_polygons
+        result_features.append({**feature, 'geometry': {'type': geometry['type'], 'coordinates': coordinates}})
+
+    return {**data, 'features': result_features}
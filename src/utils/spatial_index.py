@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+import json
+import math
+import threading
+import numpy as np
+from typing import Iterator
+from lite_logging.lite_logging import log
+
+from utils.feature_index import FeatureIndex
+
+# Children per node of the packed tree
+NODE_CAPACITY = 16
+# Upper bound of the (points x edges) matrices built by the containment test
+MAX_BLOCK_SIZE = 1 << 20
+# Below this many points, per-point tree queries beat a batch descent
+SMALL_BATCH_SIZE = 64
+
+class STRTree:
+    """
+    Static bounding-box tree packed with the Sort-Tile-Recursive algorithm.
+
+    The boxes are ordered once by STR (vertical slices sorted by x, each
+    sorted by y) and grouped `node_capacity` at a time; every upper level
+    groups the nodes of the level below the same way. Children of node `i`
+    are the nodes `i * capacity` to `(i + 1) * capacity - 1` of the next
+    level, so the tree is only a list of bbox arrays.
+    """
+
+    def __init__(self, bboxes: np.ndarray, node_capacity: int = NODE_CAPACITY):
+        """
+        Args:
+            bboxes (np.ndarray): (n, 4) array of min x, min y, max x, max y.
+            node_capacity (int): Children per node.
+        """
+        self.node_capacity = node_capacity
+        self.order = self._str_order(bboxes, node_capacity)
+
+        current = bboxes[self.order]
+        levels = [current]
+        while len(current) > node_capacity:
+            starts = np.arange(0, len(current), node_capacity)
+            current = np.column_stack((
+                np.minimum.reduceat(current[:, 0], starts),
+                np.minimum.reduceat(current[:, 1], starts),
+                np.maximum.reduceat(current[:, 2], starts),
+                np.maximum.reduceat(current[:, 3], starts)
+            ))
+            levels.append(current)
+        # Root level first
+        self.levels = levels[::-1]
+
+    @staticmethod
+    def _str_order(bboxes: np.ndarray, node_capacity: int) -> np.ndarray:
+        count = len(bboxes)
+        if count == 0:
+            return np.zeros(0, dtype=np.intp)
+        centers_x = (bboxes[:, 0] + bboxes[:, 2]) / 2
+        centers_y = (bboxes[:, 1] + bboxes[:, 3]) / 2
+        slice_count = math.ceil(math.sqrt(math.ceil(count / node_capacity)))
+        slice_size = slice_count * node_capacity
+
+        by_x = np.argsort(centers_x, kind='stable')
+        slices = [by_x[start:start + slice_size] for start in range(0, count, slice_size)]
+        return np.concatenate([s[np.argsort(centers_y[s], kind='stable')] for s in slices])
+
+    def query(self, x: float, y: float) -> np.ndarray:
+        """
+        Returns the boxes containing a point.
+
+        Args:
+            x (float): Point x.
+            y (float): Point y.
+
+        Returns:
+            np.ndarray: Indexes of the boxes, in the order given to the constructor.
+        """
+        if not self.levels or len(self.levels[-1]) == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        nodes = np.arange(len(self.levels[0]))
+        for depth, boxes in enumerate(self.levels):
+            if depth:
+                nodes = np.concatenate([
+                    np.arange(node * self.node_capacity, min((node + 1) * self.node_capacity, len(boxes)))
+                    for node in nodes
+                ])
+            candidates = boxes[nodes]
+            nodes = nodes[(candidates[:, 0] <= x) & (candidates[:, 2] >= x) & (candidates[:, 1] <= y) & (candidates[:, 3] >= y)]
+            if len(nodes) == 0:
+                return np.zeros(0, dtype=np.intp)
+        return self.order[nodes]
+
+    def query_points(self, xs: np.ndarray, ys: np.ndarray) -> Iterator[tuple[int, np.ndarray]]:
+        """
+        Returns the boxes containing each of many points, descending the tree once.
+
+        Each visited node only tests the points that fell in its parent, and
+        the children of a node are tested against them together.
+
+        Args:
+            xs (np.ndarray): Point x coordinates.
+            ys (np.ndarray): Point y coordinates.
+
+        Yields:
+            tuple: Index of a box (in constructor order) and indexes of the points it contains.
+        """
+        if not self.levels or len(self.levels[-1]) == 0 or len(xs) == 0:
+            return
+
+        # (sibling nodes, points to test against them) of the current level
+        frontier = [(np.arange(len(self.levels[0])), np.arange(len(xs)))]
+        for depth, boxes in enumerate(self.levels):
+            leaf = depth == len(self.levels) - 1
+            next_frontier = []
+            for nodes, points in frontier:
+                node_boxes = boxes[nodes]
+                px, py = xs[points], ys[points]
+                inside = ((node_boxes[:, 0, None] <= px) & (node_boxes[:, 2, None] >= px)
+                          & (node_boxes[:, 1, None] <= py) & (node_boxes[:, 3, None] >= py))
+                for node, mask in zip(nodes.tolist(), inside):
+                    if not mask.any():
+                        continue
+                    if leaf:
+                        yield int(self.order[node]), points[mask]
+                    else:
+                        children = np.arange(node * self.node_capacity, min((node + 1) * self.node_capacity, len(self.levels[depth + 1])))
+                        next_frontier.append((children, points[mask]))
+            frontier = next_frontier
+
+def polygon_edges(polygon: list[list]) -> np.ndarray:
+    """
+    Flattens the rings of a GeoJSON polygon into one edge array.
+
+    Args:
+        polygon (list): Rings of [x, y] positions, exterior first.
+
+    Returns:
+        np.ndarray: (4, edges) array of x1, y1, x2, y2.
+    """
+    edges = []
+    for ring in polygon:
+        points = np.asarray(ring, dtype=np.float64)[:, :2]
+        if len(points) < 3:
+            continue
+        if not np.array_equal(points[0], points[-1]):
+            points = np.vstack((points, points[:1]))
+        edges.append(np.hstack((points[:-1], points[1:])))
+    if not edges:
+        return np.zeros((4, 0))
+    return np.vstack(edges).T.copy()
+
+def points_in_polygon(edges: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """
+    Even-odd ray casting of many points against one polygon.
+
+    Every (point, edge) pair is tested at once, in blocks of at most
+    `MAX_BLOCK_SIZE` pairs; holes are handled by the crossing parity.
+
+    Args:
+        edges (np.ndarray): Polygon edges, see `polygon_edges`.
+        xs (np.ndarray): Point x coordinates.
+        ys (np.ndarray): Point y coordinates.
+
+    Returns:
+        np.ndarray: Boolean containment of each point.
+    """
+    x1, y1, x2, y2 = edges
+    inside = np.zeros(len(xs), dtype=bool)
+    if edges.shape[1] == 0:
+        return inside
+
+    step = max(1, MAX_BLOCK_SIZE // edges.shape[1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, len(xs), step):
+            px = xs[start:start + step, None]
+            py = ys[start:start + step, None]
+            straddles = (y1 > py) != (y2 > py)
+            crossings = straddles & (px < (x2 - x1) * (py - y1) / (y2 - y1) + x1)
+            inside[start:start + step] = np.count_nonzero(crossings, axis=1) % 2 == 1
+    return inside
+
+class CountryLocator:
+    """
+    Point to country code lookup over the features of a `FeatureIndex`.
+
+    Every polygon of the indexed features gets a box in an `STRTree`; the
+    polygons whose box contains a point are tested exactly, smallest box
+    first so an enclave wins over the country around it. The index is
+    rebuilt when the feature index changes.
+    """
+
+    def __init__(self, feature_index: FeatureIndex):
+        """
+        Args:
+            feature_index (FeatureIndex): Features to locate points in.
+        """
+        self.feature_index = feature_index
+        self.codes: list[str] = []
+        self.edges: list[np.ndarray] = []
+        self.bboxes = np.zeros((0, 4))
+        self.areas = np.zeros(0)
+        self.tree = STRTree(self.bboxes)
+        self._version = None
+        self._lock = threading.Lock()
+
+    def build(self) -> None:
+        """Loads the polygons of every indexed feature and packs their boxes."""
+        codes, edges, bboxes = [], [], []
+        for code in self.feature_index.codes:
+            for ref in self.feature_index.get(code):
+                geometry = json.loads(FeatureIndex.read(ref)).get('geometry') or {}
+                if geometry.get('type') == 'Polygon':
+                    polygons = [geometry['coordinates']]
+                elif geometry.get('type') == 'MultiPolygon':
+                    polygons = geometry['coordinates']
+                else:
+                    continue
+                for polygon in polygons:
+                    polygon_edge = polygon_edges(polygon)
+                    if polygon_edge.shape[1] == 0:
+                        continue
+                    x1, y1 = polygon_edge[0], polygon_edge[1]
+                    codes.append(code)
+                    edges.append(polygon_edge)
+                    bboxes.append((x1.min(), y1.min(), x1.max(), y1.max()))
+
+        self.codes, self.edges = codes, edges
+        self.bboxes = np.array(bboxes, dtype=np.float64).reshape(-1, 4)
+        self.areas = (self.bboxes[:, 2] - self.bboxes[:, 0]) * (self.bboxes[:, 3] - self.bboxes[:, 1])
+        self.tree = STRTree(self.bboxes)
+        self._version = self.feature_index.version
+        log(f"Indexed {len(codes)} polygons of {len(set(codes))} countries for point lookup", level="INFO")
+
+    def refresh(self) -> None:
+        """Rebuilds the index if the feature index changed since the last build."""
+        self.feature_index.refresh()
+        if self._version != self.feature_index.version:
+            with self._lock:
+                if self._version != self.feature_index.version:
+                    self.build()
+
+    def locate(self, lon: float, lat: float) -> str | None:
+        """
+        Returns the country code of the polygon containing a point.
+
+        Args:
+            lon (float): Longitude.
+            lat (float): Latitude.
+
+        Returns:
+            str: Lowercase country code, or None if no polygon contains the point.
+        """
+        self.refresh()
+        candidates = self.tree.query(lon, lat)
+        xs, ys = np.array([lon], dtype=np.float64), np.array([lat], dtype=np.float64)
+        for candidate in candidates[np.argsort(self.areas[candidates], kind='stable')]:
+            if points_in_polygon(self.edges[candidate], xs, ys)[0]:
+                return self.codes[candidate]
+        return None
+
+    def locate_batch(self, lons: np.ndarray, lats: np.ndarray) -> list[str | None]:
+        """
+        Returns the country code of many points at once.
+
+        The tree is descended once for the whole batch, pairing each polygon
+        with the points inside its box; only those polygons are ray cast,
+        smallest box first as in `locate`, each against its points not
+        resolved yet. The cost follows the polygons the points touch, not
+        the number of polygons indexed.
+
+        Args:
+            lons (np.ndarray): Longitudes.
+            lats (np.ndarray): Latitudes.
+
+        Returns:
+            list: Lowercase country code of each point, None outside any polygon.
+        """
+        self.refresh()
+        lons = np.asarray(lons, dtype=np.float64)
+        lats = np.asarray(lats, dtype=np.float64)
+        found = np.full(len(lons), -1, dtype=np.intp)
+        candidates = dict(self.tree.query_points(lons, lats))
+
+        for polygon in sorted(candidates, key=lambda polygon: (self.areas[polygon], polygon)):
+            points = candidates[polygon]
+            points = points[found[points] < 0]
+            if len(points) == 0:
+                continue
+            inside = points_in_polygon(self.edges[polygon], lons[points], lats[points])
+            found[points[inside]] = polygon
+
+        return [self.codes[polygon] if polygon >= 0 else None for polygon in found.tolist()]
+
+    def locate_many(self, points: list[tuple[float, float]]) -> list[str | None]:
+        """
+        Returns the country code of each (lon, lat) point.
+
+        Up to `SMALL_BATCH_SIZE` points are located one by one with `locate`,
+        cheaper than setting up a batch; larger inputs go to `locate_batch`.
+        """
+        if len(points) <= SMALL_BATCH_SIZE:
+            return [self.locate(lon, lat) for lon, lat in points]
+        coordinates = np.array(points, dtype=np.float64).reshape(-1, 2)
+        return self.locate_batch(coordinates[:, 0], coordinates[:, 1])
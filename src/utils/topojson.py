@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+from utils.topology import Topology
+
+DEFAULT_QUANTIZATION = 100000
+
+def _positions(geometry: dict | None):
+    """Yields every position of a geometry."""
+    if not geometry:
+        return
+    geometry_type = geometry.get('type')
+    coordinates = geometry.get('coordinates')
+    if geometry_type == 'Point':
+        yield coordinates
+    elif geometry_type in ('MultiPoint', 'LineString'):
+        yield from coordinates
+    elif geometry_type in ('MultiLineString', 'Polygon'):
+        for line in coordinates:
+            yield from line
+    elif geometry_type == 'MultiPolygon':
+        for polygon in coordinates:
+            for ring in polygon:
+                yield from ring
+    elif geometry_type == 'GeometryCollection':
+        for child in geometry.get('geometries', []):
+            yield from _positions(child)
+
+def compute_bbox(features: list[dict]) -> list[float]:
+    """
+    Returns the bounding box of a list of features.
+
+    Returns:
+        list: [min x, min y, max x, max y], or zeros if there is no position.
+    """
+    min_x = min_y = float('inf')
+    max_x = max_y = float('-inf')
+    for feature in features:
+        for position in _positions(feature.get('geometry')):
+            x, y = position[0], position[1]
+            min_x, max_x = min(min_x, x), max(max_x, x)
+            min_y, max_y = min(min_y, y), max(max_y, y)
+    if min_x == float('inf'):
+        return [0.0, 0.0, 0.0, 0.0]
+    return [min_x, min_y, max_x, max_y]
+
+class _Quantizer:
+    """Maps positions to an integer grid of `quantization` steps over the bounding box."""
+
+    def __init__(self, bbox: list[float], quantization: int):
+        min_x, min_y, max_x, max_y = bbox
+        self.translate = [min_x, min_y]
+        self.scale = [
+            (max_x - min_x) / (quantization - 1) or 1.0,
+            (max_y - min_y) / (quantization - 1) or 1.0
+        ]
+
+    def point(self, position: list) -> tuple[int, int]:
+        return (
+            round((position[0] - self.translate[0]) / self.scale[0]),
+            round((position[1] - self.translate[1]) / self.scale[1])
+        )
+
+    def line(self, positions: list) -> list[tuple[int, int]]:
+        """Quantizes a line, merging the consecutive points that end up on the same cell."""
+        result = []
+        for position in positions:
+            point = self.point(position)
+            if not result or result[-1] != point:
+                result.append(point)
+        return result
+
+def _delta_encode(arc: list[tuple[int, int]]) -> list[list[int]]:
+    """Stores the first point of an arc and the offset of each following point."""
+    encoded = []
+    previous_x = previous_y = 0
+    for x, y in arc:
+        encoded.append([x - previous_x, y - previous_y])
+        previous_x, previous_y = x, y
+    return encoded
+
+def encode_topojson(data: dict, quantization: int = DEFAULT_QUANTIZATION, object_name: str = 'collection') -> dict:
+    """
+    Converts a GeoJSON FeatureCollection to a quantized TopoJSON topology.
+
+    Positions are snapped to an integer grid, polygon rings are split into
+    shared arcs (each border between two countries is stored once) and arcs
+    are delta-encoded. Line strings get an arc of their own.
+
+    Args:
+        data (dict): GeoJSON FeatureCollection.
+        quantization (int): Number of grid steps along each axis of the bounding box.
+        object_name (str): Name of the GeometryCollection in `objects`.
+
+    Returns:
+        dict: The TopoJSON topology.
+    """
+    features = data.get('features', [])
+    bbox = compute_bbox(features)
+    quantizer = _Quantizer(bbox, quantization)
+
+    # First pass: quantize the rings so the topology is built on grid points.
+    # The walk order must match encode_geometry, which consumes the rings in turn.
+    rings: list[list[tuple[int, int]]] = []
+
+    def collect_rings(geometry: dict | None) -> None:
+        if not geometry:
+            return
+        if geometry.get('type') == 'Polygon':
+            rings.extend(quantizer.line(ring) for ring in geometry['coordinates'])
+        elif geometry.get('type') == 'MultiPolygon':
+            rings.extend(quantizer.line(ring) for polygon in geometry['coordinates'] for ring in polygon)
+        elif geometry.get('type') == 'GeometryCollection':
+            for child in geometry.get('geometries', []):
+                collect_rings(child)
+
+    for feature in features:
+        collect_rings(feature.get('geometry'))
+
+    topology = Topology([ring if len(ring) >= 4 else [] for ring in rings])
+    arcs = list(topology.arcs)
+    ring_iter = iter(topology.rings)
+
+    def encode_polygon(polygon: list) -> list[list[int]] | None:
+        polygon_arcs = [next(ring_iter) for _ in polygon]
+        if not polygon_arcs[0]:
+            return None
+        return [ring for ring in polygon_arcs if ring]
+
+    def encode_line(line: list) -> int:
+        arcs.append(quantizer.line(line))
+        return len(arcs) - 1
+
+    def encode_geometry(geometry: dict | None) -> dict:
+        if not geometry:
+            return {'type': None}
+        geometry_type = geometry.get('type')
+        coordinates = geometry.get('coordinates')
+        if geometry_type == 'Polygon':
+            polygon = encode_polygon(coordinates)
+            return {'type': 'Polygon', 'arcs': polygon} if polygon else {'type': None}
+        if geometry_type == 'MultiPolygon':
+            polygons = [encode_polygon(polygon) for polygon in coordinates]
+            polygons = [polygon for polygon in polygons if polygon]
+            return {'type': 'MultiPolygon', 'arcs': polygons} if polygons else {'type': None}
+        if geometry_type == 'LineString':
+            return {'type': 'LineString', 'arcs': [encode_line(coordinates)]}
+        if geometry_type == 'MultiLineString':
+            return {'type': 'MultiLineString', 'arcs': [[encode_line(line)] for line in coordinates]}
+        if geometry_type == 'Point':
+            return {'type': 'Point', 'coordinates': list(quantizer.point(coordinates))}
+        if geometry_type == 'MultiPoint':
+            return {'type': 'MultiPoint', 'coordinates': [list(quantizer.point(position)) for position in coordinates]}
+        if geometry_type == 'GeometryCollection':
+            return {'type': 'GeometryCollection', 'geometries': [encode_geometry(child) for child in geometry.get('geometries', [])]}
+        return {'type': None}
+
+    geometries = []
+    for feature in features:
+        encoded = encode_geometry(feature.get('geometry'))
+        if 'id' in feature:
+            encoded['id'] = feature['id']
+        if feature.get('properties'):
+            encoded['properties'] = feature['properties']
+        geometries.append(encoded)
+
+    return {
+        'type': 'Topology',
+        'bbox': bbox,
+        'transform': {
+            'scale': quantizer.scale,
+            'translate': quantizer.translate
+        },
+        'objects': {
+            object_name: {
+                'type': 'GeometryCollection',
+                'geometries': geometries
+            }
+        },
+        'arcs': [_delta_encode(arc) for arc in arcs]
+    }
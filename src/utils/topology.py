@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+Point = tuple[float, float]
+
+def _ring_points(ring: list) -> list[Point]:
+    """Returns the distinct points of a closed ring, without the closing position."""
+    points = [(position[0], position[1]) for position in ring]
+    if len(points) > 1 and points[0] == points[-1]:
+        points.pop()
+    return points
+
+def find_junctions(rings: list[list[Point]]) -> set[Point]:
+    """
+    Finds the points where rings stop or start sharing a border.
+
+    A point is a junction when its neighbours differ between two of its
+    occurrences: the rings run together on one side and apart on the other.
+
+    Args:
+        rings (list): Rings as lists of distinct points (not closed).
+
+    Returns:
+        set: The junction points.
+    """
+    neighbours: dict[Point, frozenset] = {}
+    junctions = set()
+    for points in rings:
+        count = len(points)
+        for i, point in enumerate(points):
+            pair = frozenset((points[i - 1], points[(i + 1) % count]))
+            seen = neighbours.setdefault(point, pair)
+            if seen != pair:
+                junctions.add(point)
+    return junctions
+
+def _split_ring(points: list[Point], junctions: set[Point]) -> list[list[Point]]:
+    """Cuts a ring into arcs running from one junction to the next."""
+    cuts = [i for i, point in enumerate(points) if point in junctions]
+    if not cuts:
+        # No junction: the whole ring is one closed arc starting at its smallest
+        # point, so identical rings (e.g. an enclave and its hole) share that arc
+        start = min(range(len(points)), key=points.__getitem__)
+        rotated = points[start:] + points[:start]
+        return [rotated + [rotated[0]]]
+
+    rotated = points[cuts[0]:] + points[:cuts[0]]
+    offsets = [cut - cuts[0] for cut in cuts] + [len(points)]
+    rotated.append(rotated[0])
+    return [rotated[start:end + 1] for start, end in zip(offsets, offsets[1:])]
+
+class Topology:
+    """
+    Shared-arc decomposition of a set of polygon rings.
+
+    Every ring is split at its junctions into arcs, and arcs that appear
+    several times (a border shared by two countries, in either direction)
+    are stored once. A ring is described by a list of arc references, where
+    `~i` (that is `-i - 1`) means arc `i` walked backwards, as in TopoJSON.
+    Processing the arcs instead of the rings (simplification, quantization)
+    keeps shared borders identical on both sides.
+    """
+
+    def __init__(self, rings: list[list]):
+        """
+        Args:
+            rings (list): Closed rings as lists of GeoJSON positions.
+        """
+        self.arcs: list[list[Point]] = []
+        self.rings: list[list[int]] = []
+        self._arc_ids: dict[tuple, int] = {}
+
+        ring_points = [_ring_points(ring) for ring in rings]
+        junctions = find_junctions([points for points in ring_points if points])
+        for points in ring_points:
+            if not points:
+                self.rings.append([])
+                continue
+            self.rings.append([self._add_arc(arc) for arc in _split_ring(points, junctions)])
+
+    def _add_arc(self, arc: list[Point]) -> int:
+        """Stores an arc, returning the reference of an existing identical or reversed arc if any."""
+        key = tuple(arc)
+        arc_id = self._arc_ids.get(key)
+        if arc_id is not None:
+            return arc_id
+        reversed_id = self._arc_ids.get(key[::-1])
+        if reversed_id is not None:
+            return ~reversed_id
+        arc_id = len(self.arcs)
+        self.arcs.append(arc)
+        self._arc_ids[key] = arc_id
+        return arc_id
+
+    @staticmethod
+    def resolve_ring(arc_refs: list[int], arcs: list[list]) -> list:
+        """
+        Rebuilds a closed ring from arc references.
+
+        Args:
+            arc_refs (list): Arc references of the ring.
+            arcs (list): Arc point lists to read from.
+
+        Returns:
+            list: Closed ring as a list of points.
+        """
+        ring = []
+        for ref in arc_refs:
+            arc = arcs[ref] if ref >= 0 else arcs[~ref][::-1]
+            ring.extend(arc[1:] if ring else arc)
+        return ring
+
+    def ring(self, index: int, arcs: list[list] | None = None) -> list:
+        """
+        Rebuilds one of the input rings.
+
+        Args:
+            index (int): Position of the ring in the input.
+            arcs (list): Replacement arcs (e.g. simplified ones), defaults to the extracted arcs.
+
+        Returns:
+            list: Closed ring as a list of points.
+        """
+        return self.resolve_ring(self.rings[index], self.arcs if arcs is None else arcs)
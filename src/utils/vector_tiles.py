@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+import json
+import math
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+MAX_LATITUDE = 85.0511287798066
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+MAX_ZOOM = 22
+# Country outlines gain no detail past this zoom, deeper tiles are rendered per request
+MAX_CACHED_ZOOM = 10
+MAX_CACHE_BYTES = 256 << 20
+
+# MVT geometry types and commands (vector tile specification 2.1)
+GEOM_POINT, GEOM_LINESTRING, GEOM_POLYGON = 1, 2, 3
+CMD_MOVE_TO, CMD_LINE_TO, CMD_CLOSE_PATH = 1, 2, 7
+
+TilePoint = tuple[float, float]
+
+# --- Tile math ---
+
+def tile_count(z: int) -> int:
+    """Number of tiles along each axis at a zoom level."""
+    return 1 << z
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    """Whether z/x/y addresses an existing tile."""
+    return 0 <= z <= MAX_ZOOM and 0 <= x < tile_count(z) and 0 <= y < tile_count(z)
+
+def lonlat_to_world(lon: float, lat: float) -> tuple[float, float]:
+    """
+    Projects a position to Web Mercator world coordinates in [0, 1].
+
+    Args:
+        lon (float): Longitude in degrees.
+        lat (float): Latitude in degrees, clamped to the Web Mercator limits.
+
+    Returns:
+        tuple: (x, y) with y growing southwards.
+    """
+    lat = max(-MAX_LATITUDE, min(MAX_LATITUDE, lat))
+    sin_lat = math.sin(math.radians(lat))
+    x = (lon + 180.0) / 360.0
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+def tile_bounds(z: int, x: int, y: int) -> tuple[float, float, float, float]:
+    """
+    Returns the longitude/latitude bounds of a tile.
+
+    Returns:
+        tuple: (west, south, east, north) in degrees.
+    """
+    n = tile_count(z)
+
+    def lat(tile_y: float) -> float:
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return x / n * 360.0 - 180.0, lat(y + 1), (x + 1) / n * 360.0 - 180.0, lat(y)
+
+# --- Clipping ---
+
+def _clip_ring(ring: list[TilePoint], low: float, high: float) -> list[TilePoint]:
+    """Clips a ring against a square with Sutherland-Hodgman, one edge at a time."""
+    edges = (
+        (lambda p: p[0] >= low, 0, low),
+        (lambda p: p[0] <= high, 0, high),
+        (lambda p: p[1] >= low, 1, low),
+        (lambda p: p[1] <= high, 1, high)
+    )
+    points = ring
+    for inside, axis, bound in edges:
+        if not points:
+            break
+        clipped = []
+        previous = points[-1]
+        for current in points:
+            if inside(current):
+                if not inside(previous):
+                    clipped.append(_intersect(previous, current, axis, bound))
+                clipped.append(current)
+            elif inside(previous):
+                clipped.append(_intersect(previous, current, axis, bound))
+            previous = current
+        points = clipped
+    return points
+
+def _intersect(a: TilePoint, b: TilePoint, axis: int, bound: float) -> TilePoint:
+    """Point where segment ab crosses the line `axis = bound`."""
+    t = (bound - a[axis]) / (b[axis] - a[axis])
+    if axis == 0:
+        return bound, a[1] + t * (b[1] - a[1])
+    return a[0] + t * (b[0] - a[0]), bound
+
+def _clip_line(line: list[TilePoint], low: float, high: float) -> list[list[TilePoint]]:
+    """Clips a line against a square with Liang-Barsky, splitting it where it leaves the square."""
+    parts: list[list[TilePoint]] = []
+    current: list[TilePoint] = []
+    for a, b in zip(line, line[1:]):
+        t0, t1 = 0.0, 1.0
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        visible = True
+        for p, q in ((-dx, a[0] - low), (dx, high - a[0]), (-dy, a[1] - low), (dy, high - a[1])):
+            if p == 0:
+                if q < 0:
+                    visible = False
+                    break
+                continue
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+        if not visible or t0 > t1:
+            if current:
+                parts.append(current)
+                current = []
+            continue
+        start = (a[0] + t0 * dx, a[1] + t0 * dy)
+        end = (a[0] + t1 * dx, a[1] + t1 * dy)
+        if not current:
+            current = [start]
+        current.append(end)
+        if t1 < 1.0:
+            parts.append(current)
+            current = []
+    if current:
+        parts.append(current)
+    return parts
+
+# --- Geometry encoding ---
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+def _command(command_id: int, count: int) -> int:
+    return (command_id & 0x7) | (count << 3)
+
+def _signed_area(ring: list[tuple[int, int]]) -> int:
+    """Twice the surveyor's formula area; positive means clockwise on screen (y down)."""
+    return sum(a[0] * b[1] - b[0] * a[1] for a, b in zip(ring, ring[1:] + ring[:1]))
+
+def _round_points(points: list[TilePoint]) -> list[tuple[int, int]]:
+    """Snaps points to the integer tile grid, merging consecutive duplicates."""
+    result = []
+    for x, y in points:
+        point = (round(x), round(y))
+        if not result or result[-1] != point:
+            result.append(point)
+    return result
+
+def _encode_commands(parts: list[list[tuple[int, int]]], close: bool) -> list[int]:
+    """Encodes point sequences as MoveTo/LineTo(/ClosePath) commands with zigzag deltas."""
+    commands = []
+    cursor_x = cursor_y = 0
+    for points in parts:
+        x, y = points[0]
+        commands += [_command(CMD_MOVE_TO, 1), _zigzag(x - cursor_x), _zigzag(y - cursor_y)]
+        cursor_x, cursor_y = x, y
+        if len(points) > 1:
+            commands.append(_command(CMD_LINE_TO, len(points) - 1))
+            for x, y in points[1:]:
+                commands += [_zigzag(x - cursor_x), _zigzag(y - cursor_y)]
+                cursor_x, cursor_y = x, y
+        if close:
+            commands.append(_command(CMD_CLOSE_PATH, 1))
+    return commands
+
+# --- Protobuf encoding ---
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def _field_varint(field: int, value: int) -> bytes:
+    return _varint(field << 3) + _varint(value)
+
+def _field_bytes(field: int, data: bytes) -> bytes:
+    return _varint((field << 3) | 2) + _varint(len(data)) + data
+
+def _field_packed(field: int, values: list[int]) -> bytes:
+    return _field_bytes(field, b''.join(_varint(value) for value in values))
+
+def _encode_value(value) -> bytes:
+    """Encodes a property value as a vector tile Value message."""
+    if isinstance(value, bool):
+        return _field_varint(7, int(value))
+    if isinstance(value, int) and -(1 << 63) <= value < (1 << 64):
+        if value >= 0:
+            return _field_varint(5, value)
+        return _field_varint(6, _zigzag(value))
+    if isinstance(value, float):
+        return _varint((3 << 3) | 1) + struct.pack('<d', value)
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+    return _field_bytes(1, value.encode('utf-8'))
+
+class _LayerBuilder:
+    """Accumulates the features of one layer with deduplicated keys and values."""
+
+    def __init__(self, name: str, extent: int):
+        self.name = name
+        self.extent = extent
+        self.keys: dict[str, int] = {}
+        self.values: dict[tuple, int] = {}
+        self.encoded_values: list[bytes] = []
+        self.features: list[bytes] = []
+
+    def add(self, geometry_type: int, commands: list[int], properties: dict, feature_id=None) -> None:
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            key_index = self.keys.setdefault(key, len(self.keys))
+            value_key = (type(value).__name__, json.dumps(value, sort_keys=True))
+            value_index = self.values.get(value_key)
+            if value_index is None:
+                value_index = self.values[value_key] = len(self.encoded_values)
+                self.encoded_values.append(_encode_value(value))
+            tags += [key_index, value_index]
+
+        feature = b''
+        if isinstance(feature_id, int) and feature_id >= 0:
+            feature += _field_varint(1, feature_id)
+        if tags:
+            feature += _field_packed(2, tags)
+        feature += _field_varint(3, geometry_type)
+        feature += _field_packed(4, commands)
+        self.features.append(feature)
+
+    def encode(self) -> bytes:
+        layer = _field_varint(15, 2) + _field_bytes(1, self.name.encode('utf-8'))
+        layer += b''.join(_field_bytes(2, feature) for feature in self.features)
+        layer += b''.join(_field_bytes(3, key.encode('utf-8')) for key in self.keys)
+        layer += b''.join(_field_bytes(4, value) for value in self.encoded_values)
+        layer += _field_varint(5, self.extent)
+        return layer
+
+# --- Tile generation ---
+
+def _feature_bbox(geometry: dict | None) -> tuple[float, float, float, float] | None:
+    """Longitude/latitude bounding box of a geometry."""
+    positions = []
+
+    def walk(coordinates):
+        if coordinates and isinstance(coordinates[0], (int, float)):
+            positions.append(coordinates)
+        else:
+            for child in coordinates or []:
+                walk(child)
+
+    if not geometry:
+        return None
+    if geometry.get('type') == 'GeometryCollection':
+        boxes = [box for box in (_feature_bbox(child) for child in geometry.get('geometries', [])) if box]
+        if not boxes:
+            return None
+        return min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes)
+    walk(geometry.get('coordinates'))
+    if not positions:
+        return None
+    return (
+        min(p[0] for p in positions), min(p[1] for p in positions),
+        max(p[0] for p in positions), max(p[1] for p in positions)
+    )
+
+class TileGenerator:
+    """
+    Renders Mapbox Vector Tiles from GeoJSON assets and caches them on disk.
+
+    A layer is one GeoJSON FeatureCollection. Its features are parsed once
+    per file version, with their bounding boxes, so a tile only projects
+    and clips the features that overlap it. Rendered tiles up to
+    `max_cached_zoom` are written to `<cache_path>/<layer>/<z>/<x>/<y>.mvt`
+    and reused until the source asset changes; empty tiles are never
+    written. The cache folder is kept under `max_bytes`, evicting the least
+    recently used tiles.
+    """
+
+    def __init__(self, cache_path: Path, extent: int = TILE_EXTENT, buffer: int = TILE_BUFFER,
+                 max_cached_zoom: int = MAX_CACHED_ZOOM, max_bytes: int = MAX_CACHE_BYTES):
+        """
+        Args:
+            cache_path (Path): Folder of the rendered tiles.
+            extent (int): Size of the tile coordinate grid.
+            buffer (int): Margin kept around the tile, in tile units, to hide clipping seams.
+            max_cached_zoom (int): Deepest zoom level written to the cache.
+            max_bytes (int): Total size of the cached tiles before the least recently used are deleted.
+        """
+        self.cache_path = cache_path
+        self.extent = extent
+        self.buffer = buffer
+        self.max_cached_zoom = max_cached_zoom
+        self.max_bytes = max_bytes
+        self._layers: dict[str, tuple[int, list[tuple[dict, tuple]]]] = {}
+        self._lock = threading.Lock()
+        # Cached tile sizes, least recently used first; None until the cache folder is scanned
+        self._files: OrderedDict[Path, int] | None = None
+        self._cache_bytes = 0
+
+    def tile_path(self, layer: str, z: int, x: int, y: int) -> Path:
+        """Where a rendered tile is cached."""
+        return self.cache_path / layer / str(z) / str(x) / f"{y}.mvt"
+
+    def get_tile(self, layer: str, source: Path, z: int, x: int, y: int) -> Path | bytes:
+        """
+        Returns a tile, from the cache when possible.
+
+        Args:
+            layer (str): Layer name, used in the cache path and the tile.
+            source (Path): GeoJSON asset of the layer.
+            z (int): Zoom level.
+            x (int): Tile column.
+            y (int): Tile row.
+
+        Returns:
+            Path or bytes: Path of the cached tile file, or the tile itself
+            when it is not cached: empty, or deeper than `max_cached_zoom`.
+        """
+        source_mtime = source.stat().st_mtime_ns
+        path = self.tile_path(layer, z, x, y)
+        if z <= self.max_cached_zoom:
+            try:
+                stat = path.stat()
+                if stat.st_mtime_ns >= source_mtime:
+                    self._track(path, stat.st_size)
+                    return path
+            except OSError:
+                pass
+
+        data = self.render_tile(layer, source, z, x, y)
+        if not data or z > self.max_cached_zoom:
+            return data
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent readers never see a partial tile
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+        self._track(path, len(data))
+        return path
+
+    def render_tile(self, layer: str, source: Path, z: int, x: int, y: int) -> bytes:
+        """
+        Renders a tile without the cache.
+
+        Args:
+            layer (str): Layer name written in the tile.
+            source (Path): GeoJSON asset of the layer.
+            z (int): Zoom level.
+            x (int): Tile column.
+            y (int): Tile row.
+
+        Returns:
+            bytes: The protobuf-encoded tile, empty if no feature overlaps it.
+        """
+        return self.render(layer, self._load_layer(source, source.stat().st_mtime_ns), z, x, y)
+
+    def _track(self, path: Path, size: int) -> None:
+        """Marks a cached tile as recently used, then deletes the least recently used ones past `max_bytes`."""
+        with self._lock:
+            if self._files is None:
+                self._files = self._scan()
+                self._cache_bytes = sum(self._files.values())
+            self._cache_bytes += size - self._files.pop(path, 0)
+            self._files[path] = size
+            while self._cache_bytes > self.max_bytes and len(self._files) > 1:
+                evicted, evicted_size = self._files.popitem(last=False)
+                self._cache_bytes -= evicted_size
+                evicted.unlink(missing_ok=True)
+
+    def _scan(self) -> OrderedDict[Path, int]:
+        """Sizes of the tiles already in the cache folder, oldest first."""
+        files = []
+        for path in self.cache_path.rglob('*.mvt'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime_ns, path, stat.st_size))
+        files.sort()
+        return OrderedDict((path, size) for _, path, size in files)
+
+    def _load_layer(self, source: Path, mtime: int) -> list[tuple[dict, tuple]]:
+        """Parses a layer's features with their bounding boxes, once per file version."""
+        key = str(source)
+        cached = self._layers.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(source, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        features = []
+        for feature in data.get('features', []):
+            bbox = _feature_bbox(feature.get('geometry'))
+            if bbox:
+                features.append((feature, bbox))
+        with self._lock:
+            self._layers[key] = (mtime, features)
+        return features
+
+    def render(self, layer: str, features: list[tuple[dict, tuple]], z: int, x: int, y: int) -> bytes:
+        """
+        Encodes the features overlapping a tile as a vector tile.
+
+        Args:
+            layer (str): Layer name written in the tile.
+            features (list): (feature, bbox) pairs of the layer.
+            z (int): Zoom level.
+            x (int): Tile column.
+            y (int): Tile row.
+
+        Returns:
+            bytes: The protobuf-encoded tile, empty if no feature overlaps it.
+        """
+        n = tile_count(z)
+        margin = self.buffer / self.extent
+        west, south, east, north = tile_bounds(z, x, y)
+        pad_x = (east - west) * margin
+        pad_y = (north - south) * margin
+        low, high = -self.buffer, self.extent + self.buffer
+
+        def project(position) -> TilePoint:
+            world_x, world_y = lonlat_to_world(position[0], position[1])
+            return (world_x * n - x) * self.extent, (world_y * n - y) * self.extent
+
+        builder = _LayerBuilder(layer, self.extent)
+        for feature, bbox in features:
+            if bbox[0] > east + pad_x or bbox[2] < west - pad_x or bbox[1] > north + pad_y or bbox[3] < south - pad_y:
+                continue
+            for geometry_type, commands in self._encode_geometry(feature.get('geometry'), project, low, high):
+                builder.add(geometry_type, commands, feature.get('properties') or {}, feature.get('id'))
+
+        if not builder.features:
+            return b''
+        return _field_bytes(3, builder.encode())
+
+    def _encode_geometry(self, geometry: dict | None, project, low: float, high: float):
+        """Yields (geometry type, commands) for the clipped parts of a geometry."""
+        if not geometry:
+            return
+        geometry_type = geometry.get('type')
+        coordinates = geometry.get('coordinates')
+
+        if geometry_type in ('Polygon', 'MultiPolygon'):
+            polygons = [coordinates] if geometry_type == 'Polygon' else coordinates
+            rings = []
+            for polygon in polygons:
+                for index, ring in enumerate(polygon):
+                    points = _round_points(_clip_ring([project(p) for p in ring[:-1]], low, high))
+                    if len(points) > 1 and points[0] == points[-1]:
+                        points.pop()
+                    area = _signed_area(points) if len(points) >= 3 else 0
+                    if area == 0:
+                        if index == 0:
+                            break
+                        continue
+                    # Exterior rings must be clockwise in tile coordinates, holes anticlockwise
+                    if (index == 0) != (area > 0):
+                        points.reverse()
+                    rings.append(points)
+            if rings:
+                yield GEOM_POLYGON, _encode_commands(rings, close=True)
+        elif geometry_type in ('LineString', 'MultiLineString'):
+            lines = [coordinates] if geometry_type == 'LineString' else coordinates
+            parts = []
+            for line in lines:
+                for part in _clip_line([project(p) for p in line], low, high):
+                    points = _round_points(part)
+                    if len(points) >= 2:
+                        parts.append(points)
+            if parts:
+                yield GEOM_LINESTRING, _encode_commands(parts, close=False)
+        elif geometry_type in ('Point', 'MultiPoint'):
+            points = [coordinates] if geometry_type == 'Point' else coordinates
+            projected = _round_points([project(p) for p in points])
+            inside = [p for p in projected if low <= p[0] <= high and low <= p[1] <= high]
+            if inside:
+                commands = [_command(CMD_MOVE_TO, len(inside))]
+                cursor_x = cursor_y = 0
+                for px, py in inside:
+                    commands += [_zigzag(px - cursor_x), _zigzag(py - cursor_y)]
+                    cursor_x, cursor_y = px, py
+                yield GEOM_POINT, commands
+        elif geometry_type == 'GeometryCollection':
+            for child in geometry.get('geometries', []):
+                yield from self._encode_geometry(child, project, low, high)